@@ -6,25 +6,33 @@ module also contains several Benchmark implementations and Result data transfer
 
 import math
 import itertools
+import os
 import json
+import pickle
+import shutil
+import struct
+import tempfile
 import collections
 
+from array import array
 from copy import deepcopy
+from hashlib import md5
 from statistics import mean
-from itertools import product, groupby, chain
-from statistics import median
+from itertools import product
 from pathlib import Path
-from typing import Iterable, Tuple, Union, Sequence, Generic, TypeVar, Dict, Any, cast, Optional, overload, List
+from typing import Iterable, Tuple, Union, Sequence, Generic, TypeVar, Dict, Any, cast, Optional, overload, List, Set
 
 from coba.random import CobaRandom
 from coba.learners import Learner, Key
-from coba.simulations import BatchedSimulation, OpenmlSimulation, Take, Shuffle, Batch, Simulation, Choice, Context, Action, Reward, PCA, Sort
-from coba.execution import ExecutionContext
-from coba.statistics import OnlineMean, OnlineVariance
+from coba.simulations import (
+    BatchedSimulation, OpenmlSimulation, MemoryMappedSimulation, StreamingSimulation, Take, Shuffle, Batch,
+    Simulation, Choice, Context, Action, Reward, PCA, Sort
+)
+from coba.execution import ExecutionContext, CacheInterface, DiskCache, ThreadLogger
 from coba.utilities import check_matplotlib_support, check_pandas_support
 
 from coba.data.structures import Table
-from coba.data.filters import Filter, JsonEncode, JsonDecode, ForeachFilter
+from coba.data.filters import Filter, JsonEncode, JsonDecode, Prefetch
 from coba.data.sources import Source, MemorySource, DiskSource
 from coba.data.sinks import Sink, MemorySink, DiskSink
 from coba.data.pipes import Pipe, StopPipe
@@ -37,13 +45,42 @@ class Result:
 
     @staticmethod
     def from_transaction_log(filename: Optional[str]) -> 'Result':
-        """Create a Result from a transaction file."""
-        
+        """Create a Result from a transaction file.
+
+        Remarks:
+            The log's version is determined from its first line alone. When the log is already on the
+            current version it is decoded exactly once while building the Result. Otherwise the log is
+            promoted into a temporary file that atomically replaces the original once fully written.
+            Logs ending in `TransactionEncodeBinary.Extension` are read as binary columnar logs.
+        """
+
         if filename is None or not Path(filename).exists(): return Result()
 
-        Pipe.join(DiskSource(filename), [JsonDecode(), TransactionPromote(), JsonEncode()], DiskSink(filename, 'w')).run()
-        
-        return Result.from_transactions(Pipe.join(DiskSource(filename), [JsonDecode()]).read())
+        if Path(filename).suffix == TransactionEncodeBinary.Extension:
+            return Result.from_transactions(TransactionDecodeBinary().filter(Path(filename).read_bytes()))
+
+        with open(filename, "r") as f:
+            first_line = f.readline()
+
+        if first_line.strip() == "": return Result()
+
+        first_transaction = JsonDecode().filter([first_line])
+        log_version       = TransactionPromote.version(next(iter(first_transaction)))
+
+        if log_version == TransactionPromote.CurrentVersion:
+            return Result.from_transactions(Pipe.join(DiskSource(filename), [JsonDecode()]).read())
+
+        try:
+            promoted_transactions = list(Pipe.join(DiskSource(filename), [JsonDecode(), TransactionPromote()]).read())
+        except StopPipe:
+            return Result.from_transactions(Pipe.join(DiskSource(filename), [JsonDecode()]).read())
+
+        promoted_filename = f"{filename}.promoting"
+
+        Pipe.join(MemorySource(promoted_transactions), [JsonEncode()], DiskSink(promoted_filename, 'w')).run()
+        os.replace(promoted_filename, filename)
+
+        return Result.from_transactions(promoted_transactions)
 
     @staticmethod
     def from_transactions(transactions: Iterable[Any]) -> 'Result':
@@ -97,6 +134,119 @@ class Result:
 
         return (l,s,b)
 
+    def aggregate_batches(self, select_learners: Sequence[int] = None) -> Dict[int, Dict[str, List[float]]]:
+        """Aggregate the batch rewards of each learner across all of its simulations.
+
+        Args:
+            select_learners: The ids of the learners to aggregate. When None every learner is aggregated.
+
+        Returns:
+            A mapping from learner_id to equal length lists keyed by "index" (the batch index), "in_count",
+            "in_mean" and "in_variance" (the instantaneous statistics of the rewards observed across
+            simulations at each batch index) along with "cu_count", "cu_mean" and "cu_variance" (the
+            progressive statistics of every reward observed up to and including each batch index).
+
+        Remarks:
+            Only the batch indexes observed in every one of a learner's simulations are aggregated. The
+            statistics are calculated with numpy cumulative sums when numpy is installed and with an
+            equivalent pure Python implementation otherwise.
+        """
+
+        rewards = cast(Dict[int,List[Sequence[float]]], collections.defaultdict(list))
+
+        for batch in self.batches.to_tuples():
+            if select_learners is None or batch.learner_id in select_learners:
+                rewards[batch.learner_id].append(batch.reward)
+
+        try:
+            import numpy as np #type: ignore
+        except ImportError:
+            np = None
+
+        aggregate = Result._aggregate_numpy if np is not None else Result._aggregate_python
+
+        return { learner_id: aggregate(learner_rewards) for learner_id, learner_rewards in sorted(rewards.items()) }
+
+    @staticmethod
+    def _aggregate_numpy(rewards: Sequence[Sequence[float]]) -> Dict[str, List[float]]:
+        import numpy as np #type: ignore
+
+        n_batches = min(map(len, rewards))
+
+        if n_batches == 0: return Result._aggregate_python(rewards)
+
+        R = np.array([ r[:n_batches] for r in rewards ], dtype=float).T
+        D = R - R[0,0] #shifting by a constant keeps the sum of squares from cancelling catastrophically
+
+        n_sims   = R.shape[1]
+        in_count = np.full(n_batches, n_sims)
+        cu_count = np.arange(1, n_batches+1) * n_sims
+        cu_sum   = np.cumsum(D.sum(axis=1))
+        cu_sqr   = np.cumsum((D*D).sum(axis=1))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            in_mean     = R.mean(axis=1)
+            in_variance = R.var(axis=1, ddof=1) if n_sims > 1 else np.full(n_batches, float('nan'))
+            cu_mean     = R[0,0] + cu_sum/cu_count
+            cu_variance = np.where(cu_count > 1, np.maximum(cu_sqr - cu_sum*cu_sum/cu_count, 0)/(cu_count-1), float('nan'))
+
+        return {
+            "index"      : list(range(n_batches)),
+            "in_count"   : in_count.tolist(),
+            "in_mean"    : in_mean.tolist(),
+            "in_variance": in_variance.tolist(),
+            "cu_count"   : cu_count.tolist(),
+            "cu_mean"    : cu_mean.tolist(),
+            "cu_variance": cu_variance.tolist()
+        }
+
+    @staticmethod
+    def _aggregate_python(rewards: Sequence[Sequence[float]]) -> Dict[str, List[float]]:
+
+        aggregate = cast(Dict[str,List[float]], { key:[] for key in ["index", "in_count", "in_mean", "in_variance", "cu_count", "cu_mean", "cu_variance"] })
+
+        n_batches = min(map(len, rewards))
+        batches   = list(zip(*[ r[:n_batches] for r in rewards ]))
+
+        if n_batches == 0: return aggregate
+
+        shift    = batches[0][0] #shifting by a constant keeps the sum of squares from cancelling catastrophically
+        cu_count = 0
+        cu_sum   = 0.
+        cu_sqr   = 0.
+
+        for batch_index, batch in enumerate(batches):
+            in_count = len(batch)
+            in_mean  = sum(batch)/in_count
+            shifted  = [ reward-shift for reward in batch ]
+
+            cu_count += in_count
+            cu_sum   += sum(shifted)
+            cu_sqr   += sum(s*s for s in shifted)
+
+            aggregate["index"      ].append(batch_index)
+            aggregate["in_count"   ].append(in_count)
+            aggregate["in_mean"    ].append(in_mean)
+            aggregate["in_variance"].append(sum((r-in_mean)**2 for r in batch)/(in_count-1) if in_count > 1 else float('nan'))
+            aggregate["cu_count"   ].append(cu_count)
+            aggregate["cu_mean"    ].append(shift + cu_sum/cu_count)
+            aggregate["cu_variance"].append(max(cu_sqr - cu_sum*cu_sum/cu_count, 0)/(cu_count-1) if cu_count > 1 else float('nan'))
+
+        return aggregate
+
+    @staticmethod
+    def _decimate(series: Dict[str, List[float]], max_points: int) -> Dict[str, List[float]]:
+        """Keep evenly spaced points (always including the last) from series longer than max_points."""
+
+        n_points = len(series["index"])
+
+        if n_points <= max_points: return series
+
+        keep = list(range(0, n_points, math.ceil(n_points/max_points)))
+        if keep[-1] != n_points-1: keep.append(n_points-1)
+
+        return { key: [ values[i] for i in keep ] for key,values in series.items() }
+
     def standard_plot(self, select_learners: Sequence[int] = None,  show_err: bool = False, show_sd: bool = False, figsize=(12,4)) -> None:
 
         check_matplotlib_support('Plots.standard_plot')
@@ -126,61 +276,9 @@ class Result:
 
         learners, _, batches = self.to_indexed_tuples()
 
-        learners = {key:value for key,value in learners.items() if select_learners is None or key in select_learners}
-        batches  = {key:value for key,value in batches.items() if select_learners is None or value.learner_id in select_learners}
-
-        sorted_batches  = sorted(batches.values(), key=lambda batch: batch.learner_id)
-        grouped_batches = groupby(sorted_batches , key=lambda batch: batch.learner_id)
-
-        max_batch_N = 0
-
-        indexes     = cast(Dict[int,List[int  ]], collections.defaultdict(list))
-        incounts    = cast(Dict[int,List[int  ]], collections.defaultdict(list))
-        inmeans     = cast(Dict[int,List[float]], collections.defaultdict(list))
-        invariances = cast(Dict[int,List[float]], collections.defaultdict(list))
-        cucounts    = cast(Dict[int,List[int  ]], collections.defaultdict(list))
-        cumeans     = cast(Dict[int,List[float]], collections.defaultdict(list))
-        cuvariances = cast(Dict[int,List[float]], collections.defaultdict(list))
-
-        for learner_id, learner_batches in grouped_batches:
-
-            cucount    = 0
-            cumean     = OnlineMean()
-            cuvariance = OnlineVariance()
-
-            Ns, Rs = list(zip(*[ (b.N, b.reward) for b in learner_batches ]))
-
-            Ns = list(zip(*Ns))
-            Rs = list(zip(*Rs))
-
-            for batch_index, batch_Ns, batch_Rs in zip(itertools.count(), Ns,Rs):
-
-                incount    = 0
-                inmean     = OnlineMean()
-                invariance = OnlineVariance()
-
-                for N, reward in zip(batch_Ns, batch_Rs):
-                    
-                    max_batch_N = max(N, max_batch_N)
-                    
-                    incount     = incount + 1
-                    inmean      .update(reward)
-                    invariance  .update(reward)
-                    cucount     = cucount + 1
-                    cumean      .update(reward)
-                    cuvariance  .update(reward)
-
-                #sanity check, sorting above (in theory) should take care of this...
-                #if this isn't the case then the cu* values will be incorrect...
-                assert indexes[learner_id] == [] or batch_index > indexes[learner_id][-1]
-
-                incounts[learner_id].append(incount)
-                indexes[learner_id].append(batch_index)
-                inmeans[learner_id].append(inmean.mean)
-                invariances[learner_id].append(invariance.variance)
-                cucounts[learner_id].append(cucount)
-                cumeans[learner_id].append(cumean.mean)
-                cuvariances[learner_id].append(cuvariance.variance)
+        learners    = {key:value for key,value in learners.items() if select_learners is None or key in select_learners}
+        max_batch_N = max([ max(batch.N, default=0) for batch in batches.values() if batch.learner_id in learners ], default=0)
+        aggregates  = self.aggregate_batches(list(learners.keys()))
 
         import matplotlib.pyplot as plt #type: ignore
 
@@ -191,15 +289,21 @@ class Result:
         ax1 = fig.add_subplot(1,2,1) #type: ignore
         ax2 = fig.add_subplot(1,2,2) #type: ignore
 
+        #there is no reason to plot more points than there are pixels across each axes
+        max_points = max(2, int(fig.get_figwidth() * fig.dpi / 2))
+        aggregates = { key: Result._decimate(value, max_points) for key,value in aggregates.items() }
+
         for learner_id in learners:
-            _plot(ax1, learners[learner_id].full_name, indexes[learner_id], inmeans[learner_id], invariances[learner_id], incounts[learner_id])
+            a = aggregates.get(learner_id, collections.defaultdict(list))
+            _plot(ax1, learners[learner_id].full_name, a["index"], a["in_mean"], a["in_variance"], a["in_count"])
 
         ax1.set_title(f"Instantaneous Reward")
         ax1.set_ylabel("Reward")
         ax1.set_xlabel(f"{index_unit} Index")
 
         for learner_id in learners:
-            _plot(ax2, learners[learner_id].full_name, indexes[learner_id], cumeans[learner_id], cuvariances[learner_id], cucounts[learner_id])
+            a = aggregates.get(learner_id, collections.defaultdict(list))
+            _plot(ax2, learners[learner_id].full_name, a["index"], a["cu_mean"], a["cu_variance"], a["cu_count"])
 
         ax2.set_title("Progressive Validation")
         #ax2.set_ylabel("Reward")
@@ -282,16 +386,41 @@ class Transaction:
 
 class TaskSource(Source):
     
-    def __init__(self, simulations: Sequence[Source[BatchedSimulation]], learners: Sequence['BenchmarkLearner'], restored: Result) -> None:
+    def __init__(self, 
+        simulations: Sequence[Source[BatchedSimulation]], 
+        learners   : Sequence['BenchmarkLearner'],
+        restored   : Result,
+        chunk_size : int = None,
+        mmap_dir   : str = None,
+        prefetch   : int = None) -> None:
+        """Instantiate a TaskSource.
+
+        Args:
+            simulations: The simulation pipes that need to be evaluated.
+            learners: The learners that need to be evaluated against the simulation pipes.
+            restored: The result of any previous evaluation so that completed work is skipped.
+            chunk_size: The maximum number of (simulation, learner) pairs in a single task. When 
+                None every pair that shares a source is placed in a single task.
+            mmap_dir: A directory to memory map sources into. When given every source is read once
+                by the calling process and tasks are given a memory mapped copy of the source.
+            prefetch: The number of tasks whose source should be read ahead in a background thread.
+                When given the next source is read while the current task is evaluated. Prefetched
+                sources are held in memory so this should only be used when tasks aren't pickled.
+        """
+
         self._simulations = simulations
         self._learners    = learners
         self._restored    = restored
+        self._chunk_size  = chunk_size
+        self._mmap_dir    = mmap_dir
+        self._prefetch    = prefetch
 
     def read(self) -> Iterable:
 
         #first turn every prod(simulation,seed) into its own pipe
         #second remove pipes that are already finished
         #group pipes into a single pipe based on source
+        #finally split each source group into chunks if requested
 
         simulation_sources = [s._source if isinstance(s, (Pipe.SourceFilters, BenchmarkSimulation)) else s for s in self._simulations]
         sources_set        = list(set(simulation_sources))
@@ -320,12 +449,123 @@ class TaskSource(Source):
             source_grouped_task[2].append(learners[learner_key])
             source_grouped_task[3].append(simulations[simulation_key])
 
-        return list(source_grouped_tasks.values())
+        if self._mmap_dir is not None:
+            for source_idx, source_grouped_task in source_grouped_tasks.items():
+                mapped_source = self._memory_map(source_idx, sources_set[source_idx])
+                mapped_pipes  = { id(pipe): BenchmarkSimulation(mapped_source, pipe._filter._filters, pipe.source_description, pipe.filter_descriptions) for pipe in source_grouped_task[3] }
+
+                source_grouped_task[3][:] = [ mapped_pipes[id(pipe)] for pipe in source_grouped_task[3] ]
+
+        if self._chunk_size is None:
+            tasks = list(source_grouped_tasks.values())
+        else:
+            #chunks are created in source order so that consecutive tasks given to
+            #the same worker are able to share a single read of their common source
+            tasks = []
+
+            for source_grouped_task in source_grouped_tasks.values():
+                for i in range(0, len(source_grouped_task[0]), self._chunk_size):
+                    tasks.append(tuple(column[i:i+self._chunk_size] for column in source_grouped_task))
+
+        if self._prefetch is None:
+            return tasks
+
+        return self._prefetched(tasks)
+
+    def _prefetched(self, tasks: Sequence[Any]) -> Iterable[Any]:
+        """Read the source of upcoming tasks in a background thread while the current task is evaluated.
+
+        Remarks:
+            While tasks are being prefetched only the calling thread writes to the logger so that the
+            nesting of its logs isn't interleaved with logs from the background reads. Failed reads
+            are logged by the calling thread when their task is reached.
+        """
+
+        logger = ExecutionContext.Logger
+
+        try:
+            ExecutionContext.Logger = ThreadLogger(logger)
+
+            for task, exception in Prefetch(self._prefetch).filter(self._preload(tasks)):
+                if exception is not None: 
+                    ExecutionContext.Logger.log_exception(exception, "unable to prefetch source:")
+                yield task
+        finally:
+            ExecutionContext.Logger = logger
+
+    def _preload(self, tasks: Sequence[Any]) -> Iterable[Tuple[Any, Optional[Exception]]]:
+        """Replace the source of each task with a copy of the source that has already been read.
+
+        Remarks:
+            Consecutive tasks that share a source share a single read of it. If we fail to read a source
+            we leave it unchanged so that the failure is handled by the task in the same way it would be
+            without prefetching. The failure is returned with the first task of the source to be logged.
+        """
+
+        loaded: Optional[Tuple[Source[Simulation], Source[Simulation]]] = None
+
+        for task in tasks:
+            source    = task[3][0]._source
+            exception = None
+
+            if loaded is None or loaded[0] is not source:
+                loaded = None #release the previous read before starting the next one
+
+                try:
+                    loaded = (source, MemorySource(source.read()))
+                except Exception as e:
+                    loaded, exception = (source, source), e
+
+            preloaded_pipes = { id(pipe): BenchmarkSimulation(loaded[1], pipe._filter._filters, pipe.source_description, pipe.filter_descriptions) for pipe in task[3] }
+
+            yield tuple(task[0:3]) + ([ preloaded_pipes[id(pipe)] for pipe in task[3] ],), exception
+
+    def _memory_map(self, source_idx: int, source: Source[Simulation]) -> Source[Simulation]:
+        """Read a source once and write it to a memory mapped file that every worker can share.
+
+        Remarks:
+            If we fail to read the source, or it has contexts that can't be memory mapped, we log why and
+            return the source unchanged so that its tasks read it in the same way they would without
+            memory mapping.
+        """
+
+        filename = str(Path(self._mmap_dir) / f"{source_idx}.sim")
+
+        with ExecutionContext.Logger.log(f"memory mapping source {source_idx}..."):
+            try:
+                simulation = source.read()
+
+                #sources from the simulation cache are already memory mapped
+                if isinstance(simulation, MemoryMappedSimulation): return MemorySource(simulation)
+
+                #streaming simulations are never materialized so they can't be memory mapped
+                if isinstance(simulation, StreamingSimulation): return MemorySource(simulation)
+
+                MemoryMappedSimulation.write(simulation, filename)
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                ExecutionContext.Logger.log_exception(e, "unable to memory map source:")
+                if Path(filename).exists(): Path(filename).unlink()
+                return source
+
+        return MemorySource(MemoryMappedSimulation(filename))
     
 class TaskToTransactions(Filter):
 
-    def __init__(self, ignore_raise: bool) -> None:
-        self._ignore_raise = ignore_raise
+    def __init__(self, ignore_raise: bool, checkpoints: CacheInterface[str,bytes] = None, checkpoint_every: int = None) -> None:
+        """Instantiate a TaskToTransactions filter.
+
+        Args:
+            ignore_raise: Should exceptions be raised or logged during evaluation.
+            checkpoints: Where learner checkpoints should be written to and restored from.
+            checkpoint_every: How many batches should be evaluated between learner checkpoints.
+        """
+        self._ignore_raise     = ignore_raise
+        self._checkpoints      = checkpoints
+        self._checkpoint_every = checkpoint_every
+
+        self._source_memo: Optional[Tuple[Source[Simulation], Simulation]] = None
 
     def filter(self, tasks: Iterable[Any]) -> Iterable[Any]:
         for task in tasks:
@@ -337,36 +577,26 @@ class TaskToTransactions(Filter):
         simulation_ids   = task[0]
         learner_ids      = task[1]
         learners         = task[2]
-        
-        simulation_pipes   = task[3]
-        simulation_source  = simulation_pipes[0]._source #we only need one source since we group by sources when making tasks
-        simulation_filters = [ simulation_pipe._filter for simulation_pipe in simulation_pipes ]
+        simulation_pipes = task[3]
 
-        collapsed_pipe = Pipe.join(simulation_source, [ForeachFilter(simulation_filters)])
+        simulation_source = simulation_pipes[0]._source #we only need one source since we group by sources when making tasks
 
-        written_simulations = []
+        #group every learner by the simulation pipe it is to be evaluated on so that each
+        #simulation is only filtered once and all of its learners can be evaluated together
+        simulation_groups: Dict[int, Tuple[BenchmarkSimulation, Dict[int, BenchmarkLearner]]] = {}
+
+        for simulation_id, learner_id, learner, pipe in zip(simulation_ids, learner_ids, learners, simulation_pipes):
+            simulation_groups.setdefault(simulation_id, (pipe, {}))[1][learner_id] = learner
 
         try:
-            for simulation_id, learner_id, learner, pipe, simulation in zip(simulation_ids, learner_ids, learners, simulation_pipes, collapsed_pipe.read()):
-                batches      = simulation.interaction_batches
-                interactions = list(chain.from_iterable(batches))
-
-                if simulation_id not in written_simulations:
-                    written_simulations.append(simulation_id)
-                    yield Transaction.simulation(simulation_id,
-                        source            = pipe.source_description,
-                        filters           = pipe.filter_descriptions,
-                        interaction_count = len(interactions),
-                        batch_count       = len(batches),
-                        context_size      = int(median(self._context_sizes(interactions))),
-                        action_count      = int(median(self._action_counts(interactions))))
-
-                learner = deepcopy(learner)
-                learner.init()
-
-                if len(batches) > 0:
-                    Ns, Rs = zip(*[ self._process_batch(batch, simulation.reward, learner) for batch in batches ])
-                    yield Transaction.batch(simulation_id, learner_id, N=list(Ns), reward=list(Rs))
+            loaded_source = self._read_source(simulation_source)
+            pipes         = { simulation_id: pipe for simulation_id, (pipe, _) in simulation_groups.items() }
+
+            for simulation_id, simulation in self._filter_simulations(loaded_source, pipes):
+                pipe, simulation_learners = simulation_groups[simulation_id]
+
+                for transaction in self._process_simulation(simulation_id, pipe, simulation, simulation_learners):
+                    yield transaction
 
         except KeyboardInterrupt:
             raise
@@ -374,57 +604,232 @@ class TaskToTransactions(Filter):
             ExecutionContext.Logger.log_exception(e, "unhandled exception:")
             if not self._ignore_raise: raise e
 
-    def _process_batch(self, batch, reward, learner) -> Tuple[int, float]:
-        
-        keys     = []
-        contexts = []
-        choices  = []
-        actions  = []
-        probs    = []
+    def _filter_simulations(self, source: Simulation, pipes: Dict[int, 'BenchmarkSimulation']) -> Iterable[Tuple[int, Simulation]]:
+        """Apply every pipe's filters to the loaded source, evaluating each shared filter prefix once.
+
+        Remarks:
+            Pipes whose filter chains begin with the same filter objects (e.g., the PCA and Sort filters
+            shared by every shuffle seed of a simulation) form a prefix tree. The output of a shared
+            prefix is kept only until the last pipe that begins with that prefix has been filtered.
+        """
+
+        chains    = { simulation_id: list(pipe._filter._filters) for simulation_id, pipe in pipes.items() } #type: ignore
+        prefixes  = { simulation_id: [ tuple(map(id, chain[:i])) for i in range(len(chain)+1) ] for simulation_id, chain in chains.items() }
+        consumers = collections.Counter(prefix for keys in prefixes.values() for prefix in keys[1:])
+        outputs   = cast(Dict[Tuple[int,...], Any], { (): source })
+
+        for simulation_id, chain in chains.items():
+            keys  = prefixes[simulation_id]
+            depth = max(i for i, key in enumerate(keys) if key in outputs)
+            item  = outputs[keys[depth]]
+
+            for i in range(depth, len(chain)):
+                item = chain[i].filter(item)
+                if consumers[keys[i+1]] > 1: outputs[keys[i+1]] = item
+
+            for key in keys[1:]:
+                consumers[key] -= 1
+                if consumers[key] == 0: outputs.pop(key, None)
+
+            yield simulation_id, item
+
+    def _process_simulation(self, 
+        simulation_id: int, 
+        pipe         : 'BenchmarkSimulation', 
+        simulation   : BatchedSimulation, 
+        learners     : Dict[int, 'BenchmarkLearner']) -> Iterable[Any]:
+        """Evaluate every learner on a simulation in lock-step with a single pass over its batches.
+
+        Remarks:
+            Each batch of interactions is fetched once and given to every learner. The rewards for
+            every learner's choices in a batch are then requested from the simulation in one call.
+            Because we never look at a batch again after it has been evaluated the simulation's 
+            batches don't need to be materialized and the simulation's summary is written last.
+
+            When checkpoints are enabled a learner that was checkpointed in an earlier evaluation
+            is restored and only begins learning again once we reach the batch it stopped at.
+
+            A learner that raises an exception is logged and dropped from the remaining batches while
+            every other learner keeps going and still has its results written. If `ignore_raise` is
+            False the first exception is re-raised once the other learners' results are written.
+        """
+
+        starts  : Dict[int, int]         = {}
+        Ns      : Dict[int, List[int]]   = {}
+        Rs      : Dict[int, List[float]] = {}
+        failures: Dict[int, Exception]   = {}
+
+        learners = dict(learners)
+
+        for learner_id in list(learners.keys()):
+            try:
+                checkpoint = self._get_checkpoint(simulation_id, learner_id)
+
+                if checkpoint is not None:
+                    starts[learner_id], learners[learner_id], Ns[learner_id], Rs[learner_id] = checkpoint
+                else:
+                    starts[learner_id], learners[learner_id], Ns[learner_id], Rs[learner_id] = 0, deepcopy(learners[learner_id]), [], []
+                    learners[learner_id].init()
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                self._fail(learner_id, e, learners, failures)
+
+        batch_count = 0
+
+        for batch in simulation.interaction_batches:
+
+            #when every learner has failed there is nothing left to evaluate or write
+            if len(learners) == 0: break
+
+            batch_learners = { learner_id:learner for learner_id,learner in learners.items() if starts[learner_id] <= batch_count }
+
+            batch_count += 1
+
+            if len(batch_learners) == 0: continue
+
+            interactions = list(batch)
+
+            for learner_id, result in self._process_batch(interactions, simulation.reward, batch_learners).items():
+                if isinstance(result, Exception):
+                    self._fail(learner_id, result, learners, failures)
+                else:
+                    Ns[learner_id].append(result[0])
+                    Rs[learner_id].append(result[1])
+
+            if self._checkpoint_every and batch_count % self._checkpoint_every == 0:
+                for learner_id in batch_learners:
+                    if learner_id in learners:
+                        self._put_checkpoint(simulation_id, learner_id, (batch_count, learners[learner_id], Ns[learner_id], Rs[learner_id]))
+
+        if len(learners) > 0:
+            yield Transaction.simulation(simulation_id,
+                source            = pipe.source_description,
+                filters           = pipe.filter_descriptions,
+                interaction_count = simulation.interaction_count,
+                batch_count       = batch_count,
+                context_size      = simulation.context_size,
+                action_count      = simulation.action_count)
+
+        for learner_id in learners:
+            if batch_count > 0:
+                yield Transaction.batch(simulation_id, learner_id, N=Ns[learner_id], reward=Rs[learner_id])
 
-        for interaction in batch:
+            self._rmv_checkpoint(simulation_id, learner_id)
 
-            choice, prob = learner.choose(interaction.key, interaction.context, interaction.actions)
+        if failures and not self._ignore_raise:
+            raise next(iter(failures.values()))
 
-            assert choice in range(len(interaction.actions)), "An invalid action was chosen by the learner"
+    def _fail(self, learner_id: int, exception: Exception, learners: Dict[int, 'BenchmarkLearner'], failures: Dict[int, Exception]) -> None:
+        """Log a learner's exception and remove the learner from the learners still being evaluated."""
 
-            keys    .append(interaction.key)
-            contexts.append(interaction.context)
-            choices .append(choice)
-            probs   .append(prob)
-            actions .append(interaction.actions[choice])
+        ExecutionContext.Logger.log_exception(exception, "unhandled exception:")
 
-        rewards = reward(list(zip(keys, choices))) 
+        learners.pop(learner_id, None)
+        failures[learner_id] = exception
 
-        for (key,context,action,reward,prob) in zip(keys,contexts,actions,rewards, probs):
-            learner.learn(key,context,action,reward,prob)
+    def _checkpoint_key(self, simulation_id: int, learner_id: int) -> str:
+        return f"{simulation_id}_{learner_id}.checkpoint"
 
-        return len(rewards), round(mean(rewards),5)
+    def _get_checkpoint(self, simulation_id: int, learner_id: int) -> Optional[Tuple[int, 'BenchmarkLearner', List[int], List[float]]]:
 
-    def _context_sizes(self, interactions) -> Iterable[int]:
-        if len(interactions) == 0:
-            yield 0
+        key = self._checkpoint_key(simulation_id, learner_id)
 
-        for context in [i.context for i in interactions]:
-            yield 0 if context is None else len(context) if isinstance(context,tuple) else 1
+        if self._checkpoints is None or key not in self._checkpoints:
+            return None
 
-    def _action_counts(self, interactions) -> Iterable[int]:
-        if len(interactions) == 0:
-            yield 0
+        try:
+            return pickle.loads(self._checkpoints.get(key))
+        except Exception as e:
+            #a checkpoint may be incomplete if we crashed while writing it. In
+            #this case we simply start the learner over from the first batch.
+            ExecutionContext.Logger.log_exception(e, "unable to restore checkpoint:")
+            return None
+
+    def _put_checkpoint(self, simulation_id: int, learner_id: int, checkpoint: Tuple[int, 'BenchmarkLearner', List[int], List[float]]) -> None:
+
+        if self._checkpoints is None: return
+
+        try:
+            checkpoint_bytes = pickle.dumps(checkpoint)
+        except Exception as e:
+            ExecutionContext.Logger.log_exception(e, "unable to checkpoint learner:")
+        else:
+            self._checkpoints.put(self._checkpoint_key(simulation_id, learner_id), checkpoint_bytes)
+
+    def _rmv_checkpoint(self, simulation_id: int, learner_id: int) -> None:
+        if self._checkpoints is not None:
+            self._checkpoints.rmv(self._checkpoint_key(simulation_id, learner_id))
+
+    def _read_source(self, source: Source[Simulation]) -> Simulation:
+        """Read a simulation source, reusing the previous read when consecutive tasks share a source.
+
+        Remarks:
+            When tasks are chunked many consecutive tasks will come from the same source. Sources
+            are compared by identity which survives pickling because all tasks handed to a worker 
+            at the same time are pickled together. We release the old simulation before reading 
+            a new one so that we never hold more than one loaded source in memory at a time.
+        """
+
+        if self._source_memo is None or self._source_memo[0] is not source:
+            self._source_memo = None
+            self._source_memo = (source, source.read())
+
+        return self._source_memo[1]
+
+    def _process_batch(self, interactions, reward, learners) -> Dict[int, Union[Tuple[int, float], Exception]]:
+        """Evaluate learners on a batch, returning each learner's (N, reward) or the exception it raised."""
+
+        keys        = [ interaction.key     for interaction in interactions ]
+        contexts    = [ interaction.context for interaction in interactions ]
+        action_sets = [ interaction.actions for interaction in interactions ]
 
-        for actions in [i.actions for i in interactions]:
-            yield len(actions)
+        choices: Dict[int, Sequence[Choice]] = {}
+        probs  : Dict[int, Sequence[float]]  = {}
+        results: Dict[int, Union[Tuple[int, float], Exception]] = {}
+
+        for learner_id, learner in learners.items():
+            try:
+                choices[learner_id], probs[learner_id] = learner.choose_batch(keys, contexts, action_sets)
+
+                assert all(c in range(len(a)) for c,a in zip(choices[learner_id], action_sets)), "An invalid action was chosen by the learner"
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                results[learner_id] = e
+                choices.pop(learner_id, None)
+
+        all_rewards = reward([ (key, choice) for learner_id in choices for key, choice in zip(keys, choices[learner_id]) ])
+
+        for i, learner_id in enumerate(choices):
+            rewards = all_rewards[i*len(keys):(i+1)*len(keys)]
+            actions = [ action_set[choice] for action_set, choice in zip(action_sets, choices[learner_id]) ]
+
+            try:
+                learners[learner_id].learn_batch(keys, contexts, actions, rewards, probs[learner_id])
+                results[learner_id] = (len(rewards), round(mean(rewards),5))
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                results[learner_id] = e
+
+        return results
 
 class TransactionPromote(Filter):
 
     CurrentVersion = 2
 
+    @staticmethod
+    def version(first_transaction: Any) -> int:
+        """Determine the version of a transaction log from its first transaction."""
+        return 0 if first_transaction[0] != 'version' else first_transaction[1]
+
     def filter(self, items: Iterable[Any]) -> Iterable[Any]:
         items_iter = iter(items)
         items_peek = next(items_iter)
         items_iter = itertools.chain([items_peek], items_iter)
 
-        version = 0 if items_peek[0] != 'version' else items_peek[1]
+        version = TransactionPromote.version(items_peek)
 
         if version == TransactionPromote.CurrentVersion:
             raise StopPipe()
@@ -545,6 +950,10 @@ class TransactionIsNew(Filter):
 
         self._existing = existing
 
+        #when a simulation's learners are split across chunks every chunk writes the simulation so we
+        #also remember which simulations have been written while this filter has been running
+        self._simulations: Set[int] = set()
+
     def filter(self, items: Iterable[Any]) -> Iterable[Any]:
         for item in items:
 
@@ -559,23 +968,169 @@ class TransactionIsNew(Filter):
             if tipe == "B" and item[1] in self._existing.batches:
                 continue
 
-            if tipe == "S" and item[1] in self._existing.simulations:
+            if tipe == "S" and (item[1] in self._existing.simulations or item[1] in self._simulations):
                 continue
 
+            if tipe == "S":
+                self._simulations.add(item[1])
+
             if tipe == "L" and item[1] in self._existing.learners:
                 continue
 
             yield item
 
+class TransactionEncodeBinary(Filter):
+    """Encode transactions as the records of an append-only binary columnar transaction log.
+
+    Remarks:
+        Every record starts with a one byte tag followed by an 8 byte payload length. `B` transactions
+        whose values are equal length columns of numbers are written as typed arrays (a small JSON
+        header naming each column and its array typecode followed by the raw column bytes). All other
+        transactions only carry metadata and are written as JSON.
+    """
+
+    Extension = ".bin"
+
+    _record = struct.Struct("<cQ")
+    _batch  = struct.Struct("<qqQQ")
+
+    def filter(self, items: Iterable[Any]) -> Iterable[bytes]:
+        encoder = JsonEncode()
+
+        for item in items:
+            payload = self._encode_batch(item) if item[0] == "B" else None
+
+            if payload is None:
+                yield self._pack(b'J', next(iter(encoder.filter([item]))).encode('utf-8'))
+            else:
+                yield self._pack(b'B', payload)
+
+    def _pack(self, tag: bytes, payload: bytes) -> bytes:
+        return self._record.pack(tag, len(payload)) + payload
+
+    def _encode_batch(self, item: Any) -> Optional[bytes]:
+        (simulation_id, learner_id), values = item[1], item[2]
+
+        if not isinstance(simulation_id, int) or not isinstance(learner_id, int): return None
+
+        columns = list(values.items())
+        lengths = set( len(column) if isinstance(column, (list,tuple)) else -1 for _,column in columns )
+
+        if len(lengths) != 1 or -1 in lengths: return None
+
+        header: List[Tuple[str,str]] = []
+        arrays: List[array]          = []
+
+        for name, column in columns:
+            if any(isinstance(v, bool) or not isinstance(v, (int,float)) for v in column): return None
+
+            typecode = 'q' if all(isinstance(v, int) for v in column) else 'd'
+
+            try:
+                arrays.append(array(typecode, column))
+            except OverflowError:
+                return None
+
+            header.append((name, typecode))
+
+        header_bytes = json.dumps(header).encode('utf-8')
+        n_rows       = lengths.pop()
+
+        return self._batch.pack(simulation_id, learner_id, n_rows, len(header_bytes)) + header_bytes + b''.join(a.tobytes() for a in arrays)
+
+class TransactionDecodeBinary(Filter):
+    """Decode the records of a binary columnar transaction log back into transactions.
+
+    Remarks:
+        Column arrays are read directly from the log's bytes rather than parsed value by value. A
+        trailing record that was only partially written (e.g., because a benchmark was interrupted)
+        is ignored so that the benchmark can be resumed from the complete records before it.
+    """
+
+    @staticmethod
+    def complete_length(items: bytes) -> int:
+        """Find the number of bytes at the start of a log that hold complete records."""
+
+        record = TransactionEncodeBinary._record
+        offset = 0
+
+        while offset + record.size <= len(items):
+            _, length = record.unpack_from(items, offset)
+
+            if offset + record.size + length > len(items): break
+
+            offset += record.size + length
+
+        return offset
+
+    def filter(self, items: bytes) -> Iterable[Any]:
+        record  = TransactionEncodeBinary._record
+        batch   = TransactionEncodeBinary._batch
+        decoder = JsonDecode()
+        view    = memoryview(items)
+        offset  = 0
+
+        while offset + record.size <= len(view):
+            tag, length = record.unpack_from(view, offset)
+            start, end  = offset + record.size, offset + record.size + length
+
+            if end > len(view): return
+
+            if tag == b'J':
+                yield next(iter(decoder.filter([bytes(view[start:end]).decode('utf-8')])))
+
+            if tag == b'B':
+                simulation_id, learner_id, n_rows, header_length = batch.unpack_from(view, start)
+
+                position = start + batch.size + header_length
+                header   = json.loads(bytes(view[start+batch.size:position]).decode('utf-8'))
+                values   = {}
+
+                for name, typecode in header:
+                    column = array(typecode)
+                    column.frombytes(view[position:position + n_rows*column.itemsize])
+                    values[name] = column.tolist()
+                    position    += n_rows*column.itemsize
+
+                yield ["B", (simulation_id, learner_id), values]
+
+            offset = end
+
 class TransactionSink(Sink):
     
     def __init__(self, transaction_log: Optional[str], restored: Result) -> None:
-        self._sink = Pipe.join([JsonEncode()], DiskSink(transaction_log)) if transaction_log else MemorySink()
+        if not transaction_log:
+            self._sink = MemorySink()
+        elif Path(transaction_log).suffix == TransactionEncodeBinary.Extension:
+            self._truncate_partial(transaction_log)
+            self._sink = Pipe.join([TransactionEncodeBinary()], DiskSink(transaction_log, 'ab'))
+        else:
+            self._sink = Pipe.join([JsonEncode()], DiskSink(transaction_log))
+
         self._sink = Pipe.join([TransactionIsNew(restored)], self._sink)
 
     def write(self, items: Sequence[Any]) -> None:
         self._sink.write(items)
 
+    @staticmethod
+    def _truncate_partial(transaction_log: str) -> None:
+        """Remove a partially written record from the end of a binary log before appending to it.
+
+        Remarks:
+            The decoder ignores a trailing partial record but if we appended after it the partial
+            record's length prefix would swallow the newly appended records when the log is read.
+        """
+
+        path = Path(transaction_log)
+
+        if not path.exists(): return
+
+        complete = TransactionDecodeBinary.complete_length(path.read_bytes())
+
+        if complete < path.stat().st_size:
+            with open(path, 'r+b') as f:
+                f.truncate(complete)
+
     @property
     def result(self) -> Result:
         if isinstance(self._sink, Pipe.FiltersSink):
@@ -633,6 +1188,25 @@ class BenchmarkLearner:
     def learn(self, key: Key, context: Context, action: Action, reward: Reward, probability: float) -> None:
         self._learner.learn(key, context, action, reward, probability)
 
+    def choose_batch(self, keys: Sequence[Key], contexts: Sequence[Context], action_sets: Sequence[Sequence[Action]]) -> Tuple[Sequence[Choice], Sequence[float]]:
+
+        if hasattr(self._learner, 'predict_batch'):
+            ps = self._learner.predict_batch(keys, contexts, action_sets)
+        else:
+            ps = [ self._learner.predict(k, c, a) for k,c,a in zip(keys, contexts, action_sets) ]
+
+        cs = self._random.choice_batch([ range(len(actions)) for actions in action_sets ], ps)
+
+        return cs, [ p[c] for p,c in zip(ps,cs) ]
+
+    def learn_batch(self, keys: Sequence[Key], contexts: Sequence[Context], actions: Sequence[Action], rewards: Sequence[Reward], probabilities: Sequence[float]) -> None:
+
+        if hasattr(self._learner, 'learn_batch'):
+            self._learner.learn_batch(keys, contexts, actions, rewards, probabilities)
+        else:
+            for key, context, action, reward, probability in zip(keys, contexts, actions, rewards, probabilities):
+                self._learner.learn(key, context, action, reward, probability)
+
 class BenchmarkSimulation(Source[Simulation[_C,_A]]):
 
     def __init__(self, 
@@ -655,6 +1229,67 @@ class BenchmarkSimulation(Source[Simulation[_C,_A]]):
     def read(self) -> Simulation[_C,_A]:
         return self._filter.filter(self._source.read())
 
+class CachedSimulation(Source[Simulation[_C,_A]]):
+    """A source whose simulation is persisted to disk the first time it is read.
+
+    Remarks:
+        The simulation is stored in the `MemoryMappedSimulation` format under a fingerprint of the
+        cache format version, its source and filter descriptions and its source's checksum. Later
+        reads (in this or any future run) memory map the stored file rather than reading the source
+        again so numeric contexts (e.g., those of OpenML data sets) are shared by every worker rather
+        than copied into each of them. Files are written to a temporary name and then renamed so
+        that concurrent processes never attach to a partially written simulation.
+    """
+
+    #this should be incremented whenever the file format or the encoding of cached simulations changes
+    CurrentVersion = 3
+
+    @staticmethod
+    def fingerprint(source_description: str, filter_descriptions: Sequence[str], checksum: str = None) -> str:
+        """Create the cache key for a simulation from its descriptions.
+
+        Args:
+            source_description: A description of the simulation's source.
+            filter_descriptions: A description of every filter applied to the source.
+            checksum: The checksum of the source's data (if known) so that changed data isn't read from the cache.
+        """
+        key = [CachedSimulation.CurrentVersion, source_description, checksum, list(filter_descriptions)]
+        return md5(json.dumps(key).encode('utf-8')).hexdigest()
+
+    def __init__(self, source: Source[Simulation[_C,_A]], directory: str, fingerprint: str) -> None:
+        """Instantiate a CachedSimulation.
+
+        Args:
+            source: The source to read when the simulation isn't in the cache yet.
+            directory: The directory where cached simulations are stored.
+            fingerprint: The key the simulation is stored under in the directory.
+        """
+        self._source      = source
+        self._directory   = directory
+        self._fingerprint = fingerprint
+
+    def read(self) -> Simulation[_C,_A]:
+        filename = Path(self._directory).expanduser() / f"{self._fingerprint}.sim"
+
+        if filename.exists():
+            return MemoryMappedSimulation(str(filename))
+
+        simulation = self._source.read()
+        temporary  = filename.with_suffix(f".{os.getpid()}.tmp")
+
+        if isinstance(simulation, StreamingSimulation): return simulation
+
+        try:
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            MemoryMappedSimulation.write(simulation, str(temporary))
+            os.replace(temporary, filename)
+        except Exception as e:
+            ExecutionContext.Logger.log_exception(e, "unable to cache simulation:")
+            if temporary.exists(): temporary.unlink()
+            return simulation
+
+        return MemoryMappedSimulation(str(filename))
+
 class Benchmark(Generic[_C,_A]):
     """An on-policy Benchmark using samples drawn from simulations to estimate performance statistics."""
 
@@ -744,7 +1379,11 @@ class Benchmark(Generic[_C,_A]):
         seeds           : Sequence[Optional[int]] = [None],
         ignore_raise    : bool = True,
         processes       : int = None,
-        maxtasksperchild: int = None) -> None: ...
+        maxtasksperchild: int = None,
+        chunk_size      : int = None,
+        memory_map      : bool = False,
+        checkpoint_every: int = None,
+        prefetch        : int = None) -> None: ...
 
     @overload
     def __init__(self,
@@ -755,7 +1394,11 @@ class Benchmark(Generic[_C,_A]):
         seeds           : Sequence[Optional[int]] = [None],
         ignore_raise    : bool = True,
         processes       : int = None,
-        maxtasksperchild: int = None) -> None: ...
+        maxtasksperchild: int = None,
+        chunk_size      : int = None,
+        memory_map      : bool = False,
+        checkpoint_every: int = None,
+        prefetch        : int = None) -> None: ...
 
     @overload
     def __init__(self, 
@@ -765,7 +1408,11 @@ class Benchmark(Generic[_C,_A]):
         seeds           : Sequence[Optional[int]] = [None],
         ignore_raise    : bool = True,
         processes       : int = None,
-        maxtasksperchild: int = None) -> None: ...
+        maxtasksperchild: int = None,
+        chunk_size      : int = None,
+        memory_map      : bool = False,
+        checkpoint_every: int = None,
+        prefetch        : int = None) -> None: ...
 
     def __init__(self,*args, **kwargs) -> None:
         """Instantiate a UniversalBenchmark.
@@ -777,6 +1424,10 @@ class Benchmark(Generic[_C,_A]):
             shuffle_seeds: A sequence of seeds for interaction shuffling. None means no shuffle.
             processes: The number of process to spawn during evalution (overrides coba config).
             maxtasksperchild: The number of tasks each process will perform before a refresh.
+            chunk_size: The number of (simulation, learner) pairs in each task (overrides coba config).
+            memory_map: Should each source be read once and shared with all processes via a memory map.
+            checkpoint_every: The number of batches between learner checkpoints (requires a transaction log).
+            prefetch: The number of upcoming sources to read in a background thread (only when evaluating in process).
         
         See the overloads for more information.
         """
@@ -794,7 +1445,16 @@ class Benchmark(Generic[_C,_A]):
 
         pipes: List[BenchmarkSimulation] = []
 
+        cache_directory = ExecutionContext.Config.simulation_cache
+
         for source_id, source in enumerate(simulations):
+
+            if cache_directory and isinstance(source, BenchmarkSimulation) and source.source_description:
+                checksum    = source._source.md5_checksum if isinstance(source._source, OpenmlSimulation) else None
+                fingerprint = CachedSimulation.fingerprint(source.source_description, source.filter_descriptions, checksum)
+                cached      = CachedSimulation(source, cache_directory, fingerprint)
+                source      = BenchmarkSimulation(cached, [], source.source_description, source.filter_descriptions)
+
             for shuffler in shufflers:
 
                 source_description = str(source_id)
@@ -817,6 +1477,10 @@ class Benchmark(Generic[_C,_A]):
         self._ignore_raise     = cast(bool                                               ,kwargs.get('ignore_raise', True))
         self._processes        = cast(Optional[int]                                      ,kwargs.get('processes', None))
         self._maxtasksperchild = cast(Optional[int]                                      ,kwargs.get('maxtasksperchild', None))
+        self._chunk_size       = cast(Optional[int]                                      ,kwargs.get('chunk_size', None))
+        self._memory_map       = cast(bool                                               ,kwargs.get('memory_map', False))
+        self._checkpoint_every = cast(Optional[int]                                      ,kwargs.get('checkpoint_every', None))
+        self._prefetch         = cast(Optional[int]                                      ,kwargs.get('prefetch', None))
 
     def ignore_raise(self, value:bool=True) -> 'Benchmark[_C,_A]':
         self._ignore_raise = value
@@ -830,6 +1494,22 @@ class Benchmark(Generic[_C,_A]):
         self._maxtasksperchild = value
         return self
 
+    def chunk_size(self, value:int) -> 'Benchmark[_C,_A]':
+        self._chunk_size = value
+        return self
+
+    def memory_map(self, value:bool=True) -> 'Benchmark[_C,_A]':
+        self._memory_map = value
+        return self
+
+    def checkpoint_every(self, value:int) -> 'Benchmark[_C,_A]':
+        self._checkpoint_every = value
+        return self
+
+    def prefetch(self, value:int=1) -> 'Benchmark[_C,_A]':
+        self._prefetch = value
+        return self
+
     def evaluate(self, learners: Sequence[Learner[_C,_A]], transaction_log:str = None, seed:int = None) -> Result:
         """Collect observations of a Learner playing the benchmark's simulations to calculate Results.
 
@@ -839,10 +1519,19 @@ class Benchmark(Generic[_C,_A]):
         Returns:
             See the base class for more information.
         """
+        cs = self._chunk_size if self._chunk_size else ExecutionContext.Config.chunk_size
+        md = tempfile.mkdtemp(prefix="coba_") if self._memory_map else None
+        cd = f"{transaction_log}.checkpoints" if transaction_log and self._checkpoint_every else None
+
+        mp = self._processes if self._processes else ExecutionContext.Config.processes
+        mt = self._maxtasksperchild if self._maxtasksperchild else ExecutionContext.Config.maxtasksperchild
+        pf = self._prefetch if mp == 1 and mt is None else None #tasks are pickled for worker processes so we only prefetch in process
+
         benchmark_learners   = [ BenchmarkLearner(learner, seed) for learner in learners ] #type: ignore
         restored             = Result.from_transaction_log(transaction_log)
-        task_source          = TaskSource(self._simulation_pipes, benchmark_learners, restored)
-        task_to_transactions = TaskToTransactions(self._ignore_raise)
+        task_source          = TaskSource(self._simulation_pipes, benchmark_learners, restored, cs, md, pf)
+        checkpoints          = DiskCache(cd) if cd else None
+        task_to_transactions = TaskToTransactions(self._ignore_raise, checkpoints, self._checkpoint_every)
         transaction_sink     = TransactionSink(transaction_log, restored)
 
         n_given_learners    = len(benchmark_learners)
@@ -857,10 +1546,11 @@ class Benchmark(Generic[_C,_A]):
         preamble_transactions.append(Transaction.benchmark(n_given_learners, n_given_simulations))
         preamble_transactions.extend(Transaction.learners(benchmark_learners))
 
-        mp = self._processes if self._processes else ExecutionContext.Config.processes
-        mt = self._maxtasksperchild if self._maxtasksperchild else ExecutionContext.Config.maxtasksperchild
-        
-        Pipe.join(MemorySource(preamble_transactions), []                    , transaction_sink).run(1,None)
-        Pipe.join(task_source                        , [task_to_transactions], transaction_sink).run(mp,mt)
+        try:
+            Pipe.join(MemorySource(preamble_transactions), []                    , transaction_sink).run(1,None)
+            Pipe.join(task_source                        , [task_to_transactions], transaction_sink).run(mp,mt)
+        finally:
+            if md is not None: shutil.rmtree(md, ignore_errors=True)
+            if cd is not None and not any(Path(cd).iterdir()): Path(cd).rmdir()
 
         return transaction_sink.result
\ No newline at end of file
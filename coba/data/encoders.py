@@ -4,9 +4,13 @@ Remarks:
     This module is used primarily for the creation of simulations from data sets.
 """
 
+from array import array
 from collections import defaultdict
 from abc import ABC, abstractmethod
-from typing import Iterator, Sequence, Generic, TypeVar, Any, Hashable, Dict, Tuple
+from typing import Iterator, Iterable, Sequence, Generic, TypeVar, Any, Hashable, Dict, Tuple
+
+from coba.data.structures import CategoryColumn, Category
+from coba.utilities import check_numpy_support
 
 T_out = TypeVar('T_out', bound=Hashable, covariant=True) 
 
@@ -79,6 +83,28 @@ class Encoder(Generic[T_out], ABC):
         """
         ...
 
+    def encode_array(self, values: Sequence[Any]) -> Any:
+        """Encode a whole column of values into a numpy array.
+
+        Args:
+            values: The values that need to be encoded.
+
+        Returns:
+            A numpy array with the encoding of each value.
+
+        Remarks:
+            This requires numpy. Implementations should override this with a vectorized encoding
+            when one is possible. The default implementation simply converts the result of `encode`.
+        """
+
+        check_numpy_support("Encoder.encode_array")
+        import numpy as np #type: ignore
+
+        encoded = np.empty(len(values), dtype=object)
+        encoded[:] = self.encode(values)
+
+        return encoded
+
     def fit_encode(self, values: Sequence[Any]) -> Sequence[T_out]:
         if self.is_fit:
             return self.encode(values)
@@ -192,6 +218,10 @@ class NumericEncoder(Encoder[float]):
         if not self.is_fit:
             raise Exception("This encoder must be fit before it can be used.")
 
+        #columns parsed by ColumnarCsvReader are already floats
+        if isinstance(values, array) and values.typecode == 'd':
+            return values.tolist()
+
         #The fastnumbers package seems like it could potentially provide around a 20% speed increase.        
         #if isinstance(values[0],str):
         #    return [float(value) if cast(str,value).isnumeric() else float('nan') for value in values]
@@ -206,10 +236,47 @@ class NumericEncoder(Encoder[float]):
 
         return list(float_generator())
 
+    def encode_array(self, values: Sequence[Any]) -> Any:
+        """Encode the given values as a numpy array of floats.
+
+        Remarks:
+            Missing values (i.e., empty strings and '?') are masked and become NaN. If any other value
+            can't be parsed we fall back to parsing value by value so that it also becomes NaN.
+        """
+
+        check_numpy_support("NumericEncoder.encode_array")
+        import numpy as np #type: ignore
+
+        if not self.is_fit:
+            raise Exception("This encoder must be fit before it can be used.")
+
+        if isinstance(values, array) and values.typecode == 'd':
+            return np.frombuffer(values, dtype=float)
+
+        try:
+            return np.asarray(values, dtype=float)
+        except (ValueError, TypeError):
+            pass
+
+        strings = np.asarray(values, dtype=str)
+        missing = np.isin(strings, ['', '?'])
+        encoded = np.full(len(strings), float('nan'))
+
+        try:
+            encoded[~missing] = strings[~missing].astype(float)
+        except ValueError:
+            encoded = np.asarray(self.encode(values), dtype=float)
+
+        return encoded
+
 class OneHotEncoder(Encoder[Tuple[int,...]]):
     """An Encoder implementation that turns incoming values into a one hot representation."""
 
-    def __init__(self, fit_values: Sequence[Any] = [], singular_if_binary: bool = False, error_if_unknown = True) -> None:
+    def __init__(self, 
+        fit_values: Sequence[Any] = [], 
+        singular_if_binary: bool = False, 
+        error_if_unknown: bool = True,
+        as_category: bool = False) -> None:
         """Instantiate a OneHotEncoder.
 
         Args:
@@ -218,10 +285,13 @@ class OneHotEncoder(Encoder[Tuple[int,...]]):
                 rather than the more standard [1 0] and [0 1].
             error_if_unknown: Indicates if an error is thrown when an unknown value is passed to `encode`
                 or if a sequence of all 0's with a length of the universe is returned.
+            as_category: Indicates if values should be encoded as `Category` objects which only store the
+                index of their 1 (the one hot tuple is then created on request via `Category.onehot`).
         """
         self._fit_values         = fit_values
         self._singular_if_binary = singular_if_binary
         self._error_if_unknown   = error_if_unknown
+        self._as_category        = as_category
         self._is_fit             = len(fit_values) > 0
 
         if fit_values:
@@ -236,10 +306,19 @@ class OneHotEncoder(Encoder[Tuple[int,...]]):
                 for i,k in enumerate(known_onehots):
                     k[i] = 1
 
-            keys_and_values = zip(fit_values, map(lambda k_oh: tuple(k_oh), known_onehots))
-            default_factory = lambda:unknown_onehot
+            keys_and_values: Iterable[Tuple[Any,Any]]
+
+            if as_category:
+                unknown_category = Category(None, -1, len(unknown_onehot))
+                known_categories = [ Category(v, k.index(1) if 1 in k else -1, len(k)) for v,k in zip(fit_values, known_onehots) ]
+
+                keys_and_values = zip(fit_values, known_categories)
+                default_factory = lambda:unknown_category
+            else:
+                keys_and_values = zip(fit_values, map(lambda k_oh: tuple(k_oh), known_onehots))
+                default_factory = lambda:unknown_onehot
 
-            self._onehots: Dict[Any,Tuple[int,...]]
+            self._onehots: Dict[Any,Any]
 
             if self._error_if_unknown:
                 self._onehots = dict(keys_and_values)
@@ -272,12 +351,13 @@ class OneHotEncoder(Encoder[Tuple[int,...]]):
         if self.is_fit:
             raise Exception("This encoder has already been fit.")
 
-        fit_values = sorted(set(values))
+        fit_values = sorted(set(values.categories if isinstance(values, CategoryColumn) else values))
 
         return OneHotEncoder(
             fit_values         = fit_values, 
             singular_if_binary = self._singular_if_binary, 
-            error_if_unknown   = self._error_if_unknown)
+            error_if_unknown   = self._error_if_unknown,
+            as_category        = self._as_category)
 
     def encode(self, values: Sequence[Any]) -> Sequence[Tuple[int,...]]:
         """Encode the given value as a sequence of 0's and 1's.
@@ -296,10 +376,44 @@ class OneHotEncoder(Encoder[Tuple[int,...]]):
             raise Exception("This encoder must be fit before it can be used.")
 
         try:
+            if isinstance(values, CategoryColumn):
+                #each category is encoded once and then looked up by code
+                onehots = [ self._onehots[category] for category in values.categories ]
+                return [ onehots[code] for code in values.codes ]
+
             return [ self._onehots[value] for value in values ]
         except KeyError as e:
             raise Exception(f"We were unable to find {e} in {self._onehots.keys()}")
 
+    def encode_array(self, values: Sequence[Any]) -> Any:
+        """Encode the given values as a numpy array holding the index of each value's 1.
+
+        Remarks:
+            Rather than a dense block of 0's and 1's each value is encoded as the position of the 1 in
+            its one hot encoding (or -1 if its encoding is all 0's). The encoding is found once for each
+            distinct value (via `np.unique`) and then broadcast back to every value.
+        """
+
+        check_numpy_support("OneHotEncoder.encode_array")
+        import numpy as np #type: ignore
+
+        if not self.is_fit:
+            raise Exception("This encoder must be fit before it can be used.")
+
+        if isinstance(values, CategoryColumn):
+            distinct, inverse = values.categories, np.frombuffer(values.codes, dtype=np.int64)
+        else:
+            distinct, inverse = _unique(values)
+
+        try:
+            onehots = [ self._onehots[value] for value in distinct ]
+        except KeyError as e:
+            raise Exception(f"We were unable to find {e} in {self._onehots.keys()}")
+
+        hot_indexes = np.array([ _hot_index(onehot) for onehot in onehots ] or [-1], dtype=np.int64)
+
+        return hot_indexes[inverse]
+
 class FactorEncoder(Encoder[int]):
     """An Encoder implementation that turns incoming values into factor representation."""
 
@@ -377,4 +491,46 @@ class FactorEncoder(Encoder[int]):
         try:
             return [ self._levels[value] for value in values ]
         except KeyError as e:
-            raise Exception(f"We were unable to find {e} in {self._levels.keys()}") from None
\ No newline at end of file
+            raise Exception(f"We were unable to find {e} in {self._levels.keys()}") from None
+
+    def encode_array(self, values: Sequence[Any]) -> Any:
+        """Encode the given values as a numpy array of factor levels.
+
+        Remarks:
+            The level is found once for each distinct value (via `np.unique`) and then broadcast back.
+        """
+
+        check_numpy_support("FactorEncoder.encode_array")
+        import numpy as np #type: ignore
+
+        if not self.is_fit:
+            raise Exception("This encoder must be fit before it can be used.")
+
+        if isinstance(values, CategoryColumn):
+            distinct, inverse = values.categories, np.frombuffer(values.codes, dtype=np.int64)
+        else:
+            distinct, inverse = _unique(values)
+
+        try:
+            levels = np.array([ self._levels[value] for value in distinct ] or [0], dtype=np.int64)
+        except KeyError as e:
+            raise Exception(f"We were unable to find {e} in {self._levels.keys()}") from None
+
+        return levels[inverse]
+
+def _unique(values: Sequence[Any]) -> Tuple[Sequence[Any], Any]:
+    """Find the distinct values (as python objects) and the index of every value into them."""
+
+    import numpy as np #type: ignore
+
+    distinct, inverse = np.unique(np.asarray(values), return_inverse=True)
+
+    return distinct.tolist(), inverse
+
+def _hot_index(onehot: Any) -> int:
+    """Find the position of the 1 in a one hot encoding (or -1 if the encoding is all 0's)."""
+
+    if isinstance(onehot, Category):
+        return onehot.index
+
+    return onehot.index(1) if 1 in onehot else -1
\ No newline at end of file
@@ -5,13 +5,19 @@ TODO add unittests for all filters
 """
 
 import csv
+import math
+import queue
 import collections
+import collections.abc
 import itertools
 
 from abc import ABC, abstractmethod
-from typing import Generic, Hashable, Iterable, TypeVar, Any, Sequence, Union, Tuple, Callable, cast
+from array import array
+from threading import Thread, Event
+from typing import Generic, Hashable, Iterable, TypeVar, Any, Sequence, Union, Tuple, Callable, Dict, List, Optional, cast
 
-from coba.data.encoders import Encoder, OneHotEncoder
+from coba.data.encoders import Encoder, OneHotEncoder, NumericEncoder, FactorEncoder
+from coba.data.structures import SparseVector, CategoryColumn
 from coba.json import CobaJsonEncoder, CobaJsonDecoder
 from coba.execution import ExecutionContext
 
@@ -47,6 +53,72 @@ class JsonDecode(Filter[Iterable[str], Iterable[Any]]):
         decoder = CobaJsonDecoder()
         for item in items: yield decoder.decode(item)
 
+class Prefetch(Filter[Iterable[Any], Iterable[Any]]):
+    """Read items ahead of their consumer in a background thread.
+
+    Remarks:
+        Upstream work (e.g., downloading, parsing and encoding a data set) happens in a background thread
+        while downstream work (e.g., evaluating learners) happens in the calling thread. At most `size`
+        items wait in a bounded queue so upstream never runs more than `size` items ahead. Exceptions
+        raised upstream are re-raised in the calling thread in place of the item they interrupted.
+    """
+
+    def __init__(self, size: int = 1) -> None:
+        """Instantiate a Prefetch filter.
+
+        Args:
+            size: The maximum number of items that can be read ahead of the consumer.
+        """
+
+        assert size > 0, "Prefetch size must be positive"
+
+        self._size = size
+
+    def filter(self, items: Iterable[Any]) -> Iterable[Any]:
+
+        buffer : queue.Queue = queue.Queue(maxsize=self._size)
+        stopped: Event       = Event()
+
+        def produce() -> None:
+            end: Tuple[bool,Any] = (False, None)
+            try:
+                for item in items:
+                    if not Prefetch._put(buffer, (True, item), stopped): return
+            except BaseException as e:
+                end = (False, e)
+            finally:
+                #the end of upstream is always signaled so that the consumer is never left waiting
+                Prefetch._put(buffer, end, stopped)
+
+        #the thread is a daemon so that a consumer that stops early is never stuck waiting on upstream
+        Thread(target=produce, daemon=True).start()
+
+        try:
+            while True:
+                is_item, value = buffer.get()
+
+                if is_item: 
+                    yield value
+                elif value is None:
+                    return
+                else:
+                    raise value
+        finally:
+            stopped.set()
+
+    @staticmethod
+    def _put(buffer: queue.Queue, entry: Tuple[bool,Any], stopped: Event) -> bool:
+        """Put an entry in the buffer, giving up if the consumer has stopped reading."""
+
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
 class ColSplitter(Filter[Iterable[Sequence[Any]], Tuple[Iterable[Sequence[Any]], Iterable[Sequence[Any]]]]):
     
     def __init__(self, split1_columns: Union[Sequence[int],Sequence[str]] = []):
@@ -99,23 +171,44 @@ class ColEncoder(Filter[Iterable[Sequence[str]], Iterable[Sequence[Any]]]):
 
     def filter(self, columns: Iterable[Sequence[str]]) -> Iterable[Sequence[Any]]:
 
+        try:
+            import numpy as np #type: ignore
+        except ImportError:
+            np = None
+
         for index, raw_col in enumerate(columns):
 
             raw_hdr  = raw_col[0]
-            raw_vals = raw_col[1:]
+            raw_vals = raw_col[1] if ColEncoder._is_typed(raw_col) else raw_col[1:]
 
             encoder = self._get_encoder(index, raw_hdr)
             encoder = encoder if encoder.is_fit else encoder.fit(raw_vals)
 
             encoded_values: Sequence[Hashable]
 
+            #numpy only pays off when values don't need to be hashed one at a time to find their
+            #encoding (i.e., numeric values or category codes) and one hot encodings are already
+            #shared tuples that zip (in C) transposes faster than numpy can build the columns
+            use_array = np is not None and (
+                isinstance(encoder, NumericEncoder) or (isinstance(encoder, FactorEncoder) and isinstance(raw_vals, CategoryColumn))
+            )
+
             if isinstance(encoder, OneHotEncoder):
-                encoded_values = list(zip(*encoder.encode(raw_vals)))
+                onehots = encoder.encode(raw_vals)
+                #categories are kept as a single column, one hot tuples are transposed into a column per level
+                encoded_values = list(zip(*onehots)) if onehots and isinstance(onehots[0], tuple) else list(onehots)
+            elif use_array:
+                encoded_values = encoder.encode_array(raw_vals).tolist()
             else:
                 encoded_values = list(encoder.encode(raw_vals))
 
             yield [cast(Hashable,raw_hdr)] + encoded_values
 
+    @staticmethod
+    def _is_typed(column: Sequence[Any]) -> bool:
+        """Determine if a column is a (header, values) pair from ColumnarCsvReader."""
+        return len(column) == 2 and isinstance(column[1], (array, CategoryColumn))
+
     def _get_encoder(self, index: int, header: str) -> Encoder:
 
         encoded_headers = self._headers[0:len(self._encoders)]
@@ -147,17 +240,144 @@ class CsvReader(Filter[Iterable[str], Iterable[Sequence[str]]]):
     def filter(self, items: Iterable[str]) -> Iterable[Sequence[str]]:
         return filter(None,self._csv_reader(items))
 
+class ColumnarCsvReader(Filter[Iterable[str], Iterable[Sequence[Any]]]):
+    """Parse csv lines directly into typed columns.
+
+    Remarks:
+        Each column is returned as a (header, values) pair. Columns whose encoder is a `NumericEncoder`
+        (or, when a column has no encoder, whose non-missing values in the first chunk are numeric) are parsed
+        into an `array('d')` with NaN for missing values. All other columns become a `CategoryColumn`
+        of interned category codes. Lines are parsed in chunks of `chunk_size` so only a chunk of raw
+        strings exists at any time. The arrays can be viewed by numpy without copying (`np.frombuffer`).
+    """
+
+    def __init__(self,
+        headers   : Sequence[str]     = [],
+        encoders  : Sequence[Encoder] = [],
+        chunk_size: int               = 10000,
+        csv_reader: Callable[[Iterable[str]], Iterable[Sequence[str]]] = csv.reader) -> None: #type: ignore #pylance complains
+        """Instantiate a ColumnarCsvReader.
+
+        Args:
+            headers: The headers that the given encoders belong to.
+            encoders: The encoders that will encode each column (used to determine which columns are numeric).
+            chunk_size: The number of lines to parse at a time.
+            csv_reader: The function used to split csv lines into values.
+        """
+        self._headers    = headers
+        self._encoders   = encoders
+        self._chunk_size = chunk_size
+        self._csv_reader = csv_reader
+
+    def filter(self, items: Iterable[str]) -> Iterable[Sequence[Any]]:
+
+        rows    = filter(None, self._csv_reader(items))
+        headers = list(next(rows, []))
+        columns = None
+
+        while True:
+            chunk = list(itertools.islice(rows, self._chunk_size))
+
+            if not chunk: break
+
+            raw_columns = list(zip(*chunk))
+            del chunk
+
+            if columns is None:
+                columns = [ self._new_column(i, h, raw) for i,(h,raw) in enumerate(zip(headers, raw_columns)) ]
+
+            for column, raw in zip(columns, raw_columns):
+                if isinstance(column, CategoryColumn):
+                    column.extend(raw)
+                else:
+                    column.extend(ColumnarCsvReader._floats(raw))
+
+        if columns is None:
+            columns = [ CategoryColumn() for _ in headers ]
+
+        return [ (header, column) for header, column in zip(headers, columns) ]
+
+    def _new_column(self, index: int, header: str, values: Sequence[str]) -> Union[array, CategoryColumn]:
+
+        has_encoder = header in self._headers[0:len(self._encoders)] or (not self._headers and index < len(self._encoders))
+
+        if has_encoder:
+            is_numeric = isinstance(ColEncoder(self._headers, self._encoders)._get_encoder(index, header), NumericEncoder)
+        else:
+            parsed     = [ not math.isnan(v) for v in ColumnarCsvReader._floats(values) ]
+            is_numeric = any(parsed) and all(p or v in ('','?') for p,v in zip(parsed,values))
+
+        return array('d') if is_numeric else CategoryColumn()
+
+    @staticmethod
+    def _floats(values: Sequence[str]) -> array:
+        try:
+            return array('d', map(float, values))
+        except ValueError:
+            return array('d', map(ColumnarCsvReader._float, values))
+
+    @staticmethod
+    def _float(value: str) -> float:
+        try:
+            return float(value)
+        except ValueError:
+            return float('nan')
+
 class CsvTransposer(Filter[Iterable[Sequence[_T_in]], Iterable[Sequence[_T_out]]]):    
-    def __init__(self, flatten: bool = False):
+    def __init__(self, flatten: bool = False, sparse: bool = False):
+        """Instantiate a CsvTransposer.
+
+        Args:
+            flatten: Whether columns of sequences (e.g., one hot encodings) become one column per element.
+            sparse: Whether every row after the header row should be flattened into a SparseVector.
+        """
         self._flatten = flatten
+        self._sparse  = sparse
 
     def filter(self, items: Iterable[Sequence[_T_in]]) -> Iterable[Sequence[_T_out]]:
-        
+
         items = filter(None, items)
+
+        if self._sparse:
+            return self._sparse_rows(list(items))
+
         items = items if not self._flatten else self._flatter(items)
 
         return zip(*list(items)) #type: ignore
 
+    def _sparse_rows(self, columns: Sequence[Sequence[Any]]) -> Iterable[Any]:
+        """Transpose columns into SparseVector rows without ever creating dense rows.
+
+        Remarks:
+            Columns are either [header, value, ...] or, for encoders such as one hot that produce several
+            columns, [header, column, ...] (see `_flatter`). Only the non-zero entries of each row are kept.
+        """
+
+        header : List[Any]                   = []
+        entries: List[List[Tuple[int,Any]]] = []
+        offset = 0
+
+        for column in columns:
+            is_flattened = len(column) > 1 and isinstance(column[1], collections.abc.Sequence) and not isinstance(column[1], str)
+            sub_columns  = column[1:] if is_flattened else [column[1:]]
+
+            for sub_column in sub_columns:
+                header.append(column[0])
+
+                if len(entries) < len(sub_column):
+                    entries.extend([] for _ in range(len(sub_column)-len(entries)))
+
+                for row, value in enumerate(sub_column):
+                    if value is not None and value != 0:
+                        entries[row].append((offset, value))
+
+                offset += 1
+
+        yield header
+
+        for row_entries in entries:
+            yield SparseVector(row_entries)
+
     def _flatter(self, items: Iterable[Sequence[_T_in]]) -> Iterable[Sequence[_T_in]]:
         for item in items:
             if isinstance(item[1], collections.Sequence) and not isinstance(item[1], str):
@@ -173,13 +393,15 @@ class CsvCleaner(Filter[Iterable[str], Iterable[Sequence[Any]]]):
         encoders: Sequence[Encoder] = [],
         default: Encoder = None,
         ignored: Sequence[bool] = [],
-        output_rows: bool = True):
+        output_rows: bool = True,
+        columnar: bool = False):
 
         self._headers  = headers
         self._encoders = encoders
         self._default  = default
         self._ignored  = ignored
         self._output_rows = output_rows
+        self._columnar = columnar
 
     def filter(self, items: Iterable[str]) -> Iterable[Sequence[Any]]:
 
@@ -189,6 +411,9 @@ class CsvCleaner(Filter[Iterable[str], Iterable[Sequence[Any]]]):
             CsvTransposer(), ColRemover(ignored_headers), ColEncoder(self._headers, self._encoders, self._default)
         ]
 
+        #columns from ColumnarCsvReader don't need to be transposed
+        if self._columnar: cleaning_steps = cleaning_steps[1:]
+
         output: Any = items
         
         for cleaning_step in cleaning_steps: output = cleaning_step.filter(output)
@@ -200,33 +425,159 @@ class LabeledCsvCleaner(Filter[Iterable[Sequence[str]], Tuple[Iterable[Sequence[
         headers   : Sequence[str]     = [],
         encoders  : Sequence[Encoder] = [], 
         ignored   : Sequence[bool]    = [],
-        rmv_header: bool              = False):
+        rmv_header: bool              = False,
+        sparse    : bool              = False,
+        columnar  : bool              = False):
 
         self._label_col  = label_col
         self._encoders   = encoders
         self._headers    = headers
         self._ignored    = ignored
         self._rmv_header = rmv_header
+        self._sparse     = sparse
+        self._columnar   = columnar
 
     def filter(self, items: Iterable[Sequence[str]]) -> Tuple[Iterable[Sequence[Any]],Iterable[Sequence[Any]]]:
 
         split_column = cast(Union[Sequence[str],Sequence[int]], [self._label_col])
 
-        clean      = CsvCleaner(self._headers, self._encoders, None, self._ignored, output_rows=False)
+        clean      = CsvCleaner(self._headers, self._encoders, None, self._ignored, output_rows=False, columnar=self._columnar)
         split      = ColSplitter(split_column)
-        rows       = ForeachFilter(CsvTransposer(True))
-        rmv_header = ForeachFilter(RowRemover([0]))
-
-        output: Any = items
+        label_rows = CsvTransposer(True)
+        feat_rows  = CsvTransposer(True, self._sparse)
+        rmv_header = RowRemover([0])
 
         with ExecutionContext.Logger.log('encoding data... '):
 
-            output = rows.filter(split.filter(clean.filter(output)))
+            label_cols, feature_cols = split.filter(clean.filter(items))
+
+            labels   = label_rows.filter(label_cols)
+            features = feat_rows.filter(feature_cols)
+
+            if self._rmv_header:
+                labels   = rmv_header.filter(labels)
+                features = rmv_header.filter(features)
+
+            return features, labels
+
+class LabeledCsvRowCleaner(Filter[Iterable[Sequence[str]], Iterable[Tuple[Any,Any]]]):
+    """Encode labeled csv rows into (features, label) pairs in a single streaming pass.
+
+    Remarks:
+        Unlike `LabeledCsvCleaner` the data is never transposed into columns. Rows are encoded in chunks of
+        `chunk_size` so, when the rows are themselves streamed (e.g., from an `HttpSource`), peak memory is
+        proportional to a chunk rather than the data set. Encoders that aren't fit are fit on the first
+        `fit_rows` rows (or on every row when `fit_rows` is None, which requires holding all of the raw rows
+        in memory). Provide fit encoders (e.g., from data set metadata) to stream. Rows whose label is
+        missing ('?') have no correct action so they are dropped and the number dropped is logged.
+    """
+
+    def __init__(self,
+        label_col : Union[int,str],
+        headers   : Sequence[str]     = [],
+        encoders  : Sequence[Encoder] = [],
+        ignored   : Sequence[bool]    = [],
+        rmv_header: bool              = False,
+        sparse    : bool              = False,
+        fit_rows  : Optional[int]     = 1000,
+        chunk_size: int               = 1000):
+
+        self._label_col  = label_col
+        self._headers    = headers
+        self._encoders   = encoders
+        self._ignored    = ignored
+        self._rmv_header = rmv_header
+        self._sparse     = sparse
+        self._fit_rows   = fit_rows
+        self._chunk_size = chunk_size
+
+    def filter(self, items: Iterable[Sequence[str]]) -> Iterable[Tuple[Any,Any]]:
+
+        rows = iter(filter(None, items))
+
+        header  = next(rows, []) if self._rmv_header else []
+        headers = list(self._headers) or list(header)
+
+        label_index  = headers.index(self._label_col) if isinstance(self._label_col, str) else self._label_col
+        ignored      = set(itertools.compress(range(len(self._ignored)), self._ignored))
+        encoders     = list(self._encoders)
+        feature_cols = None
+
+        nonzeros: Dict[int, Tuple[Any, List[Tuple[int,Any]]]] = {}
+        missing : List[int] = [0]
+
+        for chunk in self._chunks(self._labeled(rows, label_index, missing), encoders):
+
+            if feature_cols is None:
+                feature_cols = [ i for i in range(len(chunk[0])) if i != label_index and i not in ignored ]
+
+            columns = { i:encoders[i].encode([row[i] for row in chunk]) for i in feature_cols + [label_index] }
+
+            for r in range(len(chunk)):
+                values  = [ columns[i][r] for i in feature_cols ]
+                label   = _dense_row([columns[label_index][r]])
+                feature = _sparse_row(values, nonzeros) if self._sparse else _dense_row(values)
+
+                yield feature, label
+
+        if missing[0] > 0:
+            ExecutionContext.Logger.log(f"{missing[0]} rows were dropped because their label was missing.")
+
+    def _labeled(self, rows: Iterable[Sequence[str]], label_index: int, missing: List[int]) -> Iterable[Sequence[str]]:
+        """Remove rows whose label is missing while counting them in `missing`."""
+
+        for row in rows:
+            if row[label_index] == '?':
+                missing[0] += 1
+            else:
+                yield row
+
+    def _chunks(self, rows: Iterable[Sequence[str]], encoders: List[Encoder]) -> Iterable[List[Sequence[str]]]:
+        """Read rows in chunks while fitting (in place) any encoders that aren't fit yet."""
+
+        fitting = [ i for i,encoder in enumerate(encoders) if not encoder.is_fit ]
+
+        if fitting:
+            prefix = list(rows) if self._fit_rows is None else list(itertools.islice(rows, self._fit_rows))
+
+            for i in fitting:
+                encoders[i] = encoders[i].fit([row[i] for row in prefix])
+
+            rows = itertools.chain(prefix, rows)
+            del prefix
+
+        while True:
+            chunk = list(itertools.islice(rows, self._chunk_size))
+
+            if not chunk: return
+
+            yield chunk
+
+def _dense_row(values: Sequence[Any]) -> Tuple[Any,...]:
+    """Flatten encoded values (where some may be tuples such as one hot encodings) into a single tuple."""
+    return tuple(itertools.chain.from_iterable( v if isinstance(v, tuple) else (v,) for v in values ))
+
+def _sparse_row(values: Sequence[Any], nonzeros: Dict[int, Tuple[Any, List[Tuple[int,Any]]]]) -> SparseVector:
+    """Flatten encoded values into a SparseVector without creating the dense row.
+
+    Remarks:
+        Encoders return the same tuple instance for every occurrence of a value (e.g., the one hot
+        encoding of a category) so the non-zero entries of each distinct tuple are cached by id in
+        `nonzeros`. The cache holds a reference to each tuple so that its id can't be reused.
+    """
+
+    entries: List[Tuple[int,Any]] = []
+    offset = 0
 
-            if self._rmv_header: 
-                output = rmv_header.filter(output)
+    for value in values:
+        if isinstance(value, tuple):
+            if id(value) not in nonzeros:
+                nonzeros[id(value)] = (value, [ (i,v) for i,v in enumerate(value) if v != 0 ])
 
-            labels   = next(output)
-            features = next(output)
+            entries.extend( (offset+i, v) for i,v in nonzeros[id(value)][1] )
+            offset += len(value)
+        else:
+            entries.append((offset, value))
+            offset += 1
 
-            return features, labels
\ No newline at end of file
+    return SparseVector(entries)
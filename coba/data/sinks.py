@@ -25,7 +25,7 @@ class DiskSink(Sink[Iterable[str]]):
 
     def write(self, items: Iterable[str]) -> None:
         with open(self.filename, self._mode) as f:
-            for item in items: f.write(item + '\n')
+            for item in items: f.write(item if 'b' in self._mode else item + '\n')
 
 class MemorySink(Sink[_T_in]):
     def __init__(self):
@@ -4,6 +4,7 @@ TODO: Add docstrings for all Sources
 TODO: Add unit tests for all Sources
 """
 
+import codecs
 import requests
 
 from abc import ABC, abstractmethod
@@ -50,6 +51,18 @@ class QueueSource(Source[Iterable[Any]]):
             yield item
 
 class HttpSource(Source[Iterable[str]]):
+    """A source that reads the lines of a file from a url.
+
+    Remarks:
+        The file is downloaded in chunks and its lines are decoded as the chunks arrive so the whole
+        file never has to fit in memory. The chunks are written to the FileCache as they are read (if
+        one is set) and the file's checksum is checked once its final chunk has arrived. A file whose
+        checksum doesn't match raises an exception and is never cached.
+    """
+
+    #the number of bytes requested from the response at a time
+    ChunkSize = 2**20
+
     def __init__(self, url: str, file_extension: str = None, checksum: str = None, desc: str = "") -> None:
         self._url       = url
         self._checksum  = checksum
@@ -57,40 +70,66 @@ class HttpSource(Source[Iterable[str]]):
         self._cachename = f"{md5(self._url.encode('utf-8')).hexdigest()}{file_extension}"
 
     def read(self) -> Iterable[str]:
-        bites = self._get_bytes()
+        return HttpSource._lines(self._get_chunks())
 
-        if self._checksum is not None and md5(bites).hexdigest() != self._checksum:
+    def _get_chunks(self) -> Iterable[bytes]:
+        if self._cachename in ExecutionContext.FileCache:
+            ExecutionContext.Logger.log(f'loading {self._desc} from cache... '.replace('  ', ' '))
+            return self._checked(ExecutionContext.FileCache.get_chunks(self._cachename))
+        else:
+            ExecutionContext.Logger.log(f'loading {self._desc} from http... ')
+            return ExecutionContext.FileCache.put_chunks(self._cachename, self._checked(self._http_chunks()))
+
+    def _checked(self, chunks: Iterable[bytes]) -> Iterable[bytes]:
+        checksum = md5()
+
+        for chunk in chunks:
+            checksum.update(chunk)
+            yield chunk
+
+        if self._checksum is not None and checksum.hexdigest() != self._checksum:
             message = (
                 f"The dataset at {self._url} did not match the expected checksum. This could be the result of "
                 "network errors or the file becoming corrupted. Please consider downloading the file again "
                 "and if the error persists you may want to manually download and reference the file.")
             raise Exception(message) from None
 
-        if self._cachename not in ExecutionContext.FileCache: ExecutionContext.FileCache.put(self._cachename, bites)
+    def _http_chunks(self) -> Iterable[bytes]:
+        with requests.get(self._url, stream=True) as response:
 
-        return bites.decode('utf-8').splitlines()
-    
-    def _get_bytes(self) -> bytes:
-        if self._cachename in ExecutionContext.FileCache:
-            with ExecutionContext.Logger.log(f'loading {self._desc} from cache... '.replace('  ', ' ')):
-                return ExecutionContext.FileCache.get(self._cachename)
-        else:
-            with ExecutionContext.Logger.log(f'loading {self._desc} from http... '):
-                response = requests.get(self._url)
-
-                if response.status_code == 412 and 'openml' in self._url:
-                    if 'please provide api key' in response.text:
-                        message = (
-                            "An API Key is needed to access openml's rest API. A key can be obtained by creating an "
-                            "openml account at openml.org. Once a key has been obtained it should be placed within "
-                            "~/.coba as { \"openml_api_key\" : \"<your key here>\", }.")
-                        raise Exception(message) from None
-
-                    if 'authentication failed' in response.text:
-                        message = (
-                            "The API Key you provided no longer seems to be valid. You may need to create a new one"
-                            "longing into your openml account and regenerating a key. After regenerating the new key "
-                            "should be placed in ~/.coba as { \"openml_api_key\" : \"<your key here>\", }.")
-                        raise Exception(message) from None
-
-                return response.content
\ No newline at end of file
+            if response.status_code == 412 and 'openml' in self._url:
+                if 'please provide api key' in response.text:
+                    message = (
+                        "An API Key is needed to access openml's rest API. A key can be obtained by creating an "
+                        "openml account at openml.org. Once a key has been obtained it should be placed within "
+                        "~/.coba as { \"openml_api_key\" : \"<your key here>\", }.")
+                    raise Exception(message) from None
+
+                if 'authentication failed' in response.text:
+                    message = (
+                        "The API Key you provided no longer seems to be valid. You may need to create a new one"
+                        "longing into your openml account and regenerating a key. After regenerating the new key "
+                        "should be placed in ~/.coba as { \"openml_api_key\" : \"<your key here>\", }.")
+                    raise Exception(message) from None
+
+            for chunk in response.iter_content(chunk_size=HttpSource.ChunkSize):
+                yield chunk
+
+    @staticmethod
+    def _lines(chunks: Iterable[bytes]) -> Iterable[str]:
+        """Decode chunks of utf-8 bytes into the same lines as `bytes.decode('utf-8').splitlines()`."""
+
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        partial = ''
+
+        for chunk in chunks:
+            lines = (partial + decoder.decode(chunk)).splitlines(True)
+
+            #the last line is held back since it may continue (or end with the '\n' of a '\r\n') in the next chunk
+            partial = lines.pop() if lines else ''
+
+            for line in lines:
+                yield line.splitlines()[0]
+
+        for line in (partial + decoder.decode(b'', final=True)).splitlines():
+            yield line
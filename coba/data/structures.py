@@ -1,17 +1,28 @@
 """The data.structures module contains basic coba datastructures. """
 
 import collections
+import collections.abc
 
-from typing import Sequence, Hashable, Any, Dict, Iterable
+from array import array
+from typing import Sequence, Hashable, Any, Dict, Iterable, List, MutableSequence, Optional, Tuple, Union, Mapping, Iterator
 
 from coba.utilities import check_pandas_support
 
 class Table:
-    """A container class for storing tabular data."""
+    """A container class for storing tabular data.
+
+    Remarks:
+        Tables are stored by column rather than by row. Columns whose values are all ints or all
+        floats are kept in compact `array.array` storage while all other columns are kept in lists.
+        Rows are located through a primary key index and are only materialized when requested. The
+        first time a column is queried with `get_where` or `rmv_where` a hash index mapping that column's
+        values to primary keys is built. The index is then maintained as rows are added and removed so
+        that repeated queries only touch the rows that match.
+    """
 
     def __init__(self, name:str, primary: Sequence[str], default=float('nan')):
         """Instantiate a Table.
-        
+
         Args:
             name: The name of the table.
             default: The default values to fill in missing values with
@@ -21,47 +32,73 @@ class Table:
         self._columns = list(primary)
         self._default = default
 
-        self.rows: Dict[Hashable, Sequence[Any]] = {}
+        self._data : Dict[str, MutableSequence[Any]] = { col:[] for col in self._columns }
+        self._index: Dict[Hashable, int]             = {}
+        self._size = 0
+
+        self._indexes : Dict[str, Optional[Dict[Hashable, Dict[Hashable, None]]]] = {}
+        self._row_type: Any = None
+
+    @property
+    def rows(self) -> Dict[Hashable, Sequence[Any]]:
+        """A mapping of primary keys to row tuples."""
+        return { key:tuple(row) for key,row in zip(self._index.keys(), self._row_values()) }
 
     def add_row(self, *row, **kwrow) -> None:
         """Add a row of data to the table. The row must contain all primary columns."""
 
-        if kwrow:
-            self._columns.extend([col for col in kwrow if col not in self._columns])
+        for col in kwrow:
+            if col not in self._data:
+                self._columns.append(col)
+                self._data[col] = self._new_column([self._default] * self._size)
+                self._row_type  = None
 
-        row = row + tuple( kwrow.get(col, self._default) for col in self._columns[len(row):] ) #type:ignore
-        self.rows[row[0] if len(self._primary) == 1 else tuple(row[0:len(self._primary)])] = row
+        values = dict(zip(self._columns, row))
+        values.update({ col:kwrow.get(col, self._default) for col in self._columns[len(row):] })
 
-    def get_row(self, key: Hashable) -> Dict[str,Any]:
-        row = self.rows[key]
-        row = list(row) + [self._default] * (len(self._columns) - len(row))
+        key   = values[self._primary[0]] if len(self._primary) == 1 else tuple(values[col] for col in self._primary)
+        index = self._index.get(key, None)
+
+        if index is None:
+            index = self._size
+            self._index[key] = index
+            self._size += 1
+        else:
+            self._unindex(key, index)
+
+        for col in self._columns:
+            self._set(col, index, values[col])
 
-        return {k:v for k,v in zip(self._columns,row)}
+        self._reindex(key, index)
+
+    def get_row(self, key: Hashable) -> Dict[str,Any]:
+        index = self._index[key]
+        return { col:self._data[col][index] for col in self._columns }
 
     def rmv_row(self, key: Hashable) -> None:
-        self.rows.pop(key, None)
+        if key in self._index:
+            self._unindex(key, self._index.pop(key))
 
     def get_where(self, **kwargs) -> Iterable[Dict[str,Any]]:
 
         if any([k not in self._columns for k in kwargs]):
             return
 
-        idx_val = [ (self._columns.index(col), val) for col,val in kwargs.items() ]
-
-        for key,row in self.rows.items():
-            if all( row[i]==v for i,v in idx_val):
-                yield {k:v for k,v in zip(self._columns,row)}
+        for index in self._where(**kwargs):
+            yield { col:self._data[col][index] for col in self._columns }
 
     def rmv_where(self, **kwrow) -> None:
-        idx_val = [ (self._columns.index(col), val) for col,val in kwrow.items() ]
-        rmv_keys  = []
 
-        for key,row in self.rows.items():
-            if all( row[i]==v for i,v in idx_val):
-                rmv_keys.append(key)
+        if any([k not in self._columns for k in kwrow]):
+            return
+
+        rmv_indexes = set(self._where(**kwrow))
+        rmv_keys    = [ key for key,index in self._index.items() if index in rmv_indexes ]
+
+        for key in rmv_keys:
+            self.rmv_row(key)
 
-        for key in rmv_keys: 
-            del self.rows[key] 
+        self._compact()
 
     def to_tuples(self) -> Sequence[Any]:
         """Convert a table into a sequence of namedtuples."""
@@ -70,10 +107,11 @@ class Table:
     def to_indexed_tuples(self) -> Dict[Hashable, Any]:
         """Convert a table into a mapping of keys to tuples."""
 
-        my_type = collections.namedtuple(self._name, self._columns) #type: ignore #mypy doesn't like dynamic named tuples
-        my_type.__new__.__defaults__ = (self._default, ) * len(self._columns) #type: ignore #mypy doesn't like dynamic named tuples
-        
-        return { key:my_type(*value) for key,value in self.rows.items() } #type: ignore #mypy doesn't like dynamic named tuples
+        if self._row_type is None:
+            self._row_type = collections.namedtuple(self._name, self._columns) #type: ignore #mypy doesn't like dynamic named tuples
+            self._row_type.__new__.__defaults__ = (self._default, ) * len(self._columns) #type: ignore #mypy doesn't like dynamic named tuples
+
+        return dict(zip(self._index.keys(), map(self._row_type._make, self._row_values()))) #type: ignore #mypy doesn't like dynamic named tuples
 
     def to_pandas(self) -> Any:
         """Convert a table into a pandas dataframe."""
@@ -81,23 +119,295 @@ class Table:
         check_pandas_support('Table.to_pandas')
         import pandas as pd #type: ignore #mypy complains otherwise
 
-        return pd.DataFrame(self.to_tuples())
+        if len(self) == 0: return pd.DataFrame([])
+
+        self._compact()
+
+        return pd.DataFrame({ col:list(self._data[col]) for col in self._columns }, columns=self._columns)
+
+    def _where(self, **kwargs) -> Sequence[int]:
+        self._compact()
+
+        indexed   = { col:val for col,val in kwargs.items() if self._column_index(col) is not None }
+        unindexed = { col:val for col,val in kwargs.items() if col not in indexed }
+
+        if indexed:
+            try:
+                key_sets = sorted([ self._indexes[col].get(val, {}) for col,val in indexed.items() ], key=len) #type: ignore
+            except TypeError: #the queried value isn't hashable so it can't be in any index
+                return []
+
+            matches: Iterable[int] = sorted(self._index[key] for key in key_sets[0] if all(key in keys for keys in key_sets[1:]))
+        else:
+            matches = range(self._size)
+
+        for col,val in unindexed.items():
+            values  = self._data[col]
+            matches = [ index for index in matches if values[index] == val ]
+
+        return list(matches)
+
+    def _column_index(self, col: str) -> Optional[Dict[Hashable, Dict[Hashable, None]]]:
+        """Get the hash index for a column, building it if it doesn't exist yet.
+
+        Remarks:
+            Columns holding unhashable values (e.g., lists) can't be indexed and always return None.
+        """
+
+        if col not in self._indexes:
+            self._compact()
+
+            col_index: Dict[Hashable, Dict[Hashable, None]] = collections.defaultdict(dict)
+            values = self._data[col]
+
+            try:
+                for key,index in self._index.items():
+                    col_index[values[index]][key] = None
+                self._indexes[col] = col_index
+            except TypeError:
+                self._indexes[col] = None
+
+        return self._indexes[col]
+
+    def _reindex(self, key: Hashable, index: int) -> None:
+        for col,col_index in self._indexes.items():
+            if col_index is None: continue
+
+            try:
+                col_index[self._data[col][index]][key] = None
+            except TypeError:
+                self._indexes[col] = None
+
+    def _unindex(self, key: Hashable, index: int) -> None:
+        for col,col_index in self._indexes.items():
+            if col_index is None: continue
+
+            value = self._data[col][index]
+            keys  = col_index.get(value, {})
+
+            keys.pop(key, None)
+            if not keys: col_index.pop(value, None)
+
+    def _row_values(self) -> Iterable[Sequence[Any]]:
+        self._compact()
+        return zip(*[ self._data[col] for col in self._columns ])
+
+    def _set(self, col: str, index: int, value: Any) -> None:
+        values = self._data[col]
+
+        if len(values) == 0:
+            self._data[col] = self._new_column([value])
+            return
+
+        if isinstance(values, array) and self._typecode(value) != values.typecode:
+            values = self._data[col] = list(values)
+
+        try:
+            if index == len(values):
+                values.append(value)
+            else:
+                values[index] = value
+        except OverflowError:
+            self._data[col] = list(values)
+            self._set(col, index, value)
+
+    def _compact(self) -> None:
+        """Drop the storage of removed rows from every column."""
+
+        if len(self._index) == self._size: return
+
+        keep = list(self._index.values())
+
+        for col in self._columns:
+            values = self._data[col]
+            kept   = [ values[index] for index in keep ]
+            self._data[col] = array(values.typecode, kept) if isinstance(values, array) else kept
+
+        self._index = dict(zip(self._index.keys(), range(len(keep))))
+        self._size  = len(keep)
+
+    @staticmethod
+    def _typecode(value: Any) -> Optional[str]:
+        return 'q' if type(value) is int else 'd' if type(value) is float else None
+
+    @staticmethod
+    def _new_column(values: List[Any]) -> MutableSequence[Any]:
+        typecodes = set(map(Table._typecode, values))
+
+        if len(typecodes) == 1 and None not in typecodes:
+            try:
+                return array(typecodes.pop(), values)
+            except OverflowError:
+                pass
+
+        return values
 
     def __contains__(self, primary) -> bool:
 
-        if isinstance(primary, collections.Mapping):
+        if isinstance(primary, collections.abc.Mapping):
             primary = list(primary.values())[0] if len(self._primary) == 1 else tuple([primary[col] for col in self._primary])
 
-        return primary in self.rows
+        return primary in self._index
 
     def __getitem__(self, key) -> Dict[str,Any]:
         return self.get_row(key)
 
     def __str__(self) -> str:
-        return str({"Table": self._name, "Columns": self._columns, "Rows": len(self.rows)})
+        return str({"Table": self._name, "Columns": self._columns, "Rows": len(self)})
 
     def __repr__(self) -> str:
         return str(self)
 
     def __len__(self) -> int:
-        return len(self.rows)
\ No newline at end of file
+        return len(self._index)
+
+class SparseVector(collections.abc.Mapping):
+    """An immutable mapping of feature indexes to feature values where zero valued features are omitted.
+
+    Remarks:
+        A SparseVector is hashable (so it can be used as a context in lookup tables) and its hash is only
+        calculated the first time it is needed. Indexing a SparseVector follows the Mapping interface so a
+        missing (i.e., zero valued) index raises a KeyError. Use `get(index, 0)` to read features densely.
+    """
+
+    __slots__ = ('_values', '_hash')
+
+    def __init__(self, values: Union[Mapping[int,Any], Iterable[Tuple[int,Any]]] = ()) -> None:
+        """Instantiate a SparseVector.
+
+        Args:
+            values: The index and value of every feature. Features whose value is 0 or None are dropped.
+        """
+
+        items = values.items() if isinstance(values, collections.abc.Mapping) else values
+
+        self._values: Dict[int,Any] = { i:v for i,v in items if v is not None and v != 0 }
+        self._hash  : Optional[int] = None
+
+    @staticmethod
+    def from_dense(values: Sequence[Any]) -> 'SparseVector':
+        """Create a SparseVector from a dense sequence of feature values."""
+        return SparseVector(enumerate(values))
+
+    def to_dense(self, width: int) -> Tuple[Any,...]:
+        """Convert the SparseVector into a dense tuple with the given number of features."""
+
+        dense = [0] * width
+
+        for i,v in self._values.items():
+            dense[i] = v
+
+        return tuple(dense)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._values[index]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._values.items()))
+
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SparseVector):
+            return self._values == other._values
+
+        return super().__eq__(other)
+
+    def __reduce__(self) -> Tuple[Any,...]:
+        return (SparseVector, (self._values,))
+
+    def __repr__(self) -> str:
+        return f"SparseVector({self._values})"
+
+class CategoryColumn(collections.abc.Sequence):
+    """A column of nominal values stored as integer codes into a list of distinct categories.
+
+    Remarks:
+        Every distinct value is only stored once (in `categories`) and the column itself is an `array.array`
+        of codes. Encoders can therefore encode each category once and then look up the encoding by code.
+    """
+
+    def __init__(self, categories: Sequence[Hashable] = (), codes: Iterable[int] = ()) -> None:
+        """Instantiate a CategoryColumn.
+
+        Args:
+            categories: The distinct values in the column in the order of their codes.
+            codes: The code of the category at every position in the column.
+        """
+        self.categories = list(categories)
+        self.codes      = array('q', codes)
+        self._lookup    = { category:code for code,category in enumerate(self.categories) }
+
+    def extend(self, values: Iterable[Hashable]) -> None:
+        """Append values to the column, adding a category for every value that hasn't been seen."""
+
+        lookup, categories = self._lookup, self.categories
+
+        for value in values:
+            code = lookup.get(value)
+
+            if code is None:
+                code = lookup[value] = len(categories)
+                categories.append(value)
+
+            self.codes.append(code)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ self.categories[code] for code in self.codes[index] ]
+
+        return self.categories[self.codes[index]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+class Category:
+    """A one hot encoded value that is stored as the index of its 1 rather than as a tuple of 0's and 1's.
+
+    Remarks:
+        An encoder creates one Category per level which is then shared by every row with that level. The
+        equivalent one hot tuple is only created when `onehot` is requested so learners that understand
+        categories (e.g., as a `name=level` feature in VW) never have to see the dense representation. An
+        index of -1 indicates a value whose one hot encoding is all 0's (e.g., an unknown level).
+    """
+
+    __slots__ = ('level', 'index', 'width')
+
+    def __init__(self, level: Hashable, index: int, width: int) -> None:
+        """Instantiate a Category.
+
+        Args:
+            level: The original (i.e., unencoded) value of the category.
+            index: The position of the 1 in the category's one hot encoding.
+            width: The length of the category's one hot encoding.
+        """
+        self.level = level
+        self.index = index
+        self.width = width
+
+    @property
+    def onehot(self) -> Tuple[int,...]:
+        """The one hot encoding of the category."""
+        return tuple( int(i == self.index) for i in range(self.width) )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Category) and (self.level, self.index, self.width) == (other.level, other.index, other.width)
+
+    def __lt__(self, other: 'Category') -> bool:
+        return self.index < other.index
+
+    def __hash__(self) -> int:
+        return hash((self.level, self.index, self.width))
+
+    def __reduce__(self) -> Tuple[Any,...]:
+        return (Category, (self.level, self.index, self.width))
+
+    def __repr__(self) -> str:
+        return f"Category({self.level!r}, {self.index}, {self.width})"
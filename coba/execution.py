@@ -11,17 +11,18 @@ import time
 import sys
 import os
 import traceback
+import threading
 
 from io import UnsupportedOperation
 from contextlib import contextmanager
 from itertools import repeat
-from gzip import compress, decompress
+from gzip import compress, decompress, GzipFile
 from abc import ABC, abstractmethod
 from pathlib import Path
 from datetime import datetime
 from typing import (
     Callable, ContextManager, Union, Generic, TypeVar, Dict, IO,
-    Mapping, Any, Optional, List, MutableMapping, cast, Iterator
+    Mapping, Any, Optional, List, MutableMapping, cast, Iterator, Iterable
 )
 
 _K = TypeVar("_K")
@@ -116,6 +117,8 @@ class CobaConfig():
         self.file_cache       = config.get("file_cache", {"type":"none"})
         self.processes        = config.get("processes", 1)
         self.maxtasksperchild = config.get("maxtasksperchild", None)
+        self.chunk_size       = config.get("chunk_size", None)
+        self.simulation_cache = config.get("simulation_cache", None)
 
 class CacheInterface(Generic[_K, _V], ABC):
     """The interface for a cacher."""
@@ -136,6 +139,32 @@ class CacheInterface(Generic[_K, _V], ABC):
     def rmv(self, key: _K) -> None:
         ...
 
+    def get_chunks(self, key: _K) -> Iterable[bytes]:
+        """Get a cached value in chunks.
+
+        Remarks:
+            By default the whole value is returned as a single chunk. Caches that are able to
+            read a value in pieces should override this so large values never sit in memory.
+        """
+        yield cast(bytes, self.get(key))
+
+    def put_chunks(self, key: _K, chunks: Iterable[bytes]) -> Iterable[bytes]:
+        """Put a value into the cache as its chunks are iterated.
+
+        Remarks:
+            Every chunk is yielded as it is received and the value is only stored once all of its
+            chunks have been received. If iteration stops early or fails nothing is stored. By
+            default the chunks are joined in memory. Caches that are able to write a value in pieces
+            should override this so large values never sit in memory.
+        """
+        value = []
+
+        for chunk in chunks:
+            value.append(chunk)
+            yield chunk
+
+        self.put(key, cast(_V, b''.join(value)))
+
 class NoneCache(CacheInterface[_K, _V]):
     def __init__(self) -> None:
         self._cache: Dict[_K,_V] = {}
@@ -149,6 +178,9 @@ class NoneCache(CacheInterface[_K, _V]):
     def put(self, key: _K, value: _V) -> None:
         pass
 
+    def put_chunks(self, key: _K, chunks: Iterable[bytes]) -> Iterable[bytes]:
+        return chunks
+
     def rmv(self, key: _K):
         pass
 
@@ -174,6 +206,9 @@ class DiskCache(CacheInterface[str, bytes]):
     The DiskCache compresses all values before storing in order to conserve space.
     """
 
+    #the number of uncompressed bytes read at a time by `get_chunks`
+    ChunkSize = 2**20
+
     def __init__(self, path: Union[str, Path]) -> None:
         """Instantiate a DiskCache.
         
@@ -203,8 +238,42 @@ class DiskCache(CacheInterface[str, bytes]):
             value: The bytes that should be cached for the given filename.
         """
 
-        self._cache_path(filename).touch()
-        self._cache_path(filename).write_bytes(compress(value))
+        #write to a temporary file first so that an interrupted put never leaves a partial value behind
+        temp_path = self._cache_path(filename).with_name(f"{self._cache_name(filename)}.{os.getpid()}.tmp")
+        temp_path.write_bytes(compress(value))
+        os.replace(temp_path, self._cache_path(filename))
+
+    def get_chunks(self, filename: str) -> Iterable[bytes]:
+        """Get a filename from the cache in chunks.
+
+        Args:
+            filename: Requested filename to retreive from the cache.
+        """
+
+        with GzipFile(self._cache_path(filename), 'rb') as f:
+            for chunk in iter(lambda: f.read(DiskCache.ChunkSize), b''):
+                yield chunk
+
+    def put_chunks(self, filename: str, chunks: Iterable[bytes]) -> Iterable[bytes]:
+        """Put a filename into the cache as its chunks are iterated.
+
+        Args:
+            filename: The filename to store in the cache.
+            chunks: The chunks of bytes that should be cached for the given filename.
+        """
+
+        temp_path = self._cache_path(filename).with_name(f"{self._cache_name(filename)}.{os.getpid()}.tmp")
+
+        try:
+            with GzipFile(temp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+        except BaseException:
+            if temp_path.exists(): temp_path.unlink()
+            raise
+
+        os.replace(temp_path, self._cache_path(filename))
 
     def rmv(self, filename: str) -> None:
         """Remove a filename from the cache.
@@ -331,6 +400,39 @@ class NoneLogger(UniversalLogger):
     def __init__(self) -> None:
         super().__init__(print_function=lambda m,e: None)
 
+class ThreadLogger(LoggerInterface):
+    """An implementation of the LoggerInterface that only writes logs from the thread that created it.
+
+    Remarks:
+        A UniversalLogger keeps a single indentation level so logs written by two threads at once
+        are interleaved into nonsensical nesting. This logger passes logs from the thread that
+        created it to the given logger and quietly drops logs from every other thread.
+    """
+
+    def __init__(self, logger: LoggerInterface) -> None:
+        """Instantiate a ThreadLogger.
+
+        Args:
+            logger: The logger that logs from the creating thread will be written to.
+        """
+        self._logger = logger
+        self._thread = threading.get_ident()
+
+    @contextmanager
+    def _ignore(self) -> Iterator[LoggerInterface]:
+        yield self
+
+    def log(self, message: str, end: str = None) -> ContextManager[LoggerInterface]:
+        if threading.get_ident() == self._thread:
+            return self._logger.log(message, end)
+        else:
+            return self._ignore()
+
+    def log_exception(self, exception: Exception, preamble: str = '') -> None:
+        #exceptions from other threads aren't marked as logged so the creating thread can still log them
+        if threading.get_ident() == self._thread:
+            self._logger.log_exception(exception, preamble)
+
 class LoggedException(Exception):
     """An exception that has been logged but not handled."""
 
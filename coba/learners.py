@@ -94,6 +94,45 @@ class Learner(Generic[_C_in, _A_in], ABC):
         """
         ...
 
+    def predict_batch(self, keys: Sequence[Key], contexts: Sequence[_C_in], action_sets: Sequence[Sequence[_A_in]]) -> Sequence[Sequence[float]]:
+        """Choose which action to take for a batch of interactions.
+
+        Args:
+            keys: The unique identifiers for each interaction in the batch.
+            contexts: The contexts for each interaction in the batch.
+            action_sets: The actions to choose from for each interaction in the batch.
+
+        Returns:
+            A sequence of probabilities indicating the probability for each action for each interaction.
+
+        Remarks:
+            This method is optional. By default it simply calls `predict` for each interaction. Learners 
+            that can predict an entire batch at once (e.g., those backed by numpy) should override it.
+        """
+        return [ self.predict(key, context, actions) for key, context, actions in zip(keys, contexts, action_sets) ]
+
+    def learn_batch(self, 
+        keys         : Sequence[Key], 
+        contexts     : Sequence[_C_in], 
+        actions      : Sequence[_A_in], 
+        rewards      : Sequence[Reward], 
+        probabilities: Sequence[float]) -> None:
+        """Learn about the results of actions that were taken for a batch of interactions.
+
+        Args:
+            keys: The unique identifiers for each interaction in the batch.
+            contexts: The contexts for each interaction in the batch.
+            actions: The action that was selected for each interaction in the batch.
+            rewards: The reward received for each interaction in the batch.
+            probabilities: The probability with which each action was selected.
+
+        Remarks:
+            This method is optional. By default it simply calls `learn` for each interaction. Learners
+            that can learn from an entire batch at once (e.g., those backed by numpy) should override it.
+        """
+        for key, context, action, reward, probability in zip(keys, contexts, actions, rewards, probabilities):
+            self.learn(key, context, action, reward, probability)
+
 class RandomLearner(Learner[Context, Action]):
     """A Learner implementation that selects an action at random and learns nothing."""
 
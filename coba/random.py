@@ -14,8 +14,11 @@ Remarks:
 import math
 import random as std_random
 import itertools
+import threading
 
-from typing import Optional, Sequence, Any, List
+from contextlib import contextmanager
+
+from typing import Optional, Sequence, Any, List, Iterator
 
 class CobaRandom:
     """A random number generator via a linear congruential generator."""
@@ -112,6 +115,41 @@ class CobaRandom:
 
             return seq[[ rng <= c for c in cdf].index(True)]
 
+    def choice_batch(self, seqs: Sequence[Sequence[Any]], weights: Sequence[Sequence[float]]) -> Sequence[Any]:
+        """Choose a random item from each of the given sequences.
+
+        Args:
+            seqs: The sequences to pick randomly from.
+            weights: The proportion by which each sequence in seqs is selected from.
+
+        Remarks:
+            This produces exactly the same choices as calling `choice` for each sequence in order. When
+            numpy is installed and every weight sequence has the same length the choices are vectorized.
+        """
+
+        if len(seqs) == 0:
+            return []
+
+        if any(sum(w) == 0 for w in weights):
+            raise ValueError("The sume of weights cannot be zero.")
+
+        rngs = self.randoms(len(seqs))
+
+        try:
+            import numpy as np #type: ignore
+        except ImportError:
+            np = None
+
+        if np is not None and len(set(map(len, weights))) == 1:
+            #cumsum adds sequentially so the cdf (and its last value, the sum) is identical to accumulate
+            cdfs    = np.cumsum(np.array(weights, dtype=float), axis=1)
+            indexes = (np.array(rngs)[:,None] * cdfs[:,-1:] <= cdfs).argmax(axis=1).tolist()
+        else:
+            cdfs    = [ list(itertools.accumulate(w)) for w in weights ]
+            indexes = [ [ rng*cdf[-1] <= c for c in cdf ].index(True) for rng, cdf in zip(rngs, cdfs) ]
+
+        return [ seq[index] for seq, index in zip(seqs, indexes) ]
+
     def _next(self, n: int) -> Sequence[int]:
         """Generate `n` uniform random numbers in [0,m-1]
 
@@ -141,6 +179,29 @@ class CobaRandom:
         return numbers
 
 _random = CobaRandom()
+_thread = threading.local()
+
+def _current() -> CobaRandom:
+    """Get the generator used by this module's functions in the calling thread."""
+
+    random = getattr(_thread, 'random', None)
+    return _random if random is None else random
+
+@contextmanager
+def _using(random: CobaRandom) -> Iterator[CobaRandom]:
+    """Make this module's functions draw from the given generator in the calling thread only.
+
+    Remarks:
+        Other threads keep drawing from the module's generator so they neither draw from nor advance
+        the given generator (and the given generator's stream isn't advanced by other threads).
+    """
+
+    previous, _thread.random = getattr(_thread, 'random', None), random
+
+    try:
+        yield random
+    finally:
+        _thread.random = previous
 
 def seed(seed: Optional[int]) -> None:
     """Set the seed for generating random numbers in this module.
@@ -159,7 +220,7 @@ def seed(seed: Optional[int]) -> None:
 def random() -> float:
     """Generate a uniform random number in [0,1]."""
 
-    return _random.random()
+    return _current().random()
 
 def randoms(n: int) -> Sequence[float]:
     """Generate `n` uniform random numbers in [0,1].
@@ -171,7 +232,7 @@ def randoms(n: int) -> Sequence[float]:
         The `n` generated random numbers in [0,1].
     """
 
-    return _random.randoms(n)
+    return _current().randoms(n)
 
 def randint(a:int, b:int) -> int:
     """Generate a uniform random integer in [a, b].
@@ -181,7 +242,7 @@ def randint(a:int, b:int) -> int:
         b: The inclusive upper bound for the random integer.
     """
     
-    return _random.randint(a,b)
+    return _current().randint(a,b)
 
 def choice(seq: Sequence[Any], weights:Sequence[float]=None) -> Any:
     """Choose a random item from the given sequence.
@@ -191,7 +252,17 @@ def choice(seq: Sequence[Any], weights:Sequence[float]=None) -> Any:
         weights: The proportion by which seq is selected from.
     """
     
-    return _random.choice(seq, weights)
+    return _current().choice(seq, weights)
+
+def choice_batch(seqs: Sequence[Sequence[Any]], weights: Sequence[Sequence[float]]) -> Sequence[Any]:
+    """Choose a random item from each of the given sequences.
+    
+    Args:
+        seqs: The sequences to pick randomly from.
+        weights: The proportion by which each sequence in seqs is selected from.
+    """
+
+    return _current().choice_batch(seqs, weights)
 
 def shuffle(array_like: Sequence[Any]) -> Sequence[Any]:
     """Shuffle the order of items in a sequence.
@@ -203,4 +274,4 @@ def shuffle(array_like: Sequence[Any]) -> Sequence[Any]:
         A new sequence with the order of items shuffled.
     """
 
-    return _random.shuffle(array_like)
\ No newline at end of file
+    return _current().shuffle(array_like)
\ No newline at end of file
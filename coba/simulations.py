@@ -5,23 +5,30 @@ class defining an Interaction within a bandit simulation. Additionally, this mod
 the type hints for Context, Action and Reward. These type hints don't contain any functionality. 
 Rather, they simply make it possible to use static type checking for any project that desires 
 to do so.
-
-TODO Add RegressionSimulation
 """
 
 import json
-
-from itertools import chain, accumulate
+import mmap
+import pickle
+import struct
+import collections.abc
+
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+from statistics import median
+from itertools import chain, accumulate, islice, repeat
 from abc import ABC, abstractmethod
 from typing import (
-    Optional, Sequence, List, Callable, TypeVar, 
-    Generic, Hashable, Any, Tuple, overload, cast
+    Optional, Sequence, List, Callable, TypeVar, Iterable,
+    Generic, Hashable, Any, Tuple, Dict, Union, overload, cast
 )
 
 import coba.random
 
 from coba.data.sources import Source, HttpSource, MemorySource
-from coba.data.encoders import OneHotEncoder
+from coba.data.encoders import Encoder, OneHotEncoder
+from coba.data.structures import SparseVector, Category
 from coba.execution import ExecutionContext
 from coba.data.filters import Filter
 from coba.utilities import check_numpy_support
@@ -38,6 +45,8 @@ _A_out = TypeVar('_A_out', bound=Action , covariant=True)
 class Interaction(Generic[_C_out, _A_out]):
     """A class to contain all data needed to represent an interaction in a bandit simulation."""
 
+    __slots__ = ('_context', '_actions', '_key')
+
     #this is a problem with pylance compaining about covariance in constructor so we have to type ignore it. 
     #See this ticket in mypy for more info https://github.com/python/mypy/issues/2850
     def __init__(self, context: _C_out, actions: Sequence[_A_out], key: Key = 0) -> None: #type: ignore
@@ -70,18 +79,149 @@ class Interaction(Generic[_C_out, _A_out]):
         """A unique key identifying the interaction."""
         return self._key
 
+class InteractionTable(collections.abc.Sequence):
+    """A compact, column oriented store of interactions.
+
+    Remarks:
+        Keys, contexts and action set ids are stored in separate columns and an Interaction is only
+        created (as a short-lived flyweight) when it is indexed. Tuple contexts of a fixed width are
+        split into one column per feature with each column kept in an `array.array` when all of its
+        values are ints or all of its values are floats. Every distinct action set is stored once.
+    """
+
+    def __init__(self,
+        contexts   : Sequence[_C_out],
+        action_sets: Sequence[Sequence[_A_out]],
+        set_ids    : Sequence[int] = None,
+        keys       : Sequence[Key] = None) -> None:
+        """Instantiate an InteractionTable.
+
+        Args:
+            contexts: The context of every interaction.
+            action_sets: The distinct action sets used by the interactions.
+            set_ids: The index of each interaction's action set. When None every interaction uses the first action set.
+            keys: The key of every interaction. When None each interaction's key is its index.
+        """
+
+        assert set_ids is None or len(set_ids) == len(contexts), "Mismatched lengths of contexts and set_ids"
+        assert keys is None or len(keys) == len(contexts), "Mismatched lengths of contexts and keys"
+
+        self._n           = len(contexts)
+        self._action_sets = list(action_sets)
+        self._set_ids     = None if set_ids is None else array('q', set_ids)
+        self._keys        = None if keys is None else InteractionTable._column(list(keys))
+        self._features    = InteractionTable._feature_columns(contexts)
+        self._contexts    = None if self._features is not None else list(contexts)
+
+    @staticmethod
+    def from_interactions(interactions: Sequence[Interaction[_C_out,_A_out]]) -> 'InteractionTable':
+        """Create an InteractionTable holding the given interactions."""
+
+        set_ids    : List[int]             = []
+        action_sets: List[Sequence[_A_out]] = []
+        set_index  : Dict[int, int]        = {}
+
+        for interaction in interactions:
+            if id(interaction.actions) not in set_index:
+                set_index[id(interaction.actions)] = len(action_sets)
+                action_sets.append(interaction.actions)
+            set_ids.append(set_index[id(interaction.actions)])
+
+        keys = [ i.key for i in interactions ]
+
+        return InteractionTable([i.context for i in interactions], action_sets, set_ids, None if keys == list(range(len(keys))) else keys)
+
+    @property
+    def keys(self) -> Sequence[Key]:
+        """The key of every interaction."""
+        return range(self._n) if self._keys is None else self._keys
+
+    @property
+    def action_counts(self) -> Sequence[int]:
+        """The number of actions in every interaction."""
+        counts = [ len(actions) for actions in self._action_sets ]
+        return [counts[0]] * self._n if self._set_ids is None else [ counts[i] for i in self._set_ids ]
+
+    @staticmethod
+    def _column(values: List[Any]) -> Sequence[Any]:
+        if all(type(v) is int for v in values):
+            try:
+                return array('q', values)
+            except OverflowError:
+                pass
+
+        if all(type(v) is float for v in values):
+            return array('d', values)
+
+        return values
+
+    @staticmethod
+    def _feature_columns(contexts: Sequence[_C_out]) -> Optional[List[Sequence[Any]]]:
+
+        if len(contexts) == 0 or not all(isinstance(c, tuple) for c in contexts): return None
+
+        width = len(cast(tuple, contexts[0]))
+
+        if any(len(cast(tuple, c)) != width for c in contexts): return None
+
+        return [ InteractionTable._column(list(column)) for column in zip(*contexts) ] #type: ignore
+
+    def _context(self, row: int) -> _C_out:
+        if self._features is None:
+            return cast(List[_C_out], self._contexts)[row]
+        return tuple([ column[row] for column in self._features ]) #type: ignore
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ self[i] for i in range(*index.indices(self._n)) ]
+
+        if index < 0: index += self._n
+        if index < 0 or index >= self._n: raise IndexError("interaction index out of range")
+
+        actions = self._action_sets[0 if self._set_ids is None else self._set_ids[index]]
+        key     = index if self._keys is None else self._keys[index]
+
+        return Interaction(self._context(index), actions, key)
+
 class OpenmlClassificationSource(Source[Tuple[Sequence[Context], Sequence[Action]]]):
 
-    def __init__(self, id:int, md5_checksum:str = None):
+    def __init__(self, id:int, md5_checksum:str = None, sparse: bool = False, as_category: bool = False):
         self._data_id      = id
         self._md5_checksum = md5_checksum
+        self._sparse       = sparse
+        self._as_category  = as_category
 
     def read(self) -> Tuple[Sequence[Sequence[Any]], Sequence[Any]]:
-        
+
+        pairs, _ = self._stream()
+
+        feature_rows: List[Any] = []
+        label_rows  : List[Any] = []
+
+        with ExecutionContext.Logger.log('encoding data... '):
+            for features, label in pairs.read():
+                feature_rows.append(features)
+                label_rows.append(label)
+
+        return feature_rows, label_rows
+
+    def _stream(self) -> Tuple[Source[Iterable[Tuple[Context, Action]]], Optional[Sequence[Action]]]:
+        """Create a source of the data set's encoded (features, label) pairs and the data set's label set if known.
+
+        Remarks:
+            The metadata is requested immediately while the csv is downloaded (or read from the file cache)
+            and encoded each time the returned source is read. The csv's lines are decoded as its chunks
+            arrive and rows are encoded a chunk at a time so neither the raw csv text nor the encoded data
+            set is ever held in memory.
+        """
+
         #placing some of these at the top would cause circular references
         from coba.data.pipes    import Pipe
-        from coba.data.encoders import Encoder, NumericEncoder, OneHotEncoder, StringEncoder
-        from coba.data.filters  import CsvReader, LabeledCsvCleaner
+        from coba.data.encoders import NumericEncoder, StringEncoder
+        from coba.data.filters  import CsvReader, LabeledCsvRowCleaner
 
         data_id        = self._data_id
         md5_checksum   = self._md5_checksum
@@ -115,29 +255,63 @@ class OpenmlClassificationSource(Source[Tuple[Sequence[Context], Sequence[Action
             if tipe['is_target'] == 'true':
                 target = tipe['name']
 
-            if tipe['data_type'] == 'numeric':
-                encoders.append(NumericEncoder())  
-            elif tipe['data_type'] == 'nominal' and tipe['is_target'] == 'false':
-                encoders.append(OneHotEncoder(singular_if_binary=True))
-            elif tipe['data_type'] == 'nominal' and tipe['is_target'] == 'true':
-                encoders.append(OneHotEncoder())
-            else:
-                encoders.append(StringEncoder())
+            encoders.append(self._encoder(tipe))
 
         if isinstance(encoders[headers.index(target)], NumericEncoder):
             target = self._get_classification_target(data_id, openml_api_key)
             ignored[headers.index(target)] = False
-            encoders[headers.index(target)] = OneHotEncoder()
+            encoders[headers.index(target)] = self._encoder({ **types[headers.index(target)], 'is_target':'true' })
+
+            #numeric columns used as labels are left as strings since there are no levels to fit from
+            if isinstance(encoders[headers.index(target)], NumericEncoder):
+                encoders[headers.index(target)] = StringEncoder()
 
         csv_url = f"http://www.openml.org/data/v1/get_csv/{descr['file_id']}"
 
         source  = HttpSource(csv_url, ".csv", md5_checksum, f"openml {data_id}")
         reader  = CsvReader()
-        cleaner = LabeledCsvCleaner(target, headers, encoders, ignored, True)
+        cleaner = LabeledCsvRowCleaner(target, headers, encoders, ignored, True, self._sparse)
+
+        target_encoder = encoders[headers.index(target)]
+        target_levels  = self._nominal_values(types[headers.index(target)]) if types[headers.index(target)]['data_type'] == 'nominal' else []
+
+        #labels that aren't one hot encoded are single values rather than a row of values
+        is_onehot = isinstance(target_encoder, OneHotEncoder)
+        label_set = target_encoder.encode(target_levels) if is_onehot else (target_levels or None)
+        pairs     = lambda: ( (features, label if is_onehot else label[0]) for features, label in Pipe.join(source, [reader, cleaner]).read() )
+
+        return _StreamSource(pairs), label_set
+
+    def _encoder(self, tipe: Dict[str,Any]) -> Encoder:
+        """Create the encoder for a column from its openml metadata.
+
+        Remarks:
+            Nominal encoders are fit from the metadata so that the data can be encoded as it streams in.
+            This means one hot encodings have a position for every level in the metadata (even those
+            that never appear in the data) and missing values ('?') are encoded as all 0's rather than
+            as a level of their own. Nominal columns without metadata levels are fit on a sample of rows.
+        """
+
+        from coba.data.encoders import NumericEncoder, StringEncoder
+
+        nominal_values = self._nominal_values(tipe) if tipe['data_type'] == 'nominal' else []
+
+        if tipe['data_type'] == 'numeric':
+            return NumericEncoder()
 
-        feature_rows, label_rows = Pipe.join(source, [reader, cleaner]).read()
+        if tipe['data_type'] == 'nominal' and tipe['is_target'] == 'false':
+            return OneHotEncoder(nominal_values, singular_if_binary=True, error_if_unknown=False, as_category=self._as_category)
 
-        return list(feature_rows), list(label_rows)
+        if tipe['data_type'] == 'nominal' and tipe['is_target'] == 'true' and nominal_values and not self._as_category:
+            return OneHotEncoder(nominal_values)
+
+        #categorical labels (or labels without metadata levels) are left as strings for ClassificationSimulation to index
+        return StringEncoder()
+
+    def _nominal_values(self, tipe: Dict[str,Any]) -> List[str]:
+        #values are sorted strings so they encode exactly as if the encoder had been fit on the csv data
+        values = tipe.get('nominal_value', [])
+        return sorted(set(map(str, [values] if isinstance(values, (str,int,float)) else values)))
 
     def _get_classification_target(self, data_id, openml_api_key):
         task_description_url = f'https://www.openml.org/api/v1/json/task/list/data_id/{data_id}'
@@ -155,33 +329,6 @@ class OpenmlClassificationSource(Source[Tuple[Sequence[Context], Sequence[Action
 
         raise Exception(f"Openml {data_id} does not appear to be a classification dataset")
 
-class LambdaSource(Source[Tuple[Sequence[Interaction[_C_out, _A_out]], Sequence[Sequence[Reward]]]]):
-
-    def __init__(self,
-        n_interactions: int,
-        context       : Callable[[int],_C_out],
-        action_set    : Callable[[int],Sequence[_A_out]], 
-        reward        : Callable[[_C_out,_A_out],Reward],
-        seed          : int = None) -> None:
-
-        coba.random.seed(seed)
-
-        interactions: List[Interaction[_C_out, _A_out]] = []
-        reward_sets : List[Sequence[Reward]]            = []
-
-        for i in range(n_interactions):
-            _context    = context(i)
-            _action_set = action_set(i)
-            _reward_set = [reward(_context, _action) for _action in _action_set]
-
-            interactions.append(Interaction(_context, _action_set, i)) #type: ignore
-            reward_sets.append(_reward_set)
-
-        self._source = MemorySource((interactions, reward_sets))
-
-    def read(self) -> Tuple[Sequence[Interaction[_C_out, _A_out]], Sequence[Sequence[Reward]]]:
-        return self._source.read()
-
 class Simulation(Generic[_C_out, _A_out], ABC):
     """The simulation interface."""
 
@@ -212,7 +359,33 @@ class Simulation(Generic[_C_out, _A_out], ABC):
         ...
 
 class BatchedSimulation(Generic[_C_out, _A_out]):
-    """A simulation whose interactions have been batched."""
+    """A simulation whose interactions have been batched.
+
+    Remarks:
+        Batches are (start, stop) views over the simulation's interactions rather than copies of them.
+        Summary statistics of the batched interactions are calculated the first time they are needed.
+    """
+
+    class _Batch(collections.abc.Sequence):
+
+        def __init__(self, interactions: Sequence[Interaction[_C_out, _A_out]], start: int, stop: int) -> None:
+            self._interactions = interactions
+            self._start        = start
+            self._stop         = stop
+
+        def __len__(self) -> int:
+            return self._stop - self._start
+
+        def __getitem__(self, index):
+            indexes = range(self._start, self._stop)[index]
+
+            if isinstance(indexes, range):
+                return [ self._interactions[i] for i in indexes ]
+
+            return self._interactions[indexes]
+
+        def __iter__(self):
+            return iter(self._interactions[self._start:self._stop])
 
     def __init__(self, simulation: Simulation[_C_out, _A_out], batch_sizes: Sequence[int]) -> None:
         self._simulation = simulation
@@ -220,17 +393,51 @@ class BatchedSimulation(Generic[_C_out, _A_out]):
         #remove Nones and 0s
         batch_sizes = list(filter(None, batch_sizes))
 
-        if len(batch_sizes) == 0:
-            self._batches = []
-        else:
-            batch_slices  = list(accumulate([0] + list(batch_sizes)))
-            self._batches = [simulation.interactions[batch_slices[i]:batch_slices[i+1]] for i in range(len(batch_slices)-1) ]
+        n_interactions = len(simulation.interactions) if batch_sizes else 0
+        batch_bounds   = [ min(bound, n_interactions) for bound in accumulate([0] + batch_sizes) ]
+
+        self._slices  = list(zip(batch_bounds, batch_bounds[1:]))
+        self._batches = [ BatchedSimulation._Batch(simulation.interactions, start, stop) for start,stop in self._slices ]
+        self._summary: Optional[Tuple[int,int,int]] = None
 
     @property
     def interaction_batches(self) -> Sequence[Sequence[Interaction[_C_out, _A_out]]]:
         """The sequence of batches of interactions in a simulation."""
         return self._batches
 
+    @property
+    def batch_slices(self) -> Sequence[Tuple[int,int]]:
+        """The (start, stop) index of each batch within the simulation's interactions."""
+        return self._slices
+
+    @property
+    def interaction_count(self) -> int:
+        """The number of interactions in all batches."""
+        return self._summarize()[0]
+
+    @property
+    def context_size(self) -> int:
+        """The median context size of the interactions in all batches."""
+        return self._summarize()[1]
+
+    @property
+    def action_count(self) -> int:
+        """The median action count of the interactions in all batches."""
+        return self._summarize()[2]
+
+    def _summarize(self) -> Tuple[int,int,int]:
+
+        if self._summary is None:
+            stop         = self._slices[-1][1] if self._slices else 0
+            interactions = self._simulation.interactions[0:stop] if stop > 0 else []
+
+            context_sizes = [ 0 if i.context is None else len(i.context) if isinstance(i.context,(tuple,SparseVector)) else 1 for i in interactions ]
+            action_counts = [ len(i.actions) for i in interactions ]
+
+            self._summary = (len(interactions), int(median(context_sizes or [0])), int(median(action_counts or [0])))
+
+        return self._summary
+
     def reward(self, choices: Sequence[Tuple[Key,Choice]] ) -> Sequence[Reward]:
         """The observed rewards for interactions (identified by its key) and their selected action indexes.
 
@@ -243,8 +450,144 @@ class BatchedSimulation(Generic[_C_out, _A_out]):
         """
         return self._simulation.reward(choices)
 
+class StreamingSimulation(Generic[_C_out, _A_out]):
+    """A simulation whose interactions are streamed from a source rather than held in memory.
+
+    Remarks:
+        The source should return an iterable of (interaction, reward set) pairs and is read again
+        each time the simulation's interactions are enumerated (e.g., a `DiskSource` that reads the
+        pairs from a file line by line). Only `Shuffle`, `Take` and `Batch` keep a simulation streaming.
+        `Shuffle` uses a shuffle buffer holding at most `buffer_size` interactions, `Take` holds at most
+        its count of interactions and `Batch` holds a single batch of interactions at a time.
+    """
+
+    def __init__(self, source: Source[Iterable[Tuple[Interaction[_C_out, _A_out], Sequence[Reward]]]], buffer_size: int = 10000) -> None:
+        """Instantiate a StreamingSimulation.
+
+        Args:
+            source: The source of (interaction, reward set) pairs.
+            buffer_size: The most interactions a shuffle of the stream will hold in memory.
+        """
+        self._source     = source
+        self.buffer_size = buffer_size
+
+    @property
+    def interactions(self) -> Iterable[Interaction[_C_out, _A_out]]:
+        """A single pass over the simulation's interactions."""
+        return ( interaction for interaction, _ in self.stream() )
+
+    def stream(self) -> Iterable[Tuple[Interaction[_C_out, _A_out], Sequence[Reward]]]:
+        """A single pass over the simulation's (interaction, reward set) pairs."""
+        return iter(self._source.read())
+
+class StreamingBatchedSimulation(Generic[_C_out, _A_out]):
+    """A streaming simulation whose interactions are batched as they are read.
+
+    Remarks:
+        Rewards are only kept for the most recently read batch. This means `reward` should be called
+        for a batch before the next batch is read. The summary statistics (i.e., interaction_count,
+        context_size and action_count) are accumulated as batches are read and are complete once
+        every batch has been read.
+    """
+
+    def __init__(self, simulation: StreamingSimulation[_C_out, _A_out], batch_sizes: Iterable[int], drop_partial: bool = False) -> None:
+        """Instantiate a StreamingBatchedSimulation.
+
+        Args:
+            simulation: The streaming simulation to batch.
+            batch_sizes: The size of each batch (this may be an infinite iterable).
+            drop_partial: Whether a final batch smaller than its requested size should be dropped.
+        """
+
+        self._simulation   = simulation
+        self._batch_sizes  = batch_sizes
+        self._drop_partial = drop_partial
+
+        self._rewards      : Dict[Key, Sequence[Reward]] = {}
+        self._context_sizes: Dict[int,int]               = collections.defaultdict(int)
+        self._action_counts: Dict[int,int]               = collections.defaultdict(int)
+
+    @property
+    def interaction_batches(self) -> Iterable[Sequence[Interaction[_C_out, _A_out]]]:
+        """A single pass over the batches of interactions in the simulation."""
+
+        stream = iter(self._simulation.stream())
+
+        self._context_sizes.clear()
+        self._action_counts.clear()
+
+        for batch_size in filter(None, self._batch_sizes):
+            batch = list(islice(stream, batch_size))
+
+            if len(batch) < batch_size and (self._drop_partial or len(batch) == 0): return
+
+            self._rewards = { interaction.key: rewards for interaction, rewards in batch }
+
+            for interaction, _ in batch:
+                context = interaction.context
+                self._context_sizes[0 if context is None else len(context) if isinstance(context,(tuple,SparseVector)) else 1] += 1
+                self._action_counts[len(interaction.actions)] += 1
+
+            yield [ interaction for interaction, _ in batch ]
+
+    @property
+    def interaction_count(self) -> int:
+        """The number of interactions in every batch read so far."""
+        return sum(self._context_sizes.values())
+
+    @property
+    def context_size(self) -> int:
+        """The median context size of the interactions in every batch read so far."""
+        return StreamingBatchedSimulation._median(self._context_sizes)
+
+    @property
+    def action_count(self) -> int:
+        """The median action count of the interactions in every batch read so far."""
+        return StreamingBatchedSimulation._median(self._action_counts)
+
+    def reward(self, choices: Sequence[Tuple[Key,Choice]] ) -> Sequence[Reward]:
+        """The observed rewards for interactions (identified by its key) and their selected action indexes.
+
+        Remarks:
+            See the Simulation base class for more information.
+        """
+        return [ self._rewards[key][choice] for key, choice in choices ]
+
+    @staticmethod
+    def _median(counts: Dict[int,int]) -> int:
+        """Calculate the median of values given as a mapping from each value to its count."""
+
+        n = sum(counts.values())
+
+        if n == 0: return 0
+
+        ordered = list(accumulate(count for _,count in sorted(counts.items())))
+        values  = sorted(counts.keys())
+
+        lower = values[next(i for i,c in enumerate(ordered) if c > (n-1)//2)]
+        upper = values[next(i for i,c in enumerate(ordered) if c > n//2)]
+
+        return int(median([lower, upper]))
+
+class _StreamSource(Source[Iterable[Any]]):
+    """A source that re-creates a stream from a callable each time it is read."""
+
+    def __init__(self, stream: Callable[[], Iterable[Any]]) -> None:
+        self._stream = stream
+
+    def read(self) -> Iterable[Any]:
+        return self._stream()
+
 class MemorySimulation(Simulation[_C_out, _A_out]):
-    """A Simulation implementation created from in memory sequences of contexts, actions and rewards."""
+    """A Simulation implementation created from in memory sequences of contexts, actions and rewards.
+
+    Remarks:
+        Rewards are stored in a single flat array with one row per interaction. When every interaction
+        has the same number of actions the array is a dense matrix; otherwise an offsets array marks
+        where each interaction's rewards begin. The array is only typed when every reward is an int or
+        every reward is a float so that rewards always keep their type. Interaction keys are only mapped
+        to rows through a dict when they aren't simply the interactions' indexes.
+    """
 
     def __init__(self, 
         interactions: Sequence[Interaction[_C_out, _A_out]],
@@ -261,10 +604,15 @@ class MemorySimulation(Simulation[_C_out, _A_out]):
 
         self._interactions = interactions
 
-        choices = chain.from_iterable([ [ (i.key, a) for a in range(len(i.actions)) ] for i in self._interactions ])
-        rewards = chain.from_iterable(reward_sets)
+        if isinstance(interactions, InteractionTable):
+            keys, counts = list(interactions.keys), list(interactions.action_counts)
+        else:
+            keys, counts = [ i.key for i in interactions ], [ len(i.actions) for i in interactions ]
 
-        self._rewards = dict(zip(choices,rewards))
+        self._rows    = None if all(type(k) is int and k == r for r,k in enumerate(keys)) else { k:r for r,k in enumerate(keys) }
+        self._width   = counts[0] if counts and all(c == counts[0] for c in counts) else None
+        self._offsets = array('q', accumulate([0] + counts))
+        self._rewards = MemorySimulation._flat(chain.from_iterable( rewards[0:count] for rewards,count in zip(reward_sets,counts) ))
 
     @property
     def interactions(self) -> Sequence[Interaction[_C_out,_A_out]]:
@@ -282,9 +630,30 @@ class MemorySimulation(Simulation[_C_out, _A_out]):
             See the Simulation base class for more information.
         """
 
-        return [ self._rewards[choice] for choice in choices]
+        rows, width, offsets = self._rows, self._width, self._offsets
+
+        indexes = []
+
+        for key, choice in choices:
+            row = key if rows is None else rows[key]
+
+            if row < 0 or row >= len(offsets)-1 or choice < 0 or offsets[row] + choice >= offsets[row+1]:
+                raise KeyError((key, choice))
+
+            indexes.append(row*width + choice if width is not None else offsets[row] + choice)
+
+        if len(indexes) == 0: return []
+        if len(indexes) == 1: return [ self._rewards[indexes[0]] ]
+
+        return list(itemgetter(*indexes)(self._rewards))
 
-class ClassificationSimulation(MemorySimulation[_C_out, Tuple[int,...]]):
+    @staticmethod
+    def _flat(rewards: Iterable[Reward]) -> Sequence[Reward]:
+        """Store rewards in a typed array when they are all ints or all floats so they keep their type."""
+
+        return InteractionTable._column(list(rewards))
+
+class ClassificationSimulation(Simulation[_C_out, Action]):
     """A simulation created from classifier data with features and labels.
 
     ClassificationSimulation turns labeled observations from a classification data set
@@ -299,40 +668,466 @@ class ClassificationSimulation(MemorySimulation[_C_out, Tuple[int,...]]):
         doing this if you are working with a large dataset. To reduce memory usage you can provide
         meta information upfront that will allow features to be correctly encoded while the
         dataset is being streamed instead of waiting until the end of the data to train an encoder.
+        Only the index of each observation's label is stored and rewards are computed from it when
+        they are requested. When `as_category` is True actions are `Category` objects rather than
+        one hot tuples so the action set never has to be materialized as a dense block of 0's and 1's.
     """
 
-    def __init__(self, features: Sequence[_C_out], labels: Sequence[Action]) -> None:
+    def __init__(self, features: Sequence[_C_out], labels: Sequence[Action], as_category: bool = False) -> None:
         """Instantiate a ClassificationSimulation.
 
         Args:
             features: The collection of features used for the original classifier problem.
             labels: The collection of labels assigned to each observation of features.
+            as_category: Whether actions should be `Category` objects rather than one hot tuples.
         """
 
         assert len(features) == len(labels), "Mismatched lengths of features and labels"
 
-        label_set  = list(set(labels))
-        action_set = OneHotEncoder(label_set).encode(label_set)
+        #labels are kept in the order they first appear so actions don't depend on hash randomization
+        label_set   = list(dict.fromkeys(labels))
+        label_index = { label:index for index,label in enumerate(label_set) }
+        action_set  = OneHotEncoder(label_set, as_category=as_category).encode(label_set)
+
+        self.label_set     = label_set
+        self._labels       = array('q', [ label_index[label] for label in labels ])
+        self._interactions = InteractionTable(features, [action_set]) #type: ignore
+
+    @property
+    def interactions(self) -> Sequence[Interaction[_C_out, Action]]:
+        """The interactions in this simulation.
 
-        interactions = [ Interaction(context, action_set, i) for i, context in enumerate(features) ] #type: ignore
-        rewards      = OneHotEncoder(label_set).encode(labels)
+        Remarks:
+            See the Simulation base class for more information.
+        """
+        return self._interactions
 
-        self.label_set = label_set
-        super().__init__(interactions, rewards) #type:ignore
+    def reward(self, choices: Sequence[Tuple[Key,Choice]]) -> Sequence[Reward]:
+        """The observed rewards for interactions (identified by its key) and their selected action indexes.
+
+        Remarks:
+            See the Simulation base class for more information.
+        """
+
+        labels, n_actions = self._labels, len(self.label_set)
+
+        for key, choice in choices:
+            if not (0 <= choice < n_actions) or not (0 <= key < len(labels)):
+                raise KeyError((key, choice))
+
+        return [ int(labels[key] == choice) for key, choice in choices ]
+
+class ClassificationStream(Source[Iterable[Tuple[Interaction[_C_out, Action], Sequence[Reward]]]]):
+    """A source of streamed interactions created from a source of streamed features and labels.
+
+    Remarks:
+        This adapts a source of (features, label) pairs (e.g., a csv file on disk read through `CsvReader` and
+        `LabeledCsvRowCleaner`) into the (interaction, reward set) pairs that a `StreamingSimulation` expects.
+        Actions and rewards are created the same way as in `ClassificationSimulation`. When `label_set` isn't
+        given the source is read one extra time to find the labels, holding only the distinct labels in memory.
+    """
+
+    def __init__(self, 
+        source     : Source[Iterable[Tuple[_C_out, Action]]], 
+        label_set  : Sequence[Action] = None, 
+        as_category: bool = False) -> None:
+        """Instantiate a ClassificationStream.
+
+        Args:
+            source: The source of (features, label) pairs.
+            label_set: Every label in the source (in the order that actions should be given).
+            as_category: Whether actions should be `Category` objects rather than one hot tuples.
+        """
+        self._source      = source
+        self._label_set   = label_set
+        self._as_category = as_category
+
+    def read(self) -> Iterable[Tuple[Interaction[_C_out, Action], Sequence[Reward]]]:
+
+        label_set   = list(self._label_set) if self._label_set is not None else list(dict.fromkeys(l for _,l in self._source.read()))
+        label_index = { label:index for index,label in enumerate(label_set) }
+        action_set  = OneHotEncoder(label_set, as_category=self._as_category).encode(label_set)
+        reward_sets = [ tuple(int(i == j) for j in range(len(label_set))) for i in range(len(label_set)) ]
+
+        for key, (features, label) in enumerate(self._source.read()):
+            yield Interaction(features, action_set, key), reward_sets[label_index[label]]
+
+class RegressionSimulation(Simulation[_C_out, float]):
+    """A simulation created from regression data with features and numeric targets.
+
+    RegressionSimulation turns labeled observations from a regression data set into interactions.
+    For each interaction the feature set becomes the context and every value in an action grid
+    becomes an action. By default the reward for an action is its negative absolute error from the
+    observation's target. When `discretize` is True the reward is instead 1 for the grid action
+    nearest the target and 0 for every other action.
+
+    Remarks:
+        Only the target of each observation is stored. Rewards are computed from it when they are
+        requested so memory doesn't grow with the size of the action grid.
+    """
+
+    def __init__(self,
+        features  : Sequence[_C_out],
+        targets   : Sequence[float],
+        action_set: Sequence[float] = None,
+        n_actions : int = 10,
+        discretize: bool = False) -> None:
+        """Instantiate a RegressionSimulation.
+
+        Args:
+            features: The collection of features used for the original regression problem.
+            targets: The collection of numeric targets assigned to each observation of features.
+            action_set: The grid of actions. When None `n_actions` evenly spaced values covering the targets are used.
+            n_actions: The number of actions in the grid when no action_set is given.
+            discretize: Whether rewards should indicate the grid action nearest the target.
+        """
+
+        assert len(features) == len(targets), "Mismatched lengths of features and targets"
+
+        if action_set is None:
+            low, high  = (min(targets), max(targets)) if targets else (0., 0.)
+            step       = (high-low)/(n_actions-1) if n_actions > 1 else 0.
+            action_set = [ low + i*step for i in range(n_actions) ] if high > low else [float(low)]
+
+        self.action_set    = list(action_set)
+        self._targets      = array('d', targets)
+        self._discretize   = discretize
+        self._grid         = sorted(range(len(self.action_set)), key=self.action_set.__getitem__)
+        self._grid_values  = [ self.action_set[i] for i in self._grid ]
+        self._interactions = InteractionTable(features, [self.action_set]) #type: ignore
+
+    @property
+    def interactions(self) -> Sequence[Interaction[_C_out, float]]:
+        """The interactions in this simulation.
+
+        Remarks:
+            See the Simulation base class for more information.
+        """
+        return self._interactions
+
+    def reward(self, choices: Sequence[Tuple[Key,Choice]]) -> Sequence[Reward]:
+        """The observed rewards for interactions (identified by its key) and their selected action indexes.
+
+        Remarks:
+            See the Simulation base class for more information.
+        """
+
+        targets, actions = self._targets, self.action_set
+
+        for key, choice in choices:
+            if not (0 <= choice < len(actions)) or not (0 <= key < len(targets)):
+                raise KeyError((key, choice))
+
+        if self._discretize:
+            return [ int(self._nearest(targets[key]) == choice) for key, choice in choices ]
+        else:
+            return [ -abs(targets[key] - actions[choice]) for key, choice in choices ]
+
+    def _nearest(self, target: float) -> int:
+        """Find the index of the grid action nearest a target (ties go to the smaller action)."""
+
+        values = self._grid_values
+        i      = bisect_left(values, target)
+
+        if i == len(values) or (i > 0 and target - values[i-1] <= values[i] - target):
+            i -= 1
+
+        return self._grid[i]
+
+class MemoryMappedSimulation(Simulation[_C_out, _A_out]):
+    """A Simulation whose interactions and rewards are stored in a memory-mapped file.
+
+    Remarks:
+        The file is written once by `MemoryMappedSimulation.write` and can then be attached to by 
+        any number of processes. Because the file is mapped read-only every process shares the same 
+        physical pages and only the file's name is pickled when the simulation is sent to a worker.
+        Numeric contexts are stored as one typed column per feature (so mixed int and float contexts
+        keep their types) while any other flat contexts (i.e., contexts with strings or with columns
+        that mix ints and floats) are stored in the file's pickled header. Contexts that aren't flat
+        (e.g., SparseVector or Category features) can't be written. Distinct action sets are only
+        stored once. Rewards keep their type when they are all ints or all floats while rewards that
+        mix ints and floats all come back as floats.
+    """
+
+    class _Interactions(collections.abc.Sequence):
+
+        def __init__(self, simulation: 'MemoryMappedSimulation') -> None:
+            self._simulation = simulation
+
+        def __len__(self) -> int:
+            return self._simulation._n
+
+        def __getitem__(self, index):
+            if isinstance(index, slice):
+                return [ self[i] for i in range(*index.indices(len(self))) ]
+
+            if index < 0: index += len(self)
+            if index < 0 or index >= len(self): raise IndexError("interaction index out of range")
+
+            return self._simulation._interaction(index)
+
+    @staticmethod
+    def write(simulation: Simulation[_C_out, _A_out], filename: str) -> None:
+        """Write a simulation into the memory-mapped file format.
+
+        Args:
+            simulation: The simulation that should be written to file.
+            filename: The name of the file to write the simulation into.
+        """
+
+        interactions = simulation.interactions
+
+        action_set_ids: Dict[Tuple[_A_out,...], int] = {}
+        action_sets   : List[Sequence[_A_out]]       = []
+
+        keys        = array('q')
+        set_ids     = array('q')
+        offsets     = array('q', [0])
+
+        for interaction in interactions:
+            action_set = tuple(interaction.actions)
+
+            if action_set not in action_set_ids:
+                action_set_ids[action_set] = len(action_sets)
+                action_sets.append(interaction.actions)
+
+            keys   .append(interaction.key)
+            set_ids.append(action_set_ids[action_set])
+            offsets.append(offsets[-1] + len(action_set))
+
+        reward_values = list(simulation.reward([ (i.key, a) for i in interactions for a in range(len(i.actions)) ]))
+        reward_column = InteractionTable._column(reward_values)
+
+        #rewards that mix ints and floats are stored as floats since every reward has to share a typecode
+        rewards = reward_column if isinstance(reward_column, array) else array('d', reward_values)
+
+        contexts  = [ i.context for i in interactions ]
+        is_flat   = lambda v: v is None or type(v) in [int,float,str]
+
+        #any other context (e.g., SparseVector or Category features) would have to be unpickled from
+        #the header by every process that attaches to the file which defeats the point of sharing it
+        for context in contexts:
+            if not (is_flat(context) or isinstance(context, tuple) and all(type(v) in [int,float,str] for v in context)):
+                raise Exception(f"Only flat contexts can be memory mapped but a context of type {type(context).__name__} was found.")
+
+        context_kind, context_columns = MemoryMappedSimulation._context_columns(contexts)
+
+        sections = [keys, set_ids, offsets, rewards] + context_columns
+
+        header = {
+            "n"            : len(keys),
+            "action_sets"  : action_sets,
+            "contexts"     : contexts if context_kind is None else None,
+            "context_kind" : context_kind,
+            "sections"     : [ (a.typecode, len(a)) for a in sections ]
+        }
+
+        header_bytes = pickle.dumps(header)
+        header_bytes = header_bytes + b'\0' * (-len(header_bytes) % 8)
+
+        with open(filename, "wb") as f:
+            f.write(struct.pack('<Q', len(header_bytes)))
+            f.write(header_bytes)
+            for section in sections:
+                section.tofile(f)
+
+    @staticmethod
+    def _context_columns(contexts: Sequence[Any]) -> Tuple[Optional[str], List[array]]:
+        """Split contexts into typed columns that can be memory mapped.
+
+        Remarks:
+            Contexts that are all None, all numbers or all tuples of the same width become one typed
+            column per feature (e.g., the float columns and one hot int columns of OpenML data sets).
+            Each column keeps its own typecode so values come back with their original types. If any
+            column mixes ints and floats (or holds strings) we return a kind of None and the contexts
+            have to be stored in the header.
+        """
+
+        if all(c is None for c in contexts): return "none", []
+
+        if all(isinstance(c, tuple) for c in contexts) and len(set(map(len, contexts))) == 1:
+            kind, values = "tuple", list(zip(*contexts))
+        elif not any(isinstance(c, tuple) or c is None for c in contexts):
+            kind, values = "scalar", [contexts]
+        else:
+            return None, []
+
+        columns = [ InteractionTable._column(list(column)) for column in values ]
+
+        return (kind, columns) if all(isinstance(column, array) for column in columns) else (None, [])
+
+    def __init__(self, filename: str) -> None:
+        """Instantiate a MemoryMappedSimulation.
+
+        Args:
+            filename: The name of a file created by `MemoryMappedSimulation.write`.
+
+        Remarks:
+            The file isn't opened until the simulation's interactions or rewards are first used.
+        """
+        self._filename = filename
+        self._mmap     = None
+
+    def __getstate__(self) -> Dict[str,Any]:
+        return { "filename": self._filename }
+
+    def __setstate__(self, state: Dict[str,Any]) -> None:
+        self.__init__(state["filename"]) #type: ignore
+
+    def _attach(self) -> None:
+        if self._mmap is not None: return
+
+        with open(self._filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_length = struct.unpack_from('<Q', self._mmap)[0]
+        header        = pickle.loads(self._mmap[8:8+header_length])
+        view          = memoryview(self._mmap)
+        position      = 8 + header_length
+        sections      = []
+
+        for typecode, length in header["sections"]:
+            nbytes = length * array(typecode).itemsize
+            sections.append(view[position:position+nbytes].cast(typecode))
+            position += nbytes
+
+        self._n            = header["n"]
+        self._action_sets  = header["action_sets"]
+        self._contexts     = header["contexts"]
+        self._context_kind = header["context_kind"]
+
+        self._keys, self._set_ids, self._offsets, self._rewards = sections[0:4]
+        self._context_columns = sections[4:]
+
+        if list(self._keys[0:1]) == [0] and all(k == i for i,k in enumerate(self._keys)):
+            self._rows = None
+        else:
+            self._rows = { key:row for row,key in enumerate(self._keys) }
+
+    def _interaction(self, row: int) -> Interaction[_C_out, _A_out]:
+        if self._context_kind == "tuple":
+            context = tuple([ column[row] for column in self._context_columns ])
+        elif self._context_kind == "scalar":
+            context = self._context_columns[0][row]
+        elif self._context_kind == "none":
+            context = None
+        else:
+            context = self._contexts[row]
+
+        return Interaction(context, self._action_sets[self._set_ids[row]], self._keys[row]) #type: ignore
+
+    @property
+    def interactions(self) -> Sequence[Interaction[_C_out,_A_out]]:
+        """The interactions in this simulation.
+
+        Remarks:
+            See the Simulation base class for more information.
+        """
+        self._attach()
+        return MemoryMappedSimulation._Interactions(self)
+
+    def reward(self, choices: Sequence[Tuple[Key,Choice]]) -> Sequence[Reward]:
+        """The observed rewards for interactions (identified by its key) and their selected action indexes.
+
+        Remarks:
+            See the Simulation base class for more information.
+        """
+        self._attach()
+
+        rows    = self._rows
+        offsets = self._offsets
+        rewards = self._rewards
+
+        return [ rewards[offsets[key if rows is None else rows[key]] + choice] for key,choice in choices ]
 
 class LambdaSimulation(Source[Simulation[_C_out, _A_out]]):
     """A Simulation created from lambda functions that generate contexts, actions and rewards.
 
     Remarks:
-        This implementation is useful for creating simulations from defined distributions.
+        This implementation is useful for creating simulations from defined distributions. Nothing
+        is generated until the simulation is read and then interactions are only generated, in
+        chunks of `chunk_size`, as they are requested. Generated chunks are kept until the simulation
+        is released so this shortens the time to the first interaction but, once every interaction
+        has been requested, uses as much memory as generating the simulation up front. While
+        generating, the functions' module level `coba.random` calls (in the generating thread only)
+        draw from the simulation's own `CobaRandom(seed)` so that a seeded simulation generates the
+        same interactions every time it is read without ever changing the global generator's state.
+        When no seed is given one is drawn from `coba.random` when the simulation is created so that
+        every read (and every pickled copy) is identical.
+
+        When `vectorized` is True the functions are given a whole chunk at once. That is, `context`
+        and `action_set` are called with a sequence of indexes and should return a sequence of
+        contexts and action sets while `reward` is called with aligned sequences of contexts and
+        actions (one pair for every action of every interaction in the chunk) and should return
+        a sequence of rewards.
+
+        If the functions can't be pickled (e.g., they are lambdas) a LambdaSimulation is generated in
+        full when it is pickled and is unpickled as a `MemorySource` of the generated simulation.
     """
 
+    class _Simulation(Simulation[_C_out, _A_out]):
+
+        class _Interactions(collections.abc.Sequence):
+
+            def __init__(self, simulation: 'LambdaSimulation._Simulation') -> None:
+                self._simulation = simulation
+
+            def __len__(self) -> int:
+                return self._simulation._n_interactions
+
+            def __getitem__(self, index):
+                if isinstance(index, slice):
+                    return [ self[i] for i in range(len(self))[index] ]
+
+                index = range(len(self))[index]
+
+                chunk_size = self._simulation._chunk_size
+                return self._simulation._chunk(index // chunk_size)[0][index % chunk_size]
+
+        def __init__(self, lambdas: 'LambdaSimulation') -> None:
+            self._n_interactions = lambdas._n_interactions
+            self._chunk_size     = lambdas._chunk_size
+            self._lambdas        = lambdas
+            self._random         = coba.random.CobaRandom(lambdas._seed)
+            self._chunks: List[Tuple[List[Interaction[_C_out,_A_out]], List[Sequence[Reward]]]] = []
+            self._interactions   = LambdaSimulation._Simulation._Interactions(self)
+
+        @property
+        def interactions(self) -> Sequence[Interaction[_C_out,_A_out]]:
+            """The interactions in this simulation.
+
+            Remarks:
+                See the Simulation base class for more information.
+            """
+            return self._interactions
+
+        def reward(self, choices: Sequence[Tuple[Key,Choice]]) -> Sequence[Reward]:
+            """The observed rewards for interactions (identified by its key) and their selected action indexes.
+
+            Remarks:
+                See the Simulation base class for more information.
+            """
+            return [ self._chunk(key // self._chunk_size)[1][key % self._chunk_size][choice] for key, choice in choices ]
+
+        def _chunk(self, chunk_index: int) -> Tuple[List[Interaction[_C_out,_A_out]], List[Sequence[Reward]]]:
+            #chunks share one random stream so they have to be generated in order
+            while len(self._chunks) <= chunk_index:
+                start   = len(self._chunks) * self._chunk_size
+                indexes = range(start, min(start + self._chunk_size, self._n_interactions))
+
+                with coba.random._using(self._random):
+                    self._chunks.append(self._lambdas._generate(indexes))
+
+            return self._chunks[chunk_index]
+
     def __init__(self,
         n_interactions: int,
         context       : Callable[[int],_C_out],
         action_set    : Callable[[int],Sequence[_A_out]], 
         reward        : Callable[[_C_out,_A_out],Reward],
-        seed          : int = None) -> None:
+        seed          : int = None,
+        chunk_size    : int = 1000,
+        vectorized    : bool = False) -> None:
         """Instantiate a LambdaSimulation.
 
         Args:
@@ -340,12 +1135,60 @@ class LambdaSimulation(Source[Simulation[_C_out, _A_out]]):
             context: A function that should return a context given an index in `range(n_interactions)`.
             action_set: A function that should return all valid actions for a given context.
             reward: A function that should return the reward for a context and action.
+            seed: The seed for the random numbers drawn while generating interactions. When None a
+                seed is drawn from `coba.random`.
+            chunk_size: How many interactions should be generated at a time.
+            vectorized: Whether the functions generate a whole chunk of values in a single call.
         """
 
-        self._source = LambdaSource(n_interactions, context, action_set, reward, seed) # type: ignore
+        self._n_interactions = n_interactions
+        self._context        = context
+        self._action_set     = action_set
+        self._reward         = reward
+        self._seed           = seed if seed is not None else coba.random.randint(0, 2**30-1)
+        self._chunk_size     = max(1, chunk_size)
+        self._vectorized     = vectorized
 
     def read(self) -> Simulation[_C_out, _A_out]:
-        return MemorySimulation(*self._source.read()) #type: ignore
+        return LambdaSimulation._Simulation(self)
+
+    def __reduce__(self) -> Tuple[Any,...]:
+        try:
+            pickle.dumps((self._context, self._action_set, self._reward))
+        except Exception:
+            #lambdas can't be pickled so we send the generated simulation to other processes instead
+            simulation   = self.read()
+            interactions = list(simulation.interactions)
+            reward_sets  = [ simulation.reward([ (i.key, a) for a in range(len(i.actions)) ]) for i in interactions ]
+            return (MemorySource, (MemorySimulation(interactions, reward_sets),))
+        else:
+            return (LambdaSimulation, (self._n_interactions, self._context, self._action_set, self._reward, self._seed, self._chunk_size, self._vectorized))
+
+    def _generate(self, indexes: Sequence[int]) -> Tuple[List[Interaction[_C_out,_A_out]], List[Sequence[Reward]]]:
+
+        if self._vectorized:
+            contexts    = list(self._context(indexes)) #type: ignore
+            action_sets = list(self._action_set(indexes)) #type: ignore
+
+            pair_contexts = [ c for c,actions in zip(contexts,action_sets) for _ in actions ]
+            pair_actions  = [ a for actions in action_sets for a in actions ]
+            rewards       = list(self._reward(pair_contexts, pair_actions)) if pair_actions else [] #type: ignore
+            bounds        = list(accumulate([0] + [ len(actions) for actions in action_sets ]))
+            reward_sets   = [ rewards[start:stop] for start,stop in zip(bounds, bounds[1:]) ]
+        else:
+            contexts, action_sets, reward_sets = [], [], []
+
+            for i in indexes:
+                _context    = self._context(i)
+                _action_set = self._action_set(i)
+
+                contexts.append(_context)
+                action_sets.append(_action_set)
+                reward_sets.append([self._reward(_context, _action) for _action in _action_set])
+
+        interactions = [ Interaction(c, a, i) for i,c,a in zip(indexes, contexts, action_sets) ] #type: ignore
+
+        return interactions, reward_sets
 
 class OpenmlSimulation(Source[ClassificationSimulation[Context]]):
     """A simulation created from openml data with features and labels.
@@ -362,21 +1205,104 @@ class OpenmlSimulation(Source[ClassificationSimulation[Context]]):
         doing this if you are working with a large dataset. To reduce memory usage you can provide
         meta information upfront that will allow features to be correctly encoded while the
         dataset is being streamed instead of waiting until the end of the data to train an encoder.
+        When `sparse` is True each context is a `SparseVector` holding only the non-zero features.
+        This greatly reduces memory for data sets with high cardinality nominal features. When
+        `as_category` is True nominal features and actions are `Category` objects rather than one
+        hot tuples (see `OneHotEncoder` for more information). When `streaming` is True a
+        `StreamingSimulation` is returned whose interactions are encoded from the (cached) csv
+        each time they are enumerated so the encoded data set never has to fit in memory.
     """
 
-    def __init__(self, id: int, md5_checksum: str = None) -> None:
-        self._openml_source = OpenmlClassificationSource(id, md5_checksum)
+    def __init__(self, 
+        id          : int, 
+        md5_checksum: str  = None, 
+        sparse      : bool = False, 
+        as_category : bool = False, 
+        streaming   : bool = False) -> None:
+
+        self._openml_source = OpenmlClassificationSource(id, md5_checksum, sparse, as_category)
+        self._as_category   = as_category
+        self._streaming     = streaming
+
+    @property
+    def md5_checksum(self) -> Optional[str]:
+        """The expected md5 checksum of the data set's csv (if one was given)."""
+        return self._openml_source._md5_checksum
 
-    def read(self) -> ClassificationSimulation[Context]:
+    def read(self) -> Union[ClassificationSimulation[Context], StreamingSimulation[Context,Action]]:
         with ExecutionContext.Logger.log(f"loading openml {self._openml_source._data_id}..."):
-            return ClassificationSimulation(*self._openml_source.read())
+
+            if self._streaming:
+                pairs, label_set = self._openml_source._stream()
+                return StreamingSimulation(ClassificationStream(pairs, label_set, self._as_category))
+
+            return ClassificationSimulation(*self._openml_source.read(), as_category=self._as_category) #type: ignore
 
 class ShuffleSimulation(Simulation[_C_out, _A_out]):
+    """A simulation whose interactions are a lazily shuffled view of another simulation's interactions.
+
+    Remarks:
+        The order is identical to `CobaRandom(seed).shuffle(simulation.interactions)`. Because each
+        step of a Fisher-Yates shuffle fixes the item at its position, the shuffle is only carried
+        out (and random numbers only drawn) for as many positions as are actually requested. For
+        example, taking the first 2000 interactions of a shuffled simulation only performs 2000 swaps.
+    """
+
+    class _Shuffled(collections.abc.Sequence):
+
+        def __init__(self, interactions: Sequence[Interaction[_C_out,_A_out]], random: coba.random.CobaRandom) -> None:
+            self._interactions = interactions
+            self._random       = random
+            self._order: List[int]     = []
+            self._swaps: Dict[int,int] = {}
+
+        def _shuffle_to(self, stop: int) -> None:
+            """Carry out the Fisher-Yates shuffle until every position before stop is fixed."""
+
+            n     = len(self._interactions)
+            start = len(self._order)
+            stop  = min(stop, n)
+
+            if stop <= start: return
+
+            order, swaps = self._order, self._swaps
+
+            for i, r in zip(range(start, stop), self._random.randoms(stop-start)):
+                j = min(int(i + (r * (n-i))), n-1) #min() handles the edge case of r==1
+
+                #items at earlier positions are never swapped again so we only need to
+                #remember the items that have been moved to a position after position i
+                item_j = swaps.get(j, j)
+                item_i = swaps.pop(i, i)
+
+                if j != i: swaps[j] = item_i
+
+                order.append(item_j)
+
+        def __len__(self) -> int:
+            return len(self._interactions)
+
+        def __getitem__(self, index):
+            if isinstance(index, slice):
+                start, stop, step = index.indices(len(self))
+                self._shuffle_to(max(start+1, stop) if step > 0 else start+1)
+                return [ self._interactions[self._order[i]] for i in range(start, stop, step) ]
+
+            if index < 0: index += len(self)
+            if index < 0 or index >= len(self): raise IndexError("interaction index out of range")
+
+            self._shuffle_to(index+1)
+            return self._interactions[self._order[index]]
+
+        def __iter__(self):
+            self._shuffle_to(len(self))
+            return iter([ self._interactions[i] for i in self._order ])
+
     def __init__(self, seed: Optional[int], simulation: Simulation[_C_out, _A_out]) -> None:
 
         self._simulation = simulation
         self._seed       = seed
-        self._interactions = coba.random.CobaRandom(self._seed).shuffle(simulation.interactions)
+        self._interactions = ShuffleSimulation._Shuffled(simulation.interactions, coba.random.CobaRandom(self._seed))
 
     @property
     def interactions(self) -> Sequence[Interaction[_C_out,_A_out]]:
@@ -426,7 +1352,14 @@ class SortSimulation(Simulation[_C_out, _A_out]):
         self._simulation   = simulation
         self._context_keys = context_keys
 
-        sort_key = lambda interaction: tuple([interaction.context[key] for key in self._context_keys ])
+        def sort_key(interaction: Interaction[_C_out,_A_out]) -> Tuple[Any,...]:
+            context = interaction.context
+
+            if isinstance(context, SparseVector):
+                return tuple([context.get(key,0) for key in self._context_keys ])
+
+            return tuple([context[key] for key in self._context_keys ])
+
         self._interactions = list(sorted(simulation.interactions, key=sort_key))
 
     @property
@@ -454,7 +1387,16 @@ class PcaSimulation(Simulation[Tuple[float,...], _A_out]):
         
         import numpy as np #type: ignore
 
-        feat_matrix          = np.array([list(i.context) for i in simulation.interactions])
+        contexts = [ i.context for i in simulation.interactions ]
+
+        if any(isinstance(c, SparseVector) for c in contexts):
+            width    = max([ max(c, default=-1)+1 if isinstance(c, SparseVector) else len(c) for c in contexts ])
+            contexts = [ c.to_dense(width) if isinstance(c, SparseVector) else c for c in contexts ]
+
+        if any(isinstance(f, Category) for c in contexts for f in c):
+            contexts = [ tuple(chain.from_iterable( f.onehot if isinstance(f, Category) else (f,) for f in c )) for c in contexts ]
+
+        feat_matrix          = np.array([list(c) for c in contexts])
         comp_vals, comp_vecs = np.linalg.eig(np.cov(feat_matrix.T))
         
         comp_vecs = comp_vecs[:,comp_vals > 0]
@@ -488,15 +1430,42 @@ class Shuffle(Filter[Simulation[Context,Action],Simulation[Context,Action]]):
     def __init__(self, seed:Optional[int]) -> None:
         self._seed = seed
 
-    def filter(self, item: Simulation[Context,Action]) -> Simulation[Context,Action]:        
+    def filter(self, item: Simulation[Context,Action]) -> Simulation[Context,Action]:
+
+        if isinstance(item, StreamingSimulation):
+            #the seed is fixed now so that every pass over the stream is shuffled the same way
+            seed = self._seed if self._seed is not None else coba.random.randint(0, 2**30-1)
+            return StreamingSimulation(_StreamSource(lambda: Shuffle._shuffle_buffer(item.stream(), seed, item.buffer_size)), item.buffer_size) #type: ignore
+
         return ShuffleSimulation(self._seed, item)
 
+    @staticmethod
+    def _shuffle_buffer(stream: Iterable[Any], seed: int, buffer_size: int) -> Iterable[Any]:
+        """Shuffle a stream with a buffer that never holds more than buffer_size items."""
+
+        random = coba.random.CobaRandom(seed)
+        buffer: List[Any] = []
+
+        for item in stream:
+            if len(buffer) < buffer_size:
+                buffer.append(item)
+            else:
+                index = min(int(random.random() * buffer_size), buffer_size-1)
+                yield buffer[index]
+                buffer[index] = item
+
+        if buffer:
+            yield from random.shuffle(buffer)
+
 class Take(Filter[Simulation[Context,Action],Simulation[Context,Action]]):
     def __init__(self, count:Optional[int]) -> None:
         self._count = count
 
     def filter(self, item: Simulation[Context,Action]) -> Simulation[Context,Action]:
 
+        if isinstance(item, StreamingSimulation):
+            return item if self._count is None else StreamingSimulation(_StreamSource(lambda: Take._take(item.stream(), self._count)), item.buffer_size) #type: ignore
+
         if self._count is None:
             return TakeSimulation(len(item.interactions), item)
 
@@ -505,6 +1474,12 @@ class Take(Filter[Simulation[Context,Action],Simulation[Context,Action]]):
 
         return TakeSimulation(self._count, item)
 
+    @staticmethod
+    def _take(stream: Iterable[Any], count: int) -> Iterable[Any]:
+        #to match non-streaming simulations nothing is taken when fewer than count items exist
+        taken = list(islice(stream, count))
+        return taken if len(taken) == count else []
+
 class Batch(Filter[Simulation[Context,Action],BatchedSimulation[Context,Action]]):
     
     @overload
@@ -524,6 +1499,13 @@ class Batch(Filter[Simulation[Context,Action],BatchedSimulation[Context,Action]]
 
     def filter(self, item: Simulation[Context,Action]) -> BatchedSimulation[Context,Action]:
         
+        if isinstance(item, StreamingSimulation):
+            if self._sizes is not None:
+                return StreamingBatchedSimulation(item, self._sizes) #type: ignore
+            if self._size is not None:
+                return StreamingBatchedSimulation(item, repeat(self._size), drop_partial=True) #type: ignore
+            raise Exception("Streaming simulations can only be batched by size or sizes since their length isn't known in advance.")
+
         sizes: Optional[Sequence[int]] = None
 
         if self._count is not None:
@@ -1,13 +1,23 @@
 
+import math
 import unittest
+import pickle
+import shutil
+import tempfile
 
 from pathlib import Path
 from statistics import mean
 
-from coba.simulations import LambdaSimulation
-from coba.execution import ExecutionContext, NoneLogger
+from coba.simulations import LambdaSimulation, OpenmlSimulation, MemorySimulation, MemoryMappedSimulation, StreamingSimulation, Interaction
+from coba.data.sources import Source, MemorySource
+from coba.data.structures import SparseVector
+from coba.data.filters import Filter
+from coba.execution import ExecutionContext, NoneLogger, MemoryCache, UniversalLogger
 from coba.learners import Learner
-from coba.benchmarks import Benchmark, Result, Transaction, TransactionIsNew
+from coba.benchmarks import (
+    Benchmark, Result, Transaction, TransactionIsNew, TransactionEncodeBinary, TransactionDecodeBinary,
+    TaskSource, TaskToTransactions, BenchmarkLearner, BenchmarkSimulation, CachedSimulation
+)
 
 #for testing purposes
 class ModuloLearner(Learner[int,int]):
@@ -28,6 +38,24 @@ class ModuloLearner(Learner[int,int]):
     def learn(self, key, context, action, reward, probability):
         pass
 
+class BatchModuloLearner(ModuloLearner):
+    def __init__(self, family="0"):
+        super().__init__(family)
+        self.batch_sizes = []
+
+    def predict_batch(self, keys, contexts, action_sets):
+        self.batch_sizes.append(len(keys))
+        return [ self.predict(k,c,a) for k,c,a in zip(keys, contexts, action_sets) ]
+
+class SometimesBrokenLearner(ModuloLearner):
+    broken   = False
+    predicts = 0
+
+    def predict(self, key, context, actions):
+        SometimesBrokenLearner.predicts += 1
+        if SometimesBrokenLearner.broken and SometimesBrokenLearner.predicts == 3: raise Exception()
+        return super().predict(key, context, actions)
+
 class BrokenLearner(Learner[int,int]):
     @property
     def family(self):
@@ -61,6 +89,114 @@ class NotPicklableLearner(Learner[int,int]):
     def learn(self, key, context, action, reward, probability):
         pass
 
+class CountingSimulation(MemorySimulation):
+    def __init__(self, interactions, reward_sets):
+        super().__init__(interactions, reward_sets)
+        self.reward_calls = 0
+
+    def reward(self, choices):
+        self.reward_calls += 1
+        return super().reward(choices)
+
+class CountingFilter(Filter):
+    def __init__(self):
+        self.filter_calls = 0
+
+    def filter(self, item):
+        self.filter_calls += 1
+        return item
+
+class TaskToTransactions_Test(unittest.TestCase):
+
+    def test_learners_in_lock_step(self):
+        simulation = CountingSimulation([Interaction(i, [0,1,2], i) for i in range(5)], [[0,1,2]]*5)
+        pipes      = Benchmark([MemorySource(simulation)], batch_size=1, ignore_raise=False)._simulation_pipes
+        learners   = [BenchmarkLearner(ModuloLearner("0"), 1), BenchmarkLearner(ModuloLearner("1"), 1)]
+        tasks      = TaskSource(pipes, learners, Result()).read()
+
+        transactions = list(TaskToTransactions(False).filter(tasks))
+
+        self.assertEqual(5, simulation.reward_calls)
+        self.assertEqual(["S","B","B"], [ t[0] for t in transactions ])
+        self.assertEqual([1,1,1,1,1], transactions[1][2]["N"])
+        self.assertCountEqual([0,1,2,0,1], transactions[1][2]["reward"])
+        self.assertEqual(transactions[1][2]["reward"], transactions[2][2]["reward"])
+
+    def test_broken_learner_keeps_other_results(self):
+        simulation = MemorySimulation([Interaction(i, [0,1,2], i) for i in range(5)], [[0,1,2]]*5)
+        pipes      = Benchmark([MemorySource(simulation)], batch_size=1)._simulation_pipes
+        learners   = [BenchmarkLearner(BrokenLearner(), 1), BenchmarkLearner(ModuloLearner(), 1)]
+        tasks      = TaskSource(pipes, learners, Result()).read()
+
+        ignored_transactions = list(TaskToTransactions(True).filter(tasks))
+        raised_transactions  = []
+
+        with self.assertRaises(Exception):
+            for transaction in TaskToTransactions(False).filter(tasks):
+                raised_transactions.append(transaction)
+
+        self.assertEqual([("S",0),("B",(0,1))], [ (t[0],t[1]) for t in ignored_transactions ])
+        self.assertEqual([1,1,1,1,1], ignored_transactions[1][2]["N"])
+        self.assertEqual([("S",0),("B",(0,1))], [ (t[0],t[1]) for t in raised_transactions ])
+
+    def test_shared_filter_prefix_applied_once(self):
+        simulation = MemorySimulation([Interaction(i, [0,1,2], i) for i in range(5)], [[0,1,2]]*5)
+        counter    = CountingFilter()
+        source     = BenchmarkSimulation(MemorySource(simulation), [counter], "0", ["Counting"])
+        pipes      = Benchmark([source], batch_count=1, seeds=[1,2,3], ignore_raise=False)._simulation_pipes
+        tasks      = TaskSource(pipes, [BenchmarkLearner(ModuloLearner(), 1)], Result()).read()
+
+        transactions = list(TaskToTransactions(False).filter(tasks))
+
+        self.assertEqual(1, counter.filter_calls)
+        self.assertEqual(["S","B","S","B","S","B"], [ t[0] for t in transactions ])
+
+class BenchmarkLearner_Test(unittest.TestCase):
+
+    def test_choose_batch_uses_predict_batch(self):
+        learner = BatchModuloLearner()
+
+        choices, probs = BenchmarkLearner(learner, 1).choose_batch([0,1,2], [0,1,2], [[4,5,6]]*3)
+
+        self.assertEqual([3], learner.batch_sizes)
+        self.assertEqual([0,1,2], choices)
+        self.assertEqual([1,1,1], probs)
+
+    def test_choose_batch_without_predict_batch(self):
+        class PredictOnlyLearner:
+            def predict(self, key, context, actions):
+                return [0,1]
+
+        choices, probs = BenchmarkLearner(PredictOnlyLearner(), 1).choose_batch([0,1], [None,None], [[4,5]]*2) #type: ignore
+
+        self.assertEqual([1,1], choices)
+        self.assertEqual([1,1], probs)
+
+    def test_resume_from_checkpoint(self):
+        simulation  = MemorySimulation([Interaction(i, [0,1,2], i) for i in range(5)], [[0,1,2]]*5)
+        pipes       = Benchmark([MemorySource(simulation)], batch_size=1, seeds=[1])._simulation_pipes
+        tasks       = TaskSource(pipes, [BenchmarkLearner(SometimesBrokenLearner(), 1)], Result()).read()
+        checkpoints = MemoryCache()
+
+        try:
+            SometimesBrokenLearner.broken = True
+            first_transactions = list(TaskToTransactions(True, checkpoints, 1).filter(tasks))
+        finally:
+            SometimesBrokenLearner.broken = False
+
+        self.assertEqual([], first_transactions)
+        self.assertIn("0_0.checkpoint", checkpoints)
+
+        self.assertEqual(2, pickle.loads(checkpoints.get("0_0.checkpoint"))[0])
+
+        second_transactions = list(TaskToTransactions(True, checkpoints, 1).filter(tasks))
+
+        #the first two batches were restored from the checkpoint so only three more predicts were needed
+        self.assertEqual(6, SometimesBrokenLearner.predicts)
+        self.assertEqual(["S","B"], [ t[0] for t in second_transactions ])
+        self.assertEqual([1,1,1,1,1], second_transactions[1][2]["N"])
+        self.assertNotIn("0_0.checkpoint", checkpoints)
+
 class TransactionIsNew_Test(unittest.TestCase):
     
     def test_duplicates_are_dropped(self):
@@ -97,6 +233,219 @@ class TransactionIsNew_Test(unittest.TestCase):
 
         self.assertEqual(len(transactions), 3)
 
+    def test_repeated_simulations_are_dropped(self):
+        filter = TransactionIsNew(Result())
+
+        transactions = list(filter.filter([
+            Transaction.simulation(0, b='B'),
+            Transaction.batch(0, 0, reward=1),
+            Transaction.simulation(0, b='B'),
+            Transaction.batch(0, 1, reward=1)]
+        ))
+
+        self.assertEqual(1, len([ t for t in transactions if t[0] == "S" ]))
+        self.assertEqual(2, len([ t for t in transactions if t[0] == "B" ]))
+
+class TaskSource_Tests(unittest.TestCase):
+
+    def test_one_task_per_source(self):
+        sim1 = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        sim2 = LambdaSimulation(4, lambda t: t, lambda t: [3,4,5], lambda c,a: a)
+
+        pipes = Benchmark([sim1,sim2], batch_count=1, seeds=[1,2,3])._simulation_pipes
+        tasks = TaskSource(pipes, [ModuloLearner(), ModuloLearner()], Result()).read()
+
+        self.assertEqual(2, len(tasks))
+        self.assertEqual([0,0,1,1,2,2], tasks[0][0])
+
+    def test_chunked_tasks(self):
+        sim1 = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        sim2 = LambdaSimulation(4, lambda t: t, lambda t: [3,4,5], lambda c,a: a)
+
+        pipes = Benchmark([sim1,sim2], batch_count=1, seeds=[1,2,3])._simulation_pipes
+        tasks = TaskSource(pipes, [ModuloLearner(), ModuloLearner()], Result(), 4).read()
+
+        self.assertEqual(4, len(tasks))
+        self.assertEqual([[0,0,1,1],[2,2],[3,3,4,4],[5,5]], [ task[0] for task in tasks ])
+        self.assertEqual([[0,1,0,1],[0,1],[0,1,0,1],[0,1]], [ task[1] for task in tasks ])
+
+    def test_chunked_tasks_skip_restored(self):
+        sim1 = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+
+        restored = Result.from_transactions([Transaction.batch(0, 0, N=[5], reward=[1])])
+        pipes    = Benchmark([sim1], batch_count=1)._simulation_pipes
+        tasks    = TaskSource(pipes, [ModuloLearner(), ModuloLearner()], restored, 1).read()
+
+        self.assertEqual([([0],[1])], [ (task[0],task[1]) for task in tasks ])
+
+    def test_prefetched_tasks(self):
+        sim1 = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        sim2 = LambdaSimulation(4, lambda t: t, lambda t: [3,4,5], lambda c,a: a)
+
+        pipes     = Benchmark([sim1,sim2], batch_count=1, seeds=[1,2,3])._simulation_pipes
+        unfetched = TaskSource(pipes, [ModuloLearner(), ModuloLearner()], Result(), 4).read()
+        fetched   = list(TaskSource(pipes, [ModuloLearner(), ModuloLearner()], Result(), 4, prefetch=1).read())
+
+        self.assertEqual([ task[0:2] for task in unfetched ], [ task[0:2] for task in fetched ])
+        self.assertTrue(all(isinstance(pipe._source, MemorySource) for task in fetched for pipe in task[3]))
+
+        #consecutive tasks with the same source share a single read of it
+        self.assertIs(fetched[0][3][0]._source, fetched[1][3][0]._source)
+        self.assertIsNot(fetched[1][3][0]._source, fetched[2][3][0]._source)
+
+    def test_memory_map_refuses_sparse_contexts(self):
+        interactions = [ Interaction(SparseVector({0:i}), [0,1], i) for i in range(1,3) ]
+        source       = MemorySource(MemorySimulation(interactions, [[0,1],[1,0]]))
+        directory    = tempfile.mkdtemp()
+        actual_logs  = []
+        logger       = ExecutionContext.Logger
+
+        try:
+            ExecutionContext.Logger = UniversalLogger(print_function = lambda m,e: actual_logs.append(m))
+
+            pipes = Benchmark([source], batch_count=1)._simulation_pipes
+            tasks = list(TaskSource(pipes, [ModuloLearner()], Result(), None, directory).read())
+        finally:
+            ExecutionContext.Logger = logger
+            shutil.rmtree(directory)
+
+        self.assertIs(source, tasks[0][3][0]._source)
+        self.assertTrue(any("unable to memory map source:" in log for log in actual_logs))
+
+    def test_prefetch_failure_logged_by_calling_thread(self):
+
+        class BrokenSource(Source):
+            def read(self):
+                ExecutionContext.Logger.log("reading broken source")
+                raise Exception("broken source")
+
+        actual_prints = []
+        logger        = ExecutionContext.Logger
+
+        try:
+            ExecutionContext.Logger = UniversalLogger(print_function = lambda m,e: actual_prints.append(m))
+
+            pipes   = Benchmark([BrokenSource()], batch_count=1)._simulation_pipes
+            fetched = list(TaskSource(pipes, [ModuloLearner()], Result(), None, prefetch=1).read())
+        finally:
+            ExecutionContext.Logger = logger
+
+        self.assertIsInstance(fetched[0][3][0]._source, BrokenSource)
+        self.assertEqual(1, len(actual_prints))
+        self.assertIn("unable to prefetch source:", actual_prints[0])
+        self.assertIn("broken source", actual_prints[0])
+
+class TransactionBinary_Tests(unittest.TestCase):
+
+    def test_round_trip(self):
+        transactions = [
+            Transaction.version(2),
+            Transaction.learner(0, family="a", full_name="a"),
+            Transaction.simulation(0, source="0", batch_count=2),
+            Transaction.batch(0, 0, N=[2,3], reward=[0.5,1.25]),
+            Transaction.batch(1, 0, N=[2], reward=[1]),
+            Transaction.batch(2, 0, N=[2,3], reward=["a","b"])
+        ]
+
+        encoded = b''.join(TransactionEncodeBinary().filter(transactions))
+        decoded = list(TransactionDecodeBinary().filter(encoded))
+
+        self.assertEqual(['version', 2], decoded[0])
+        self.assertEqual(["L", 0, {"family":"a", "full_name":"a"}], decoded[1])
+        self.assertEqual(["S", 0, {"source":"0", "batch_count":2}], decoded[2])
+        self.assertEqual(["B", (0,0), {"N":[2,3], "reward":[0.5,1.25]}], decoded[3])
+        self.assertEqual(["B", (1,0), {"N":[2], "reward":[1]}], decoded[4])
+        self.assertEqual(["B", [2,0], {"N":[2,3], "reward":["a","b"]}], decoded[5])
+
+    def test_partial_record_ignored(self):
+        transactions = [ Transaction.version(2), Transaction.batch(0, 0, N=[2,3], reward=[0.5,1.25]) ]
+
+        encoded = b''.join(TransactionEncodeBinary().filter(transactions))
+        decoded = list(TransactionDecodeBinary().filter(encoded[:-3]))
+
+        self.assertEqual([['version', 2]], decoded)
+
+class CountingSource(Source):
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.read_calls = 0
+
+    def read(self):
+        self.read_calls += 1
+        return self.simulation
+
+class CachedSimulation_Tests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = Path("coba/tests/.temp/simulation_cache")
+
+    def tearDown(self) -> None:
+        if self.directory.exists(): shutil.rmtree(self.directory)
+        ExecutionContext.Config.simulation_cache = None
+
+    def test_source_only_read_once(self):
+        simulation = MemorySimulation([Interaction(i, [0,1,2], i) for i in range(5)], [[0,1,2]]*5)
+        source     = CountingSource(simulation)
+        key        = CachedSimulation.fingerprint("A", ["B"])
+
+        first  = CachedSimulation(source, str(self.directory), key).read()
+        second = CachedSimulation(source, str(self.directory), key).read()
+
+        self.assertEqual(1, source.read_calls)
+        self.assertIsInstance(second, MemoryMappedSimulation)
+        self.assertEqual([i.context for i in simulation.interactions], [i.context for i in second.interactions])
+        self.assertEqual([1,2], second.reward([(1,1),(2,2)]))
+        self.assertEqual(first.reward([(3,0)]), second.reward([(3,0)]))
+
+    def test_numeric_contexts_not_in_header(self):
+        simulation = MemorySimulation([Interaction((i/2,i%2,1-i%2), [0,1], i) for i in range(5)], [[0,1]]*5)
+        key        = CachedSimulation.fingerprint("A", ["B"])
+
+        CachedSimulation(MemorySource(simulation), str(self.directory), key).read()
+        cached = CachedSimulation(MemorySource(simulation), str(self.directory), key).read()
+
+        self.assertEqual([i.context for i in simulation.interactions], [i.context for i in cached.interactions])
+        self.assertIsNone(cached._contexts)
+
+    def test_fingerprint(self):
+        self.assertEqual(CachedSimulation.fingerprint("A", ["B"]), CachedSimulation.fingerprint("A", ["B"]))
+        self.assertNotEqual(CachedSimulation.fingerprint("A", ["B"]), CachedSimulation.fingerprint("A", ["C"]))
+        self.assertNotEqual(CachedSimulation.fingerprint("A", ["B"]), CachedSimulation.fingerprint("B", ["B"]))
+        self.assertNotEqual(CachedSimulation.fingerprint("A", ["B"]), CachedSimulation.fingerprint("A", ["B"], "abc"))
+        self.assertNotEqual(CachedSimulation.fingerprint("A", ["B"], "abc"), CachedSimulation.fingerprint("A", ["B"], "def"))
+
+    def test_benchmark_fingerprint_includes_checksum(self):
+        ExecutionContext.Config.simulation_cache = str(self.directory)
+
+        described = BenchmarkSimulation(OpenmlSimulation(150, "abc"), [], '{"OpenmlSimulation":150}', [])
+        cached    = Benchmark([described], batch_count=1)._simulation_pipes[0]._source
+
+        self.assertEqual(CachedSimulation.fingerprint('{"OpenmlSimulation":150}', [], "abc"), cached._fingerprint)
+
+    def test_fingerprint_includes_version(self):
+        old_version = CachedSimulation.fingerprint("A", ["B"])
+
+        try:
+            CachedSimulation.CurrentVersion += 1
+            self.assertNotEqual(old_version, CachedSimulation.fingerprint("A", ["B"]))
+        finally:
+            CachedSimulation.CurrentVersion -= 1
+
+    def test_benchmark_uses_cache(self):
+        ExecutionContext.Config.simulation_cache = str(self.directory)
+
+        simulation = MemorySimulation([Interaction(i, [0,1,2], i) for i in range(5)], [[0,1,2]]*5)
+        source     = CountingSource(simulation)
+        described  = BenchmarkSimulation(source, [], "counting", [])
+        benchmark  = Benchmark([described, MemorySource(simulation)], batch_count=1, ignore_raise=False, processes=1)
+
+        first  = benchmark.evaluate([ModuloLearner()])
+        second = benchmark.evaluate([ModuloLearner()])
+
+        self.assertEqual(1, source.read_calls)
+        self.assertEqual(1, len(list(self.directory.iterdir())))
+        self.assertEqual([ b.reward for b in first.batches.to_tuples() ], [ b.reward for b in second.batches.to_tuples() ])
+
 class Result_Tests(unittest.TestCase):
 
     def test_has_batches_key(self):
@@ -114,6 +463,79 @@ class Result_Tests(unittest.TestCase):
         result = Result.from_transactions([Transaction.version(1)])
         self.assertEqual(result.version, 1)
 
+    def test_aggregate_batches(self):
+        result = Result.from_transactions([
+            Transaction.batch(0, 0, N=[1,1,1], reward=[1,2,3]),
+            Transaction.batch(1, 0, N=[1,1], reward=[3,6]),
+            Transaction.batch(0, 1, N=[1], reward=[5])
+        ])
+
+        expected_0 = {
+            "index"      : [0, 1],
+            "in_count"   : [2, 2],
+            "in_mean"    : [2, 4],
+            "in_variance": [2, 8],
+            "cu_count"   : [2, 4],
+            "cu_mean"    : [2, 3],
+            "cu_variance": [2, 14/3]
+        }
+
+        for aggregate in [result.aggregate_batches(), {0: Result._aggregate_python([[1,2,3],[3,6]])}]:
+            for key, values in expected_0.items():
+                for actual, expected in zip(aggregate[0][key], values):
+                    self.assertAlmostEqual(expected, actual)
+
+        self.assertEqual([0], list(result.aggregate_batches([0]).keys()))
+        self.assertEqual([5], result.aggregate_batches([1])[1]["cu_mean"])
+        self.assertTrue(math.isnan(result.aggregate_batches([1])[1]["cu_variance"][0]))
+
+    def test_decimate(self):
+        series    = {"index": list(range(10)), "in_mean": list(range(10,20)) }
+        decimated = Result._decimate(series, 4)
+
+        self.assertEqual([0,3,6,9], decimated["index"])
+        self.assertEqual([10,13,16,19], decimated["in_mean"])
+        self.assertIs(series, Result._decimate(series, 10))
+
+    def test_from_transaction_log_current_version_is_not_rewritten(self):
+        log = Path("coba/tests/.temp/current_version.log")
+
+        try:
+            log.write_text('["version", 2]\n["L", 0, {"family": "a"}]\n')
+            modified = log.stat().st_mtime_ns
+
+            result = Result.from_transaction_log(str(log))
+
+            self.assertEqual(2, result.version)
+            self.assertEqual([(0,"a")], result.to_tuples()[0])
+            self.assertEqual(modified, log.stat().st_mtime_ns)
+        finally:
+            if log.exists(): log.unlink()
+
+    def test_from_transaction_log_old_version_is_promoted(self):
+        log = Path("coba/tests/.temp/old_version.log")
+
+        try:
+            log.write_text('["version", 1]\n["benchmark", {"n_seeds": 1, "batcher": "a", "ignore_first": false}]\n["L", 0, {"family": "a"}]\n')
+
+            result = Result.from_transaction_log(str(log))
+
+            self.assertEqual(2, result.version)
+            self.assertEqual([(0,"a")], result.to_tuples()[0])
+            self.assertEqual('["version", 2]', log.read_text().splitlines()[0])
+            self.assertFalse(Path(f"{log}.promoting").exists())
+        finally:
+            if log.exists(): log.unlink()
+
+    def test_from_transaction_log_empty(self):
+        log = Path("coba/tests/.temp/empty.log")
+
+        try:
+            log.write_text('')
+            self.assertEqual(([],[],[]), Result.from_transaction_log(str(log)).to_tuples())
+        finally:
+            if log.exists(): log.unlink()
+
 class Benchmark_Single_Tests(unittest.TestCase):
 
     @classmethod
@@ -199,6 +621,83 @@ class Benchmark_Single_Tests(unittest.TestCase):
         self.assertCountEqual(actual_simulations, expected_simulations)
         self.assertCountEqual(actual_batches, expected_batches)
 
+    def test_chunk_size(self):
+        sim       = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        learner1  = ModuloLearner("0") #type: ignore
+        learner2  = ModuloLearner("1") #type: ignore
+        benchmark = Benchmark([sim], batch_count=1, seeds=[None, 1], ignore_raise=False, chunk_size=1)
+
+        actual_learners,actual_simulations,actual_batches = benchmark.evaluate([learner1, learner2]).to_tuples()
+
+        expected_learners     = [(0,"0","0"), (1,"1","1")]
+        expected_simulations  = [(0, '0', ['{"Batch":[None, 1, None]}'], 5, 1, 1, 3), (1, '0', ['{"Shuffle":1}', '{"Batch":[None, 1, None]}'], 5, 1, 1, 3)]
+        expected_batches      = [(0, 0, [5], [mean([0,1,2,0,1])]), (0, 1, [5], [mean([0,1,2,0,1])]), (1, 0, [5], [mean([0,1,2,0,1])]), (1, 1, [5], [mean([0,1,2,0,1])])]
+
+        self.assertCountEqual(actual_learners, expected_learners)
+        self.assertCountEqual(actual_simulations, expected_simulations)
+        self.assertCountEqual(actual_batches, expected_batches)
+
+    def test_chunk_size_writes_simulations_once(self):
+        sim1      = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        sim2      = LambdaSimulation(4, lambda t: t, lambda t: [3,4,5], lambda c,a: a)
+        benchmark = Benchmark([sim1,sim2], batch_count=1, ignore_raise=False, chunk_size=1)
+        log       = Path("coba/tests/.temp/chunked.log")
+
+        try:
+            benchmark.evaluate([ModuloLearner("0"), ModuloLearner("1")], str(log))
+
+            lines = log.read_text().splitlines()
+
+            self.assertEqual(2, len([ line for line in lines if line.startswith('["S"') ]))
+            self.assertEqual(4, len([ line for line in lines if line.startswith('["B"') ]))
+        finally:
+            if log.exists(): log.unlink()
+
+    def test_memory_map(self):
+        sim1      = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        sim2      = LambdaSimulation(4, lambda t: t, lambda t: [3,4,5], lambda c,a: a)
+        learner   = ModuloLearner()
+        benchmark = Benchmark([sim1,sim2], batch_count=1, ignore_raise=False, memory_map=True)
+
+        actual_learners,actual_simulations,actual_batches = benchmark.evaluate([learner]).to_tuples()
+
+        expected_learners    = [(0,"0","0")]
+        expected_simulations = [(0, '0', ['{"Batch":[None, 1, None]}'], 5, 1, 1, 3), (1, '1', ['{"Batch":[None, 1, None]}'], 4, 1, 1, 3)]
+        expected_batches     = [(0, 0, [5], [mean([0,1,2,0,1])]), (1, 0, [4], [mean([3,4,5,3])])]
+
+        self.assertCountEqual(actual_learners, expected_learners)
+        self.assertCountEqual(actual_simulations, expected_simulations)
+        self.assertCountEqual(actual_batches, expected_batches)
+
+    def test_streaming_sims(self):
+        pairs     = [ (Interaction(i, [0,1,2], i), [0,1,2]) for i in range(6) ]
+        sim       = MemorySource(StreamingSimulation(MemorySource(pairs), buffer_size=3))
+        learner   = ModuloLearner()
+        benchmark = Benchmark([sim], batch_size=2, take=5, ignore_raise=False, seeds=[1])
+
+        actual_learners,actual_simulations,actual_batches = benchmark.evaluate([learner]).to_tuples()
+
+        expected_learners    = [(0,"0","0")]
+        expected_simulations = [(0, '0', ['{"Shuffle":1}', '{"Take":5}', '{"Batch":[2, None, None]}'], 4, 2, 1, 3)]
+
+        self.assertCountEqual(actual_learners, expected_learners)
+        self.assertCountEqual(actual_simulations, expected_simulations)
+        self.assertEqual([2,2], actual_batches[0].N)
+
+    def test_checkpoint_every(self):
+        sim       = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        learner   = ModuloLearner()
+        benchmark = Benchmark([sim], batch_size=1, ignore_raise=False, checkpoint_every=2)
+
+        try:
+            actual_batches = benchmark.evaluate([learner], "coba/tests/.temp/transactions.log").to_tuples()[2]
+            checkpoints_removed = not Path('coba/tests/.temp/transactions.log.checkpoints').exists()
+        finally:
+            if Path('coba/tests/.temp/transactions.log').exists(): Path('coba/tests/.temp/transactions.log').unlink()
+
+        self.assertEqual([1,1,1,1,1], actual_batches[0].N)
+        self.assertTrue(checkpoints_removed)
+
     def test_transaction_resume_1(self):
         sim             = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
         working_learner = ModuloLearner()
@@ -223,6 +722,48 @@ class Benchmark_Single_Tests(unittest.TestCase):
         self.assertCountEqual(actual_simulations, expected_simulations)
         self.assertCountEqual(actual_batches, expected_batches)
 
+    def test_transaction_resume_binary(self):
+        sim             = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        working_learner = ModuloLearner()
+        broken_learner  = BrokenLearner()
+        benchmark       = Benchmark([sim], batch_count=1)
+
+        try:
+            first_results  = benchmark.evaluate([working_learner], "coba/tests/.temp/transactions.bin")
+            second_results = benchmark.evaluate([broken_learner], "coba/tests/.temp/transactions.bin")
+
+            actual_learners,actual_simulations,actual_batches = second_results.to_tuples()
+
+            expected_learners    = [(0,"0","0")]
+            expected_simulations = [(0, '0', ['{"Batch":[None, 1, None]}'], 5, 1, 1, 3)]
+            expected_batches     = [(0, 0, [5], [mean([0,1,2,0,1])])]
+        finally:
+            if Path('coba/tests/.temp/transactions.bin').exists(): Path('coba/tests/.temp/transactions.bin').unlink()
+
+        self.assertEqual(first_results.to_tuples(), second_results.to_tuples())
+        self.assertCountEqual(actual_learners, expected_learners)
+        self.assertCountEqual(actual_simulations, expected_simulations)
+        self.assertCountEqual(actual_batches, expected_batches)
+
+    def test_transaction_resume_binary_partial_record(self):
+        sim       = LambdaSimulation(5, lambda t: t, lambda t: [0,1,2], lambda c,a: a)
+        benchmark = Benchmark([sim], batch_count=1)
+        log       = Path("coba/tests/.temp/transactions.bin")
+
+        try:
+            first_results = benchmark.evaluate([ModuloLearner()], str(log))
+
+            #simulate a benchmark that was interrupted while writing its final batch record
+            log.write_bytes(log.read_bytes()[:-3])
+
+            second_results = benchmark.evaluate([ModuloLearner()], str(log))
+            third_results  = Result.from_transaction_log(str(log))
+        finally:
+            if log.exists(): log.unlink()
+
+        self.assertEqual(first_results.to_tuples(), second_results.to_tuples())
+        self.assertEqual(first_results.to_tuples(), third_results.to_tuples())
+
 class Benchmark_Multi_Tests(Benchmark_Single_Tests):
     
     @classmethod
@@ -5,7 +5,10 @@ import math
 from abc import ABC, abstractmethod
 from typing import Sequence, Tuple, cast, Any
 
+from array import array
+
 from coba.data.encoders import Encoder,StringEncoder, NumericEncoder, OneHotEncoder, FactorEncoder
+from coba.data.structures import CategoryColumn, Category
 
 class Encoder_Interface_Tests(ABC):
 
@@ -38,6 +41,12 @@ class Encoder_Interface_Tests(ABC):
         with cast(unittest.TestCase, self).assertRaises(Exception):
             unfit_encoder.encode(test)
 
+    def test_unfit_encoder_throws_exception_on_encode_array(self):
+        unfit_encoder,_,test,_ = self._make_unfit_encoder()
+
+        with cast(unittest.TestCase, self).assertRaises(Exception):
+            unfit_encoder.encode_array(test)
+
     def test_correctly_returns_new_encoder_after_fitting(self):
         unfit_encoder,train,_,_ = self._make_unfit_encoder()
 
@@ -74,6 +83,16 @@ class NumericEncoder_Tests(Encoder_Interface_Tests, unittest.TestCase):
     def _make_unfit_encoder(self) -> Tuple[Encoder, Sequence[str], Sequence[str], Sequence[Any]]:
         return NumericEncoder(is_fit=False), ["1","2","3"], ["1.23"], [1.23]
 
+    def test_float_array(self):
+        self.assertEqual([1.5, 2.], NumericEncoder().encode(array('d', [1.5, 2.])))
+
+    def test_encode_array(self):
+        encoded = NumericEncoder().encode_array(["1", "?", "", "2.5", "a"])
+
+        self.assertEqual([1., 2.5], encoded[[0,3]].tolist())
+        self.assertTrue(all(math.isnan(v) for v in encoded[[1,2,4]]))
+        self.assertEqual([1.5, 2.], NumericEncoder().encode_array(array('d', [1.5, 2.])).tolist())
+
     def test_from_json(self):
 
         encoder = Encoder.from_json("numeric")
@@ -124,6 +143,31 @@ class OneHotEncoder_Tests(Encoder_Interface_Tests, unittest.TestCase):
         
         self.assertIsInstance(encoder,OneHotEncoder)
 
+    def test_encode_array(self):
+        encoder = OneHotEncoder(error_if_unknown=False).fit(["d","a","b"])
+        values  = ["d","a","b","b","z"]
+
+        expected = [ onehot.index(1) if 1 in onehot else -1 for onehot in encoder.encode(values) ]
+
+        self.assertEqual(expected, encoder.encode_array(values).tolist())
+
+    def test_category_column(self):
+        column = CategoryColumn()
+        column.extend(["d","a","b","b","d"])
+
+        encoder = OneHotEncoder().fit(column)
+
+        self.assertEqual(encoder.encode(["d","a","b","b","d"]), encoder.encode(column))
+
+    def test_as_category(self):
+        encoder = OneHotEncoder(error_if_unknown=False, as_category=True).fit(["d","a","b"])
+        actual  = encoder.encode(["d","a","z"])
+
+        self.assertEqual([Category("d",2,3), Category("a",0,3), Category(None,-1,3)], actual)
+        self.assertEqual(OneHotEncoder(error_if_unknown=False).fit(["d","a","b"]).encode(["d","a","z"]), [c.onehot for c in actual])
+        self.assertIs(actual[0], encoder.encode(["d"])[0])
+        self.assertEqual([2,0,-1], encoder.encode_array(["d","a","z"]).tolist())
+
     def test_singular_if_binary(self):
         encoder = OneHotEncoder(singular_if_binary=True).fit(["1","1","1","0","0"])
 
@@ -178,5 +222,11 @@ class FactorEncoder_Tests(Encoder_Interface_Tests, unittest.TestCase):
     def _make_unfit_encoder(self) -> Tuple[Encoder, Sequence[str], Sequence[str], Sequence[Any]]:
         return FactorEncoder(), ["a","z","a","z","1"], ["1","a","z"], [1,2,3]
 
+    def test_encode_array(self):
+        encoder = FactorEncoder().fit(["a","z","1"])
+        values  = ["z","1","b","a","z"]
+
+        self.assertEqual(encoder.encode(values), encoder.encode_array(values).tolist())
+
 if __name__ == '__main__':
     unittest.main()
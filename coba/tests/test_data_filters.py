@@ -1,9 +1,12 @@
+import math
+import time
 import timeit
 import unittest
 
-from coba.data.filters import CsvReader, ColEncoder, ColRemover, CsvTransposer, LabeledCsvCleaner
-from coba.data.encoders import NumericEncoder, StringEncoder
-from coba.execution import ExecutionContext, NoneLogger
+from coba.data.filters import CsvReader, ColEncoder, ColRemover, CsvTransposer, LabeledCsvCleaner, LabeledCsvRowCleaner, ColumnarCsvReader, Prefetch
+from coba.data.encoders import NumericEncoder, StringEncoder, OneHotEncoder
+from coba.data.structures import SparseVector, CategoryColumn, Category
+from coba.execution import ExecutionContext, NoneLogger, UniversalLogger
 
 ExecutionContext.Logger = NoneLogger()
 
@@ -14,6 +17,45 @@ class CsvReader_Tests(unittest.TestCase):
     def test_simple_with_empty(self):
         self.assertEqual([['a','b','c'],['1','2','3']], list(CsvReader().filter(['a,b,c', '', '1,2,3', ''])))
 
+class ColumnarCsvReader_Tests(unittest.TestCase):
+
+    def test_inferred_types(self):
+        columns = ColumnarCsvReader(chunk_size=2).filter(['a,b,c', 'x,1,?', 'y,2,3', 'x,,4'])
+
+        self.assertEqual(['a','b','c'], [ header for header,_ in columns ])
+        self.assertIsInstance(columns[0][1], CategoryColumn)
+        self.assertEqual(['x','y','x'], list(columns[0][1]))
+        self.assertEqual(['x','y']    , columns[0][1].categories)
+        self.assertEqual([0,1,0]      , list(columns[0][1].codes))
+
+        self.assertEqual('d', columns[1][1].typecode)
+        self.assertEqual([1.,2.], list(columns[1][1])[0:2])
+        self.assertTrue(math.isnan(columns[1][1][2]))
+
+        self.assertEqual('d', columns[2][1].typecode)
+        self.assertEqual([3.,4.], list(columns[2][1])[1:])
+
+    def test_encoder_types(self):
+        columns = ColumnarCsvReader(['a','b'], [NumericEncoder(), OneHotEncoder()]).filter(['a,b', '1,2', '3,4'])
+
+        self.assertEqual([1.,3.], list(columns[0][1]))
+        self.assertEqual(['2','4'], list(columns[1][1]))
+
+    def test_matches_labeled_csv_cleaner(self):
+        lines    = ['a,b,c', 'x,1,?', 'y,2,3', 'x,7,4']
+        encoders = [OneHotEncoder(), OneHotEncoder(), NumericEncoder()]
+
+        expected = LabeledCsvCleaner('a', ['a','b','c'], encoders, [], rmv_header=True).filter(CsvReader().filter(lines))
+        actual   = LabeledCsvCleaner('a', ['a','b','c'], encoders, [], rmv_header=True, columnar=True).filter(ColumnarCsvReader(['a','b','c'], encoders).filter(lines))
+
+        expected_features, expected_labels = list(expected[0]), list(expected[1])
+        actual_features  , actual_labels   = list(actual[0])  , list(actual[1])
+
+        self.assertEqual(expected_labels, actual_labels)
+        self.assertEqual([f[:-1] for f in expected_features], [f[:-1] for f in actual_features])
+        self.assertEqual([3.,4.], [f[-1] for f in actual_features][1:])
+        self.assertTrue(math.isnan(actual_features[0][-1]))
+
 class CsvTransposer_Tests(unittest.TestCase):
 
     def test_simple_sans_empty(self):
@@ -22,6 +64,25 @@ class CsvTransposer_Tests(unittest.TestCase):
     def test_simple_with_empty(self):
         self.assertEqual([('a','1'),('b','2'),('c','3')], list(CsvTransposer().filter([['a','b','c'],['1','2','3'],[]])))
 
+    def test_sparse(self):
+        columns = [['a',(0,1,0),(1,0,0)], ['b',0,2,3]]
+
+        rows = list(CsvTransposer(True, sparse=True).filter(columns))
+
+        self.assertEqual(['a','a','b']           , rows[0])
+        self.assertEqual(SparseVector({1:1})     , rows[1])
+        self.assertEqual(SparseVector({0:1, 2:2}), rows[2])
+        self.assertEqual(SparseVector({2:3})     , rows[3])
+
+    def test_sparse_matches_dense(self):
+        columns = [['a',(0,1,0,1),(1,0,0,0),(0,0,1,0)], ['b',0,2,3,4]]
+
+        dense  = list(CsvTransposer(True).filter(columns))
+        sparse = list(CsvTransposer(True, sparse=True).filter(columns))
+
+        self.assertEqual(list(dense[0]), sparse[0])
+        self.assertEqual([ SparseVector.from_dense(row) for row in dense[1:] ], sparse[1:])
+
 class ColEncoder_Tests(unittest.TestCase):
 
     def test_with_headers_1(self):
@@ -34,6 +95,15 @@ class ColEncoder_Tests(unittest.TestCase):
         decoder = ColEncoder(['a','b','c'],[NumericEncoder(),NumericEncoder(),NumericEncoder()])
         self.assertEqual([['a',1,4],['b',2,5],['c',3,6]], list(decoder.filter(csv)))
 
+    def test_onehot_as_category(self):
+        csv = [
+            ['a','x','y','x'],
+            ['b','1','2','3']
+        ]
+
+        decoder = ColEncoder(['a','b'],[OneHotEncoder(as_category=True),NumericEncoder()])
+        self.assertEqual([['a',Category('x',0,2),Category('y',1,2),Category('x',0,2)],['b',1,2,3]], list(decoder.filter(csv)))
+
     def test_with_headers_2(self):
         csv = [
             ['a','1','4'],
@@ -152,5 +222,122 @@ class LabeledCsvCleaner_Tests(unittest.TestCase):
         #was approximately 0.5 at best performance
         self.assertLess(time, 3)
 
+    def test_sparse_features(self):
+        table    = [['a','b','c'], ['x','1','0'], ['y','2','1'], ['x','0','0'], ['x','3','0']]
+        encoders = [OneHotEncoder(), NumericEncoder(), OneHotEncoder()]
+
+        features, labels = LabeledCsvCleaner('c', ['a','b','c'], encoders, [], rmv_header=True, sparse=True).filter(table)
+
+        self.assertEqual([SparseVector({0:1,2:1}), SparseVector({1:1,2:2}), SparseVector({0:1}), SparseVector({0:1,2:3})], list(features))
+        self.assertEqual([(1,0),(0,1),(1,0),(1,0)], list(labels))
+
+class LabeledCsvRowCleaner_Tests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._table = [['a','b','c','d'], ['x','1','0','q'], ['y','2','1','q'], ['z','0','0','r']]
+
+    def test_dense_rows(self):
+        encoders = [OneHotEncoder(), NumericEncoder(), OneHotEncoder(), StringEncoder()]
+        cleaner  = LabeledCsvRowCleaner('c', ['a','b','c','d'], encoders, [False,False,False,True], rmv_header=True, chunk_size=2)
+
+        self.assertEqual([((1,0,0,1.),(1,0)), ((0,1,0,2.),(0,1)), ((0,0,1,0.),(1,0))], list(cleaner.filter(self._table)))
+
+    def test_sparse_rows(self):
+        encoders = [OneHotEncoder(), NumericEncoder(), OneHotEncoder(), StringEncoder()]
+        cleaner  = LabeledCsvRowCleaner('c', ['a','b','c','d'], encoders, [False,False,False,True], rmv_header=True, sparse=True)
+
+        features, labels = zip(*cleaner.filter(self._table))
+
+        self.assertEqual((SparseVector({0:1,3:1}), SparseVector({1:1,3:2}), SparseVector({2:1})), features)
+        self.assertEqual(((1,0),(0,1),(1,0)), labels)
+
+    def test_matches_labeled_csv_cleaner(self):
+        encoders = [OneHotEncoder(), NumericEncoder(), OneHotEncoder(), OneHotEncoder()]
+
+        expected_features, expected_labels = LabeledCsvCleaner(0, [], encoders, [], rmv_header=True).filter(self._table)
+        actual_features  , actual_labels   = zip(*LabeledCsvRowCleaner(0, [], encoders, [], rmv_header=True, fit_rows=None).filter(self._table))
+
+        self.assertEqual(list(expected_features), list(actual_features))
+        self.assertEqual(list(expected_labels)  , list(actual_labels))
+
+    def test_fit_on_prefix(self):
+        encoders = [OneHotEncoder(error_if_unknown=False), NumericEncoder()]
+        cleaner  = LabeledCsvRowCleaner(1, [], encoders, [], fit_rows=2)
+
+        self.assertEqual([(1,0),(0,1),(0,0)], [ f for f,_ in cleaner.filter([['x','1'],['y','2'],['z','3']]) ])
+
+    def test_streams_fit_encoders(self):
+        read = []
+
+        def rows():
+            for row in [['x','1'],['y','2'],['x','3']]:
+                read.append(row)
+                yield row
+
+        cleaner = LabeledCsvRowCleaner(1, [], [OneHotEncoder(['x','y']), NumericEncoder()], [], chunk_size=1)
+        pairs   = iter(cleaner.filter(rows()))
+
+        self.assertEqual(((1,0),(1.,)), next(pairs))
+        self.assertEqual(1, len(read))
+
+    def test_metadata_fit_encoders(self):
+        #encoders fit from metadata have a position for every level and encode missing values as 0's
+        encoders = [OneHotEncoder(['x','y','z'], error_if_unknown=False), NumericEncoder()]
+        cleaner  = LabeledCsvRowCleaner(1, [], encoders, [])
+
+        self.assertEqual([(1,0,0),(0,0,0),(0,1,0)], [ f for f,_ in cleaner.filter([['x','1'],['?','2'],['y','3']]) ])
+
+    def test_missing_labels_dropped(self):
+        logs     = []
+        encoders = [OneHotEncoder(['x','y']), OneHotEncoder(['a','b'])]
+        cleaner  = LabeledCsvRowCleaner(1, [], encoders, [])
+
+        try:
+            ExecutionContext.Logger = UniversalLogger(lambda m,e: logs.append(m))
+            pairs = list(cleaner.filter([['x','a'],['y','?'],['y','b']]))
+        finally:
+            ExecutionContext.Logger = NoneLogger()
+
+        self.assertEqual([((1,0),(1,0)), ((0,1),(0,1))], pairs)
+        self.assertEqual(1, len(logs))
+        self.assertIn("1 rows were dropped", logs[0])
+
+class Prefetch_Tests(unittest.TestCase):
+
+    def test_items_in_order(self):
+        self.assertEqual(list(range(100)), list(Prefetch(3).filter(range(100))))
+
+    def test_upstream_runs_ahead_of_consumer(self):
+        read  = []
+        items = Prefetch(2).filter(read.append(i) or i for i in range(10))
+
+        self.assertEqual(0, next(items))
+        time.sleep(.1)
+        self.assertEqual([0,1,2,3], read)
+
+    def test_upstream_exception_is_raised(self):
+        def items():
+            yield 1
+            raise Exception("upstream")
+
+        prefetched = Prefetch(1).filter(items())
+
+        self.assertEqual(1, next(prefetched))
+        with self.assertRaises(Exception):
+            next(prefetched)
+
+    def test_upstream_base_exception_is_raised(self):
+        class Interrupt(BaseException): pass
+
+        def items():
+            yield 1
+            raise Interrupt()
+
+        prefetched = Prefetch(1).filter(items())
+
+        self.assertEqual(1, next(prefetched))
+        with self.assertRaises(Interrupt):
+            next(prefetched)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
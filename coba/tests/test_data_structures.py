@@ -1,7 +1,9 @@
 
+import math
+import pickle
 import unittest
 
-from coba.data.structures import Table
+from coba.data.structures import Table, SparseVector, Category
 
 class Table_Tests(unittest.TestCase):
 
@@ -48,5 +50,137 @@ class Table_Tests(unittest.TestCase):
         self.assertEqual(t['A'].a, 'A')
         self.assertEqual(t['A'].b, 'B')
 
+    def test_rmv_row(self):
+        table = Table("test", ['a'])
+
+        table.add_row(a='A', b='B')
+        table.add_row(a='a', b='b')
+        table.rmv_row('A')
+
+        self.assertFalse('A' in table)
+        self.assertTrue('a' in table)
+        self.assertEqual(1, len(table))
+        self.assertEqual(table.get_row('a'), {'a':'a', 'b':'b'})
+        self.assertEqual([('a','b')], [tuple(t) for t in table.to_tuples()])
+
+    def test_get_where_and_rmv_where(self):
+        table = Table("test", ['a'])
+
+        table.add_row(a=1, b=0)
+        table.add_row(a=2, b=1)
+        table.add_row(a=3, b=0)
+
+        self.assertEqual([{'a':1,'b':0}, {'a':3,'b':0}], list(table.get_where(b=0)))
+        self.assertEqual([], list(table.get_where(c=0)))
+
+        table.rmv_where(b=0)
+
+        self.assertEqual([{'a':2,'b':1}], list(table.get_where()))
+        self.assertEqual({2:(2,1)}, table.rows)
+
+    def test_mixed_column_types(self):
+        table = Table("test", ['a'])
+
+        table.add_row(a=1, b=1)
+        table.add_row(a=2, b=1.5)
+        table.add_row(a=3, c='c')
+
+        self.assertEqual(table.get_row(1)['b'], 1)
+        self.assertTrue(math.isnan(table.get_row(1)['c']))
+        self.assertEqual(table.get_row(2)['b'], 1.5)
+        self.assertIsInstance(table.get_row(1)['b'], int)
+        self.assertEqual(table.get_row(3)['c'], 'c')
+
+    def test_multi_primary(self):
+        table = Table("test", ['a','b'])
+
+        table.add_row(0, 1, c=[1,2])
+        table.add_row(1, 1, c=[3])
+
+        self.assertTrue((0,1) in table)
+        self.assertTrue({'a':1,'b':1} in table)
+        self.assertEqual([3], table[(1,1)]['c'])
+
+    def test_get_where_index_maintained(self):
+        table = Table("test", ['a'])
+
+        table.add_row(a=1, b=0)
+        table.add_row(a=2, b=1)
+
+        self.assertEqual([{'a':1,'b':0}], list(table.get_where(b=0)))
+
+        table.add_row(a=3, b=0)
+        table.add_row(a=1, b=1)
+        table.rmv_row(2)
+
+        self.assertEqual([{'a':3,'b':0}], list(table.get_where(b=0)))
+        self.assertEqual([{'a':1,'b':1}], list(table.get_where(b=1)))
+        self.assertEqual([{'a':1,'b':1}], list(table.get_where(a=1, b=1)))
+        self.assertEqual([], list(table.get_where(a=3, b=1)))
+
+    def test_get_where_unhashable_column(self):
+        table = Table("test", ['a'])
+
+        table.add_row(a=1, b=[0])
+        table.add_row(a=2, b=[1])
+
+        self.assertEqual([{'a':2,'b':[1]}], list(table.get_where(b=[1])))
+
+        table.add_row(a=3, b=[1])
+
+        self.assertEqual([{'a':2,'b':[1]}, {'a':3,'b':[1]}], list(table.get_where(b=[1])))
+
+    def test_row_type_cached_until_columns_change(self):
+        table = Table("test", ['a'])
+
+        table.add_row(a=1, b=0)
+
+        type_1 = type(table.to_tuples()[0])
+        table.add_row(a=2, b=1)
+        type_2 = type(table.to_tuples()[0])
+        table.add_row(a=3, c=1)
+        type_3 = type(table.to_tuples()[0])
+
+        self.assertIs(type_1, type_2)
+        self.assertIsNot(type_2, type_3)
+        self.assertEqual(('a','b','c'), type_3._fields)
+
+class SparseVector_Tests(unittest.TestCase):
+
+    def test_zeros_are_dropped(self):
+        vector = SparseVector({0:1, 1:0, 2:None, 3:2.5})
+
+        self.assertEqual(2            , len(vector))
+        self.assertEqual({0:1, 3:2.5} , dict(vector))
+        self.assertEqual(0            , vector.get(1,0))
+        self.assertEqual((1,0,0,2.5,0), vector.to_dense(5))
+
+    def test_from_dense(self):
+        self.assertEqual(SparseVector({1:1, 4:3}), SparseVector.from_dense([0,1,0,0,3]))
+
+    def test_hash_and_equality(self):
+        self.assertEqual(hash(SparseVector([(1,1),(3,2)])), hash(SparseVector({3:2, 1:1})))
+        self.assertEqual(SparseVector({1:1}), {1:1})
+        self.assertNotEqual(SparseVector({1:1}), SparseVector({1:2}))
+
+    def test_pickle(self):
+        self.assertEqual(SparseVector({2:1.5}), pickle.loads(pickle.dumps(SparseVector({2:1.5}))))
+        self.assertEqual(SparseVector()       , pickle.loads(pickle.dumps(SparseVector())))
+
+class Category_Tests(unittest.TestCase):
+
+    def test_onehot(self):
+        self.assertEqual((0,1,0), Category('b', 1, 3).onehot)
+        self.assertEqual((0,0,0), Category(None, -1, 3).onehot)
+
+    def test_hash_equality_and_order(self):
+        self.assertEqual(Category('b', 1, 3), Category('b', 1, 3))
+        self.assertEqual(hash(Category('b', 1, 3)), hash(Category('b', 1, 3)))
+        self.assertNotEqual(Category('b', 1, 3), (0,1,0))
+        self.assertEqual([Category('a',0,2), Category('b',1,2)], sorted([Category('b',1,2), Category('a',0,2)]))
+
+    def test_pickle(self):
+        self.assertEqual(Category('b', 1, 3), pickle.loads(pickle.dumps(Category('b', 1, 3))))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,10 +2,11 @@
 import unittest
 import json
 import traceback
+import threading
 
 from pathlib import Path
 
-from coba.execution import DiskCache, TemplatingEngine, UniversalLogger
+from coba.execution import DiskCache, TemplatingEngine, UniversalLogger, ThreadLogger
 
 class TemplatingEngine_Tests(unittest.TestCase):
     def test_no_template_string_unchanged_1(self):
@@ -160,6 +161,29 @@ class UniversalLogger_Tests(unittest.TestCase):
 
         logger.log_exception(exception)
 
+class ThreadLogger_Tests(unittest.TestCase):
+
+    def test_only_creating_thread_logs(self):
+        actual_prints = []
+        exception     = Exception("Test Exception")
+
+        logger = ThreadLogger(UniversalLogger(print_function = lambda m,e: actual_prints.append((m,e))))
+
+        def other_thread():
+            with logger.log('b'):
+                logger.log('c')
+            logger.log_exception(exception)
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+
+        logger.log('a')
+
+        self.assertEqual(1, len(actual_prints))
+        self.assertEqual(actual_prints[0][0][20:], "a")
+        self.assertFalse(hasattr(exception, '__logged__'))
+
 class DiskCache_Tests(unittest.TestCase):
 
     def setUp(self):
@@ -200,6 +224,40 @@ class DiskCache_Tests(unittest.TestCase):
 
         self.assertEqual(cache.get("test.csv"), b"test")
     
+    def test_put_overwrites_without_temp_files(self):
+
+        cache = DiskCache("coba/tests/.temp")
+
+        cache.put("test.csv", b"test1")
+        cache.put("test.csv", b"test2")
+
+        self.assertEqual(cache.get("test.csv"), b"test2")
+        self.assertEqual([], list(Path("coba/tests/.temp").glob("test.csv.gz.*.tmp")))
+
+    def test_put_and_get_chunks(self):
+
+        cache = DiskCache("coba/tests/.temp")
+
+        self.assertEqual([b"te", b"st"], list(cache.put_chunks("test.csv", iter([b"te", b"st"]))))
+        self.assertEqual(cache.get("test.csv"), b"test")
+
+        try:
+            DiskCache.ChunkSize = 3
+            self.assertEqual([b"tes", b"t"], list(cache.get_chunks("test.csv")))
+        finally:
+            DiskCache.ChunkSize = 2**20
+
+    def test_put_chunks_stopped_early_is_not_cached(self):
+
+        cache  = DiskCache("coba/tests/.temp")
+        chunks = cache.put_chunks("test.csv", iter([b"te", b"st"]))
+
+        self.assertEqual(b"te", next(chunks))
+        chunks.close()
+
+        self.assertFalse("test.csv" in cache)
+        self.assertEqual([], list(Path("coba/tests/.temp").glob("test.csv.gz.*.tmp")))
+
     def test_rmv_csv_from_cache(self):
 
         cache = DiskCache("coba/tests/.temp/")
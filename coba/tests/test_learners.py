@@ -1,9 +1,13 @@
 
+import pickle
 import unittest
+
+from copy import deepcopy
 from unittest.case import SkipTest
 
 from coba.utilities import check_vowpal_support
 from coba.learners import RandomLearner, EpsilonLearner, VowpalLearner, UcbTunedLearner
+from coba.data.structures import SparseVector
 
 class RandomLearner_Tests(unittest.TestCase):
     
@@ -15,6 +19,10 @@ class RandomLearner_Tests(unittest.TestCase):
         learner = RandomLearner()
         learner.learn(2, None, 1, 1, 1)
 
+    def test_predict_batch(self):
+        learner = RandomLearner()
+        self.assertEqual([[0.5, 0.5], [1/3, 1/3, 1/3]], learner.predict_batch([1,2], [None,None], [[1,2],[1,2,3]]))
+
 class EpsilonLearner_Tests(unittest.TestCase):
     def test_predict_no_learn(self):
         learner = EpsilonLearner(epsilon=0.5)
@@ -31,6 +39,22 @@ class EpsilonLearner_Tests(unittest.TestCase):
 
         self.assertEqual([0,0,1],learner.predict(4, None, [1,2,3]))
 
+    def test_learn_batch_no_epsilon(self):
+        learner = EpsilonLearner(epsilon=0)
+
+        learner.learn_batch([1,2,3], [None,None,None], [2,1,3], [1,2,3], [1,1,1])
+
+        self.assertEqual([0,0,1],learner.predict(4, None, [1,2,3]))
+
+    def test_predict_learn_sparse_context(self):
+        learner = EpsilonLearner(epsilon=0, include_context=True)
+
+        learner.learn(1, SparseVector({3:1}), 1, 1, 1)
+        learner.learn(2, SparseVector({5:1}), 2, 1, 1)
+
+        self.assertEqual([1,0], learner.predict(3, SparseVector({3:1}), [1,2]))
+        self.assertEqual([0,1], learner.predict(4, SparseVector({5:1}), [1,2]))
+
 class UcbTunedLearner_Tests(unittest.TestCase):
     def test_predict_all_actions_first(self):
 
@@ -113,5 +137,27 @@ class VowpalLearner_Tests(unittest.TestCase):
 
         self.assertEqual([1,0,0,0], learner.predict(1, None, [1,2,3,4]))
         
+    def test_pickled_learner_resumes(self):
+        learner = VowpalLearner(epsilon=0.1, is_adf=False, seed=30)
+
+        for i in range(20):
+            learner.predict(i, (i%3,), [1,2,3,4])
+            learner.learn(i, (i%3,), i%4+1, i%2, 0.25)
+
+        resumed = pickle.loads(pickle.dumps(learner))
+
+        for i in range(20, 40):
+            for l in [learner, resumed]:
+                l.predict(i, (i%3,), [1,2,3,4])
+                l.learn(i, (i%3,), i%4+1, i%2, 0.25)
+
+        self.assertEqual(learner.predict(40, (1,), [1,2,3,4]), resumed.predict(40, (1,), [1,2,3,4]))
+
+    def test_deepcopy_before_create(self):
+        learner = VowpalLearner(epsilon=0.1, is_adf=False, seed=30)
+        copied  = deepcopy(learner)
+
+        self.assertEqual(learner.predict(0, (1,), [1,2,3,4]), copied.predict(0, (1,), [1,2,3,4]))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
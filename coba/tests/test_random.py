@@ -210,5 +210,25 @@ class Random_Tests(unittest.TestCase):
 
         self.assertIsInstance(choice, tuple)
 
+    def test_choice_batch_matches_choice(self):
+        weights = [[0.1,0.2,0.7]]*50 + [[0,1,0]]*5
+        seqs    = [['a','b','c']]*55
+
+        rng        = coba.random.CobaRandom(5)
+        sequential = [ rng.choice(seq,w) for seq,w in zip(seqs,weights) ]
+        batched    = coba.random.CobaRandom(5).choice_batch(seqs, weights)
+
+        self.assertEqual(sequential, batched)
+
+    def test_choice_batch_ragged_matches_choice(self):
+        weights = [[0.5,0.5],[0.2,0.3,0.5],[1]]*20
+        seqs    = [[0,1],[0,1,2],[0]]*20
+
+        rng        = coba.random.CobaRandom(7)
+        sequential = [ rng.choice(seq,w) for seq,w in zip(seqs,weights) ]
+        batched    = coba.random.CobaRandom(7).choice_batch(seqs, weights)
+
+        self.assertEqual(sequential, batched)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,13 +1,22 @@
 import unittest
 
 import timeit
+import pickle
+import threading
+import struct
+
+from pathlib import Path
 
 from typing import List, Sequence, Tuple, cast
 
 from coba.data.encoders import OneHotEncoder
+from coba.data.sources import MemorySource
+from coba.data.structures import SparseVector, Category
 from coba.execution import ExecutionContext, NoneCache, NoneLogger, MemoryCache
+from coba.random import CobaRandom
 from coba.simulations import (
-    Key, Choice, Interaction, ClassificationSimulation, MemorySimulation, 
+    Key, Choice, Interaction, InteractionTable, ClassificationSimulation, MemorySimulation, MemoryMappedSimulation,
+    StreamingSimulation, StreamingBatchedSimulation, ClassificationStream, RegressionSimulation,
     LambdaSimulation, OpenmlSimulation, OpenmlClassificationSource, 
     Shuffle, Take, Batch, PCA, Sort
 )
@@ -69,6 +78,31 @@ class ClassificationSimulation_Tests(unittest.TestCase):
 
         self.assert_simulation_for_data(simulation, features, labels)
 
+    def test_as_category(self) -> None:
+        features   = [(1,2),(3,4),(5,6)]
+        labels     = ["good","bad","good"]
+        simulation = ClassificationSimulation(features, labels, as_category=True)
+
+        actions = simulation.interactions[0].actions
+
+        self.assertTrue(all(isinstance(a, Category) for a in actions))
+        self.assertCountEqual(["good","bad"], [a.level for a in actions])
+
+        for l,i in zip(labels, simulation.interactions):
+            self.assertEqual([ int(a.level == l) for a in i.actions ], simulation.reward(_choices(i)))
+
+    def test_actions_in_label_order(self) -> None:
+        simulation = ClassificationSimulation([1,2,3,4], ["b","c","b","a"], as_category=True)
+
+        self.assertEqual(["b","c","a"], simulation.label_set)
+        self.assertEqual(["b","c","a"], [ a.level for a in simulation.interactions[0].actions ])
+
+    def test_reward_with_bad_choice(self) -> None:
+        simulation = ClassificationSimulation([1,2], ["good","bad"])
+
+        with self.assertRaises(KeyError):
+            simulation.reward([(0,2)])
+
     def test_constructor_with_too_few_features(self) -> None:
         with self.assertRaises(AssertionError): 
             ClassificationSimulation([1], [1,1])
@@ -103,6 +137,21 @@ class ClassificationSimulation_Tests(unittest.TestCase):
             self.assertIn(1, actual_rewards)
             self.assertIn(0, actual_rewards)
 
+    def test_openml_encoders_from_metadata(self) -> None:
+        source = OpenmlClassificationSource(1)
+
+        feature = { 'data_type':'nominal', 'is_target':'false', 'nominal_value':['b','a','c'] }
+        target  = { 'data_type':'nominal', 'is_target':'true' , 'nominal_value':[1,0] }
+
+        #every metadata level has a position and missing values are encoded as 0's
+        self.assertEqual([(1,0,0),(0,0,0),(0,0,1)], OpenmlClassificationSource(1)._encoder(feature).encode(['a','?','c']))
+        self.assertTrue(source._encoder(target).is_fit)
+        self.assertEqual([(0,1),(1,0)], source._encoder(target).encode(['1','0']))
+
+        #labels without metadata levels are left as strings so nothing has to be fit
+        self.assertEqual(['1'], source._encoder({ 'data_type':'nominal', 'is_target':'true' }).encode(['1']))
+        self.assertEqual(['1'], OpenmlClassificationSource(1, as_category=True)._encoder(target).encode(['1']))
+
     @unittest.skip("much of what makes this openml set slow is now tested locally in `test_large_from_table`")
     def test_large_from_openml(self) -> None:
         #this test requires interet acess to download the data
@@ -133,6 +182,262 @@ class MemorySimulation_Tests(unittest.TestCase):
         self.assertEqual([4,5,6], simulation.interactions[1].actions)
         self.assertEqual([2,3,4], simulation.reward([(1,0),(1,1),(1,2)]))
 
+    def test_reward_types_kept(self):
+        interactions = [Interaction(1, [1,2], 0), Interaction(2,[4,5],1)]
+
+        for reward_sets in [ [[0,1],[1,0]], [[.5,1.],[0.,.25]], [[0,.5],[1,0]] ]:
+            simulation = MemorySimulation(interactions, reward_sets)
+            rewards    = simulation.reward([(0,0),(0,1),(1,0),(1,1)])
+
+            self.assertEqual([ type(r) for rs in reward_sets for r in rs ], [ type(r) for r in rewards ])
+
+    def test_ragged_rewards_with_keys(self):
+        interactions = [Interaction(1, [1,2,3], 'a'), Interaction(2,[4,5],'b'), Interaction(3,[6],'c')]
+        reward_sets  = [[0,1,2], [.5,3], ['x']]
+
+        simulation = MemorySimulation(interactions, reward_sets)
+
+        self.assertEqual([2,3,.5,'x'], simulation.reward([('a',2),('b',1),('b',0),('c',0)]))
+        self.assertEqual([1], simulation.reward([('a',1)]))
+        self.assertEqual([], simulation.reward([]))
+
+        with self.assertRaises(KeyError):
+            simulation.reward([('b',2)])
+
+        with self.assertRaises(KeyError):
+            simulation.reward([('d',0)])
+
+class InteractionTable_Tests(unittest.TestCase):
+
+    def test_tuple_contexts(self):
+        table = InteractionTable([(1,2.5,'a'),(3,4.5,'b')], [[1,2],[3]], [1,0])
+
+        self.assertEqual(2, len(table))
+        self.assertEqual((1,2.5,'a'), table[0].context)
+        self.assertEqual([3], table[0].actions)
+        self.assertEqual(0, table[0].key)
+        self.assertEqual((3,4.5,'b'), table[-1].context)
+        self.assertEqual([1,2], table[1].actions)
+        self.assertEqual([1], [ i.key for i in table[1:] ])
+        self.assertEqual([1,2], table.action_counts)
+
+    def test_other_contexts_with_keys(self):
+        table = InteractionTable([1,None,(1,2)], [[1,2]], keys=['a','b','c'])
+
+        self.assertEqual([1,None,(1,2)], [ i.context for i in table ])
+        self.assertEqual(['a','b','c'], list(table.keys))
+
+        with self.assertRaises(IndexError):
+            table[3]
+
+    def test_from_interactions_and_pickle(self):
+        actions      = [1,2]
+        interactions = [Interaction((i,i), actions, i) for i in range(3)] + [Interaction((3,3), [4], 3)]
+        table        = pickle.loads(pickle.dumps(InteractionTable.from_interactions(interactions)))
+
+        self.assertEqual([(0,0),(1,1),(2,2),(3,3)], [ i.context for i in table ])
+        self.assertEqual([[1,2],[1,2],[1,2],[4]], [ i.actions for i in table ])
+        self.assertEqual([0,1,2,3], list(table.keys))
+
+    def test_memory_simulation(self):
+        simulation = MemorySimulation(InteractionTable([(1,),(2,)], [[1,2]]), [[0,1],[1,0]])
+
+        self.assertEqual([1,1], simulation.reward([(0,1),(1,0)]))
+
+class RegressionSimulation_Tests(unittest.TestCase):
+
+    def test_default_action_grid(self):
+        simulation = RegressionSimulation([(1,),(2,),(3,)], [0.,2.,4.], n_actions=3)
+
+        self.assertEqual([0.,2.,4.]  , simulation.action_set)
+        self.assertEqual(3           , len(simulation.interactions))
+        self.assertEqual((2,)        , simulation.interactions[1].context)
+        self.assertEqual([0.,2.,4.]  , simulation.interactions[1].actions)
+        self.assertEqual([-2.,0.,-2.], simulation.reward([(1,0),(1,1),(1,2)]))
+
+    def test_discretized_rewards(self):
+        simulation = RegressionSimulation([1,2,3], [0.9,1.5,7], action_set=[2,0,1], discretize=True)
+
+        self.assertEqual([0,0,1], simulation.reward(_choices(simulation.interactions[0])))
+        self.assertEqual([0,0,1], simulation.reward(_choices(simulation.interactions[1])))
+        self.assertEqual([1,0,0], simulation.reward(_choices(simulation.interactions[2])))
+
+    def test_constant_targets(self):
+        simulation = RegressionSimulation([1,2], [3,3])
+
+        self.assertEqual([3.], simulation.action_set)
+        self.assertEqual([0.], simulation.reward([(0,0)]))
+
+    def test_bad_choice_raises(self):
+        simulation = RegressionSimulation([1,2], [0,1], n_actions=2)
+
+        with self.assertRaises(KeyError):
+            simulation.reward([(0,2)])
+
+class MemoryMappedSimulation_Tests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._filename = "coba/tests/.temp/simulation.sim"
+
+    def tearDown(self) -> None:
+        if Path(self._filename).exists(): Path(self._filename).unlink()
+
+    def test_tuple_contexts(self):
+        interactions = [Interaction((1,2), [(1,0),(0,1)], 0), Interaction((3,4.5),[(1,0),(0,1)],1)]
+        reward_sets  = [[0,1], [1,0]]
+
+        MemoryMappedSimulation.write(MemorySimulation(interactions, reward_sets), self._filename)
+        simulation = MemoryMappedSimulation(self._filename)
+
+        self.assertEqual(2, len(simulation.interactions))
+        self.assertEqual((1,2)        , simulation.interactions[0].context)
+        self.assertEqual((3,4.5)      , simulation.interactions[1].context)
+        self.assertEqual([(1,0),(0,1)], simulation.interactions[1].actions)
+        self.assertEqual(1            , simulation.interactions[-1].key)
+        self.assertEqual([0,1,1,0]    , simulation.reward([(0,0),(0,1),(1,0),(1,1)]))
+
+    def test_mixed_contexts_keep_types(self):
+        interactions = [Interaction((1,2.5), [1,2], 0), Interaction((3,4),[1,2],1), Interaction((5.5,6.5),[1,2],2)]
+        reward_sets  = [[0,1], [1,0], [0,1]]
+
+        MemoryMappedSimulation.write(MemorySimulation(interactions, reward_sets), self._filename)
+        simulation = MemoryMappedSimulation(self._filename)
+
+        self.assertEqual([(int,float),(int,int),(float,float)], [ tuple(map(type,i.context)) for i in simulation.interactions ])
+
+    def test_mixed_contexts_are_memory_mapped(self):
+        interactions = [Interaction((1.5,0,1), [1,2], 0), Interaction((2.5,1,0),[1,2],1)]
+        reward_sets  = [[0,1], [1,0]]
+
+        MemoryMappedSimulation.write(MemorySimulation(interactions, reward_sets), self._filename)
+
+        with open(self._filename, "rb") as f:
+            header_length = struct.unpack('<Q', f.read(8))[0]
+            header        = pickle.loads(f.read(header_length))
+
+        simulation = MemoryMappedSimulation(self._filename)
+
+        self.assertIsNone(header["contexts"])
+        self.assertEqual(['d','q','q'], [ typecode for typecode,_ in header["sections"][4:] ])
+        self.assertEqual([(1.5,0,1),(2.5,1,0)], [ i.context for i in simulation.interactions ])
+        self.assertEqual([(float,int,int)]*2, [ tuple(map(type,i.context)) for i in simulation.interactions ])
+
+    def test_scalar_and_none_contexts_are_memory_mapped(self):
+        for contexts in [[1,2,3],[None,None,None]]:
+            interactions = [ Interaction(c, [1,2], i) for i,c in enumerate(contexts) ]
+
+            MemoryMappedSimulation.write(MemorySimulation(interactions, [[0,1]]*3), self._filename)
+            simulation = MemoryMappedSimulation(self._filename)
+
+            self.assertEqual(contexts, [ i.context for i in simulation.interactions ])
+            self.assertIsNone(simulation._contexts)
+
+    def test_integer_contexts_keep_types(self):
+        interactions = [Interaction((1,2), [1,2], 0), Interaction((3,4),[1,2],1)]
+        reward_sets  = [[0,1], [1,0]]
+
+        MemoryMappedSimulation.write(MemorySimulation(interactions, reward_sets), self._filename)
+        simulation = MemoryMappedSimulation(self._filename)
+
+        self.assertEqual([(1,2),(3,4)], [ i.context for i in simulation.interactions ])
+        self.assertTrue(all(type(v) == int for i in simulation.interactions for v in i.context))
+
+    def test_reward_types(self):
+        interactions = [Interaction(1, [1,2], 0), Interaction(2,[4,5],1)]
+
+        for reward_sets, expected_type in [ ([[0,1],[1,0]], int), ([[.5,1.],[0.,.25]], float), ([[0,.5],[1,0]], float) ]:
+            MemoryMappedSimulation.write(MemorySimulation(interactions, reward_sets), self._filename)
+            rewards = MemoryMappedSimulation(self._filename).reward([(0,0),(0,1),(1,0),(1,1)])
+
+            #rewards that mix ints and floats come back as floats
+            self.assertEqual([ r for rs in reward_sets for r in rs ], rewards)
+            self.assertEqual([expected_type]*4, [ type(r) for r in rewards ])
+
+    def test_sparse_contexts_not_written(self):
+        interactions = [Interaction(SparseVector({0:1}), [1,2], 0), Interaction(SparseVector({3:2}),[1,2],1)]
+        reward_sets  = [[0,1], [1,0]]
+
+        with self.assertRaises(Exception):
+            MemoryMappedSimulation.write(MemorySimulation(interactions, reward_sets), self._filename)
+
+        self.assertFalse(Path(self._filename).exists())
+
+    def test_other_contexts_and_keys(self):
+        interactions = [Interaction("a", [1,2,3], 5), Interaction(None,[4,5],9)]
+        reward_sets  = [[0,1,2], [3,4]]
+
+        MemoryMappedSimulation.write(MemorySimulation(interactions, reward_sets), self._filename)
+        simulation = pickle.loads(pickle.dumps(MemoryMappedSimulation(self._filename)))
+
+        self.assertEqual(["a",None] , [ i.context for i in simulation.interactions ])
+        self.assertEqual([5,9]      , [ i.key for i in simulation.interactions ])
+        self.assertEqual([4,5]      , simulation.interactions[1].actions)
+        self.assertEqual([2,3]      , simulation.reward([(5,2),(9,0)]))
+
+class StreamingSimulation_Tests(unittest.TestCase):
+
+    def _pairs(self, n: int):
+        return [ (Interaction((i,), [1,2,3], i), [i,i+1,i+2]) for i in range(n) ]
+
+    def test_interactions_are_reread(self):
+        simulation = StreamingSimulation(MemorySource(self._pairs(3)))
+
+        self.assertEqual([0,1,2], [ i.key for i in simulation.interactions ])
+        self.assertEqual([0,1,2], [ i.key for i in simulation.interactions ])
+
+    def test_classification_stream(self):
+        features = [(1,2),(3,4),(5,6)]
+        labels   = ["good","bad","good"]
+
+        expected = ClassificationSimulation(features, labels)
+
+        for label_set in [None, ["good","bad"]]:
+            stream = StreamingSimulation(ClassificationStream(MemorySource(list(zip(features, labels))), label_set))
+            pairs  = list(stream.stream())
+
+            self.assertEqual([ i.context for i in expected.interactions ], [ i.context for i,_ in pairs ])
+            self.assertEqual([ i.actions for i in expected.interactions ], [ i.actions for i,_ in pairs ])
+            self.assertEqual([ list(expected.reward(_choices(i))) for i in expected.interactions ], [ list(r) for _,r in pairs ])
+
+    def test_take_and_batch_by_size(self):
+        simulation = Batch(size=2).filter(Take(5).filter(StreamingSimulation(MemorySource(self._pairs(10)))))
+
+        self.assertIsInstance(simulation, StreamingBatchedSimulation)
+
+        keys = []
+        for batch in simulation.interaction_batches:
+            keys.append([ i.key for i in batch ])
+            self.assertEqual([ i.key + 1 for i in batch ], simulation.reward([ (i.key, 1) for i in batch ]))
+
+        self.assertEqual([[0,1],[2,3]], keys)
+        self.assertEqual(4, simulation.interaction_count)
+        self.assertEqual(1, simulation.context_size)
+        self.assertEqual(3, simulation.action_count)
+
+    def test_take_more_than_stream(self):
+        simulation = Take(5).filter(StreamingSimulation(MemorySource(self._pairs(3))))
+        self.assertEqual([], list(simulation.interactions))
+
+    def test_batch_by_sizes(self):
+        simulation = Batch(sizes=[1,2,5]).filter(StreamingSimulation(MemorySource(self._pairs(6))))
+        self.assertEqual([[0],[1,2],[3,4,5]], [ [i.key for i in batch] for batch in simulation.interaction_batches ])
+
+    def test_batch_by_count_raises(self):
+        with self.assertRaises(Exception):
+            Batch(count=2).filter(StreamingSimulation(MemorySource(self._pairs(6))))
+
+    def test_shuffle_buffer(self):
+        stream   = StreamingSimulation(MemorySource(self._pairs(50)), buffer_size=5)
+        shuffled = Shuffle(3).filter(stream)
+
+        keys = [ i.key for i in shuffled.interactions ]
+
+        self.assertIsInstance(shuffled, StreamingSimulation)
+        self.assertCountEqual(list(range(50)), keys)
+        self.assertNotEqual(list(range(50)), keys)
+        self.assertEqual(keys, [ i.key for i in shuffled.interactions ])
+        self.assertEqual(keys, [ i.key for i in Shuffle(3).filter(stream).interactions ])
+
 class LambdaSimulation_Tests(unittest.TestCase):
 
     def test_interactions(self):
@@ -168,6 +473,99 @@ class LambdaSimulation_Tests(unittest.TestCase):
         simulation = LambdaSimulation(2,C,A,R).read()
         self.assertEqual(len(simulation.interactions), 2)
 
+    def test_interactions_generated_in_chunks(self):
+        calls = []
+
+        def C(t:int) -> int:
+            calls.append(t)
+            return t
+
+        simulation = LambdaSimulation(10, C, lambda t: [0,1], lambda c,a: c+a, chunk_size=4)
+        self.assertEqual([], calls)
+
+        simulation = simulation.read()
+        self.assertEqual([], calls)
+
+        self.assertEqual(5, simulation.interactions[5].context)
+        self.assertEqual([0,1,2,3,4,5,6,7], calls)
+
+        self.assertEqual([9,10], simulation.reward([(9,0),(9,1)]))
+        self.assertEqual([9,8,7], [ i.context for i in simulation.interactions[-1:-4:-1] ])
+        self.assertEqual(10, len(calls))
+
+    def test_seeded_interactions_are_reproducible(self):
+        import coba.random
+
+        simulation = LambdaSimulation(5, lambda t: coba.random.random(), lambda t: [0,1], lambda c,a: a, seed=10, chunk_size=2)
+
+        coba.random.seed(1)
+        expected_global = coba.random.random()
+
+        coba.random.seed(1)
+        contexts_1 = [ i.context for i in simulation.read().interactions ]
+        contexts_2 = [ i.context for i in simulation.read().interactions ]
+        actual_global = coba.random.random()
+
+        self.assertEqual(contexts_1, contexts_2)
+        self.assertEqual(CobaRandom(10).randoms(5), contexts_1)
+        self.assertEqual(expected_global, actual_global)
+
+    def test_unseeded_interactions_are_reproducible(self):
+        import coba.random
+
+        simulation = LambdaSimulation(5, lambda t: coba.random.random(), lambda t: [0,1], lambda c,a: a, chunk_size=2)
+
+        contexts_1 = [ i.context for i in simulation.read().interactions ]
+        contexts_2 = [ i.context for i in simulation.read().interactions ]
+
+        self.assertEqual(contexts_1, contexts_2)
+
+    def test_other_threads_keep_their_stream(self):
+        import coba.random
+
+        other = []
+
+        def context(t):
+            thread = threading.Thread(target=lambda: other.append(coba.random.random()))
+            thread.start()
+            thread.join()
+            return coba.random.random()
+
+        coba.random.seed(5)
+
+        simulation = LambdaSimulation(3, context, lambda t: [0,1], lambda c,a: a, seed=10)
+        contexts   = [ i.context for i in simulation.read().interactions ]
+
+        self.assertEqual(CobaRandom(10).randoms(3), contexts)
+        self.assertEqual(CobaRandom(5).randoms(3), other)
+
+    def test_pickle_unpicklable_functions(self):
+        import coba.random
+
+        simulation = LambdaSimulation(5, lambda t: coba.random.random(), lambda t: [0,1], lambda c,a: a, chunk_size=2)
+        unpickled  = pickle.loads(pickle.dumps(simulation))
+
+        #lambdas can't be pickled so the simulation is generated and unpickled as a MemorySource
+        self.assertIsInstance(unpickled, MemorySource)
+        self.assertEqual([ i.context for i in simulation.read().interactions ], [ i.context for i in unpickled.read().interactions ])
+        self.assertEqual([0,1,0,1,0], unpickled.read().reward([(0,0),(0,1),(3,0),(3,1),(4,0)]))
+
+    def test_vectorized_interactions(self):
+        def C(ts: Sequence[int]) -> List[int]:
+            return [ t*10 for t in ts ]
+
+        def A(ts: Sequence[int]) -> List[List[int]]:
+            return [ [1,2] if t % 2 else [1,2,3] for t in ts ]
+
+        def R(cs: Sequence[int], as_: Sequence[int]) -> List[int]:
+            return [ c+a for c,a in zip(cs,as_) ]
+
+        simulation = LambdaSimulation(3, C, A, R, chunk_size=2, vectorized=True).read()
+
+        self.assertEqual([0,10,20], [ i.context for i in simulation.interactions ])
+        self.assertEqual([1,2]    , simulation.interactions[1].actions)
+        self.assertEqual([3,12,23], simulation.reward([(0,2),(1,1),(2,2)]))
+
 class OpenmlSimulation_Tests(unittest.TestCase):
 
     def test_simple(self):
@@ -199,6 +597,25 @@ class Shuffle_Tests(unittest.TestCase):
         self.assertEqual(1, simulation.interactions[1].key)
         self.assertEqual(2, simulation.interactions[2].key)
 
+    def test_shuffle_matches_coba_random_shuffle(self):
+        for n, seed in [(1,1), (2,5), (10,7), (101,40)]:
+            simulation = MemorySimulation([Interaction(i,[1,2],i) for i in range(n)], [[0,1]]*n)
+            expected   = [ i.key for i in CobaRandom(seed).shuffle(simulation.interactions) ]
+
+            self.assertEqual(expected, [ i.key for i in Shuffle(seed).filter(simulation).interactions ])
+            self.assertEqual(expected[:n//2], [ i.key for i in Shuffle(seed).filter(simulation).interactions[0:n//2] ])
+            self.assertEqual(expected[-1], Shuffle(seed).filter(simulation).interactions[-1].key)
+            self.assertEqual(expected[::-2], [ i.key for i in Shuffle(seed).filter(simulation).interactions[::-2] ])
+
+    def test_shuffle_only_as_needed(self):
+        simulation = MemorySimulation([Interaction(i,[1,2],i) for i in range(100)], [[0,1]]*100)
+        shuffled   = Shuffle(3).filter(simulation)
+        taken      = Take(10).filter(shuffled)
+        expected   = [ i.key for i in CobaRandom(3).shuffle(simulation.interactions) ][0:10]
+
+        self.assertEqual(expected, [ i.key for i in taken.interactions ])
+        self.assertEqual(10, len(shuffled.interactions._order))
+
 class Take_Tests(unittest.TestCase):
     
     def test_take1(self):
@@ -435,6 +852,27 @@ class Batch_Tests(unittest.TestCase):
         self.assertEqual(1, len(batch_simulation.interaction_batches[2]))
         self.assertEqual(2, batch_simulation.interaction_batches[2][0].key)
 
+    def test_batches_are_views_with_summary(self):
+        interactions = [ Interaction((1,2) if i < 3 else 1, [1,2,3] if i < 2 else [1,2], i) for i in range(5) ]
+        simulation   = MemorySimulation(interactions, [[0,1,2],[0,1,2],[0,1],[0,1],[0,1]])
+
+        batch_simulation = Batch(sizes=[2,2]).filter(simulation)
+
+        self.assertEqual([(0,2),(2,4)], batch_simulation.batch_slices)
+        self.assertEqual([2,3], [ i.key for i in batch_simulation.interaction_batches[1] ])
+        self.assertEqual([3], [ i.key for i in batch_simulation.interaction_batches[1][1:] ])
+        self.assertEqual(3, batch_simulation.interaction_batches[1][-1].key)
+        self.assertEqual(4, batch_simulation.interaction_count)
+        self.assertEqual(2, batch_simulation.context_size)
+        self.assertEqual(2, batch_simulation.action_count)
+
+    def test_batch_sizes_beyond_interactions(self):
+        simulation       = MemorySimulation([Interaction(1,[1,2],i) for i in range(3)], [[0,1]]*3)
+        batch_simulation = Batch(sizes=[2,2,2]).filter(simulation)
+
+        self.assertEqual([2,1,0], [ len(b) for b in batch_simulation.interaction_batches ])
+        self.assertEqual(3, batch_simulation.interaction_count)
+
 class Interaction_Tests(unittest.TestCase):
 
     def test_constructor_no_context(self) -> None:
@@ -474,6 +912,24 @@ class PCA_Tests(unittest.TestCase):
         self.assertNotEqual((1,9), pca_sim.interactions[1].context)
         self.assertNotEqual((7,3), pca_sim.interactions[2].context)
 
+    def test_PCA_sparse(self):
+        dense_interactions  = [ Interaction((1,2), [1], 0), Interaction((1,9), [1], 1), Interaction((7,3), [1], 2) ]
+        sparse_interactions = [ Interaction(SparseVector.from_dense(i.context), i.actions, i.key) for i in dense_interactions ]
+
+        dense_pca  = PCA().filter(MemorySimulation(dense_interactions , [[1],[1],[1]]))
+        sparse_pca = PCA().filter(MemorySimulation(sparse_interactions, [[1],[1],[1]]))
+
+        self.assertEqual([i.context for i in dense_pca.interactions], [i.context for i in sparse_pca.interactions])
+
+    def test_PCA_category(self):
+        onehot_interactions   = [ Interaction((1,0,2), [1], 0), Interaction((0,1,9), [1], 1), Interaction((1,0,3), [1], 2) ]
+        category_interactions = [ Interaction((Category('a',0,2),2), [1], 0), Interaction((Category('b',1,2),9), [1], 1), Interaction((Category('a',0,2),3), [1], 2) ]
+
+        onehot_pca   = PCA().filter(MemorySimulation(onehot_interactions  , [[1],[1],[1]]))
+        category_pca = PCA().filter(MemorySimulation(category_interactions, [[1],[1],[1]]))
+
+        self.assertEqual([i.context for i in onehot_pca.interactions], [i.context for i in category_pca.interactions])
+
 class Sort_tests(unittest.TestCase):
 
     def test_sort1(self) -> None:
@@ -514,5 +970,17 @@ class Sort_tests(unittest.TestCase):
         self.assertEqual((1,3), srt_sim.interactions[1].context)
         self.assertEqual((1,9), srt_sim.interactions[2].context)
 
+    def test_sort_sparse(self) -> None:
+
+        interactions = [
+            Interaction(SparseVector({0:7,1:2}), [1], 0),
+            Interaction(SparseVector({1:9})    , [1], 1),
+            Interaction(SparseVector({0:8,1:3}), [1], 2)
+        ]
+
+        srt_sim = Sort([0]).filter(MemorySimulation(interactions, [[1],[1],[1]]))
+
+        self.assertEqual([1,0,2], [ i.key for i in srt_sim.interactions ])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
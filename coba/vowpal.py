@@ -6,12 +6,16 @@ TODO Add unittests
 import collections
 
 from os import devnull
+from copy import deepcopy
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from typing import Any, Dict, Tuple, Union, Sequence
 
 import coba.random
 from coba.execution import redirect_stderr
 from coba.utilities import check_vowpal_support
 from coba.simulations import Context, Action, Choice
+from coba.data.structures import SparseVector, Category
 
 class cb_explore_Formatter:
     @staticmethod
@@ -48,6 +52,57 @@ class pyvw_Wrapper:
         self._seed    = seed
         self._random  = coba.random.CobaRandom(seed)
 
+    def __getstate__(self) -> Dict[str,Any]:
+        """Replace the VW instance (which isn't picklable) with the bytes of its saved model.
+
+        Remarks:
+            VW instances are created with `--save_resume` so the saved model holds the learning state
+            (e.g., adaptive learning rates) needed to continue learning as if it had never stopped.
+        """
+
+        state = self.__dict__.copy()
+
+        if self._created:
+            with TemporaryDirectory() as directory:
+                model_path = str(Path(directory) / "model.vw")
+                self._vw.save(model_path)
+                state['_vw'] = Path(model_path).read_bytes()
+
+        return state
+
+    def __setstate__(self, state: Dict[str,Any]) -> None:
+        """Recreate the VW instance from the saved model bytes if one was created before pickling."""
+
+        model_bytes = state.pop('_vw', None)
+
+        self.__dict__.update(state)
+
+        if model_bytes is not None:
+            with TemporaryDirectory() as directory:
+                model_path = Path(directory) / "model.vw"
+                model_path.write_bytes(model_bytes)
+
+                #reductions and their options are stored in the model but the seed and resume flags aren't
+                with open(devnull, 'w') as f, redirect_stderr(f):
+                    self._vw = self._vw_init(f"-i {model_path} {self._resume_flags()}")
+
+    def __deepcopy__(self, memo: Dict[int,Any]) -> 'pyvw_Wrapper':
+        """Copy the wrapper, only saving and reloading the VW model when a VW instance has been created."""
+
+        copy = pyvw_Wrapper.__new__(pyvw_Wrapper)
+        memo[id(self)] = copy
+
+        if self._created:
+            copy.__setstate__(self.__getstate__())
+        else:
+            copy.__dict__.update(deepcopy(self.__dict__, memo))
+
+        return copy
+
+    def _resume_flags(self) -> str:
+        seed_flag = f"--random_seed {self._seed}" if self._seed is not None else ""
+        return f"--quiet --save_resume {seed_flag}".strip()
+
     @property
     def created(self):
         return self._created
@@ -55,7 +110,6 @@ class pyvw_Wrapper:
     def create(self, flags: str):
         assert not self._created, "VW instance has already been created"
         
-        seed_flag     = f"--random_seed {self._seed}" if self._seed is not None else ""
         self._created = True
 
         # vowpal has an annoying warning that is written to stderr whether or not we provide
@@ -64,7 +118,7 @@ class pyvw_Wrapper:
         # so if you are here because of strange problems with threads we may just need to suck
         # it up and accept that there will be an obnoxious warning message.
         with open(devnull, 'w') as f, redirect_stderr(f):
-            self._vw = self._vw_init(flags + f" --quiet {seed_flag}")
+            self._vw = self._vw_init(f"{flags} {self._resume_flags()}")
 
     def predict(self, context, actions) -> Tuple[Choice, float]:
         pmf  = self._vw.predict(self._format.predict(context, actions))
@@ -222,11 +276,14 @@ def _features_format(features: Union[Context,Action]) -> str:
         feature array a more advanced method may need to be implemented in the future...
     """
 
+    if isinstance(features, SparseVector):
+        return " ".join([_feature_format(i,f) for i,f in features.items() if not _is_empty(f) ])
+
     if not isinstance(features, collections.Sequence):
         features = (features,)
 
     if isinstance(features, collections.Sequence):
-        return " ". join([_feature_format(i,f) for i,f in enumerate(features) if f is not None and f != 0 ])
+        return " ". join([_feature_format(i,f) for i,f in enumerate(features) if not _is_empty(f) ])
 
     raise Exception("We were unable to determine an appropriate vw context format.")
 
@@ -243,4 +300,19 @@ def _feature_format(name: Any, value: Any) -> str:
         the top of https://github.com/VowpalWabbit/vowpal_wabbit/wiki/Input-format for more info.
     """
 
+    if isinstance(value, Category):
+        return f"{name}={value.level}"
+
     return f"{name}:{value}" if isinstance(value,(int,float)) else f"{value}"
+
+def _is_empty(value: Any) -> bool:
+    """Determine if a feature value can be left out of a pyvw example.
+
+    Remarks:
+        A Category with an index of -1 is a one hot encoding of all 0's and so, like 0, contributes nothing.
+    """
+
+    if isinstance(value, Category):
+        return value.index < 0
+
+    return value is None or value == 0